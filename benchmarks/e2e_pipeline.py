@@ -0,0 +1,342 @@
+"""
+End-to-end pipeline benchmark: replays audio clips through capture -> chunking -> STT ->
+translation and reports latency, real-time factor, dropped chunks and WER/CER.
+
+Clips are 16-bit WAV files in --clips; a reference transcript for clip.wav is read from
+clip.txt next to it (WER/CER are skipped without one). Each clip is replayed by a
+FileAudioSource in a fresh Pipeline; models stay loaded between clips (model registry).
+Translation goes to a local OpenAI-compatible stand-in server with a fixed delay, so
+the run is fully offline and LLM time is constant across runs.
+
+Per clip:
+  final_latency_ms        speech end -> last stt.final_sentence
+  translation_latency_ms  speech end -> last llm.translation_ready
+  decode_rtf              decode time / audio decoded (partials and finals)
+  compute_load            decode time / clip duration (> 1: the decoder can't keep up)
+  dropped_chunks, wer, cer
+  stages_ms               per-stage breakdown of the last sentence's trace (src/utils/trace.py)
+"Speech end" is when the chunk holding the clip's last voiced sample (energy based) was
+emitted. Clips should hold one utterance each; with several, the last one is measured.
+Latencies are only meaningful at --speed 1 (real time), the default.
+
+Usage:
+    python benchmarks/e2e_pipeline.py --clips bench_clips --model tiny --json run.json
+    python benchmarks/e2e_pipeline.py --clips bench_clips --model tiny --json new.json --baseline run.json
+"""
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+# --- Local LLM stand-in ---
+
+class StandInLLM:
+    """Minimal OpenAI-compatible /chat/completions server; answers after `delay_ms`."""
+    def __init__(self, delay_ms=150, port=0):
+        self.delay = delay_ms / 1000
+        self.requests = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                stand_in.requests += 1
+                time.sleep(stand_in.delay)
+                prompt = body.get("messages", [{}])[-1].get("content", "")
+                content = f"[translated] {prompt[-60:]}"
+                payload = json.dumps({
+                    "id": f"standin-{stand_in.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "standin"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                              "total_tokens": (len(prompt) + len(content)) // 4},
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# --- Accuracy ---
+
+def normalize_text(text):
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = "".join(" " if unicodedata.category(c).startswith("P") else c for c in text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def edit_distance(ref, hyp):
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1]
+
+
+def error_rates(reference, hypothesis):
+    ref, hyp = normalize_text(reference), normalize_text(hypothesis)
+    ref_words = ref.split()
+    ref_chars = ref.replace(" ", "")
+    return {
+        "wer": edit_distance(ref_words, hyp.split()) / max(len(ref_words), 1),
+        "cer": edit_distance(ref_chars, hyp.replace(" ", "")) / max(len(ref_chars), 1), # Spaces ignored (CJK)
+    }
+
+
+# --- Clips ---
+
+def load_clip(path):
+    """16 kHz mono float32 copy of the clip (for its duration and speech end)."""
+    from benchmarks.stt_rtf import load_audio
+    return load_audio(path)
+
+
+def speech_end_sec(audio, rate=16000, frame_ms=20):
+    import numpy as np
+    frame = rate * frame_ms // 1000
+    n = len(audio) // frame
+    if n == 0:
+        return 0.0
+    rms = np.sqrt(np.mean(audio[:n * frame].reshape(n, frame) ** 2, axis=1))
+    threshold = max(0.005, 0.05 * np.percentile(rms, 95))
+    voiced = np.flatnonzero(rms > threshold)
+    return float((voiced[-1] + 1) * frame / rate) if len(voiced) else 0.0
+
+
+async def run_clip(path, config, shared, speed, logger, translate):
+    from src.pipeline.pipeline import Pipeline
+    from src.audio.file_source import FileAudioSource
+    from src.utils.trace import breakdown
+
+    audio = load_clip(path)
+    duration = len(audio) / 16000
+    end_sample = int(speech_end_sec(audio) * config["audio"]["sample_rate"])
+    reference_path = os.path.splitext(path)[0] + ".txt"
+    reference = open(reference_path, encoding="utf-8").read() if os.path.exists(reference_path) else None
+
+    pipeline = Pipeline(os.path.basename(path), config, shared, logger, translate=translate)
+    source = FileAudioSource(pipeline.bus, config, logger, path, speed=speed)
+    pipeline.build(capture=source)
+
+    loop = asyncio.get_running_loop()
+    finished = asyncio.Event()
+    marks = {"speech_end": None, "final": None, "translation": None}
+    sentences, decode = [], {"decode_ms": 0.0, "audio_ms": 0.0}
+    processor = source.chunk_processor
+    step = processor.chunk_samples - processor.overlap_samples
+
+    def on_chunk(data):
+        # Emitted on the feed thread: the chunk holding the last voiced sample marks speech end
+        if marks["speech_end"] is None and (data["chunk_id"] - 1) * step + processor.chunk_samples >= end_sample:
+            marks["speech_end"] = time.perf_counter()
+
+    traces = []
+
+    def on_final(data):
+        marks["final"] = time.perf_counter()
+        sentences.append(data.get("sentence", ""))
+        if not translate:
+            traces.append(breakdown(data.get("trace")))
+
+    def on_translation(data):
+        marks["translation"] = time.perf_counter()
+        traces.append(breakdown(data.get("trace")))
+
+    def on_metrics(data):
+        decode["decode_ms"] += data.get("decode_ms", 0.0)
+        decode["audio_ms"] += data.get("audio_ms", 0.0)
+
+    pipeline.bus.subscribe("audio.chunk_ready", on_chunk)
+    pipeline.bus.subscribe("stt.final_sentence", on_final)
+    pipeline.bus.subscribe("stt.metrics", on_metrics)
+    pipeline.bus.subscribe("llm.translation_ready", on_translation)
+    pipeline.bus.subscribe("audio.source_finished", lambda data: loop.call_soon_threadsafe(finished.set))
+
+    await pipeline.load()
+    await pipeline.start()
+    await finished.wait()
+    await pipeline.shutdown()
+    dropped = pipeline.stt_manager.dropped_chunks
+    await pipeline.close()
+
+    def latency(mark):
+        if marks[mark] is None or marks["speech_end"] is None:
+            return None
+        return (marks[mark] - marks["speech_end"]) * 1000
+
+    hypothesis = " ".join(sentences)
+    result = {
+        "clip": os.path.basename(path),
+        "duration_sec": duration,
+        "speech_end_sec": end_sample / config["audio"]["sample_rate"],
+        "final_latency_ms": latency("final"),
+        "translation_latency_ms": latency("translation") if translate else None,
+        "decode_rtf": decode["decode_ms"] / decode["audio_ms"] if decode["audio_ms"] else None,
+        "compute_load": decode["decode_ms"] / 1000 / duration if duration else None,
+        "dropped_chunks": dropped,
+        "late_blocks": source.blocks_late,
+        "stages_ms": traces[-1].get("stages_ms") if traces else None,
+        "hypothesis": hypothesis,
+        "reference": reference,
+    }
+    if reference is not None:
+        result.update(error_rates(reference, hypothesis))
+    return result
+
+
+def summarize(clips):
+    import numpy as np
+
+    def stats(key):
+        values = [clip[key] for clip in clips if clip.get(key) is not None]
+        if not values:
+            return None
+        return {"mean": float(np.mean(values)), "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)), "max": float(np.max(values))}
+
+    summary = {key: stats(key) for key in ("final_latency_ms", "translation_latency_ms", "decode_rtf", "compute_load")}
+    summary["dropped_chunks"] = sum(clip["dropped_chunks"] for clip in clips)
+    # Where the time goes: median of each stage across clips
+    stages = {}
+    for clip in clips:
+        for stage, ms in (clip.get("stages_ms") or {}).items():
+            stages.setdefault(stage, []).append(ms)
+    summary["stages_p50_ms"] = {stage: float(np.percentile(values, 50)) for stage, values in stages.items()}
+    # Corpus-level error rates weigh clips by length
+    scored = [clip for clip in clips if clip.get("reference") is not None]
+    if scored:
+        words = [max(len(normalize_text(clip["reference"]).split()), 1) for clip in scored]
+        chars = [max(len(normalize_text(clip["reference"]).replace(" ", "")), 1) for clip in scored]
+        summary["wer"] = sum(clip["wer"] * n for clip, n in zip(scored, words)) / sum(words)
+        summary["cer"] = sum(clip["cer"] * n for clip, n in zip(scored, chars)) / sum(chars)
+    return summary
+
+
+def compare(summary, baseline):
+    """Prints current vs. baseline for the headline numbers (lower is better for all)."""
+    rows = [("final latency p50 ms", ("final_latency_ms", "p50")), ("final latency p95 ms", ("final_latency_ms", "p95")),
+            ("translation latency p50 ms", ("translation_latency_ms", "p50")), ("decode RTF mean", ("decode_rtf", "mean")),
+            ("dropped chunks", ("dropped_chunks",)), ("WER", ("wer",)), ("CER", ("cer",))]
+    print(f"\n{'metric':<28} {'baseline':>10} {'current':>10} {'change':>8}")
+    for label, path in rows:
+        old, new = baseline.get("summary", {}), summary
+        for key in path:
+            old = old.get(key) if isinstance(old, dict) else None
+            new = new.get(key) if isinstance(new, dict) else None
+        if old is None or new is None:
+            continue
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+        print(f"{label:<28} {old:>10.3f} {new:>10.3f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clips", required=True, help="Directory of .wav clips (+ .txt references)")
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--stt-mode", default="local")
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--streaming", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed (1 = real time)")
+    parser.add_argument("--llm-delay-ms", type=float, default=150, help="Stand-in LLM response time")
+    parser.add_argument("--no-translate", action="store_true")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Results JSON of an earlier run to compare against")
+    args = parser.parse_args()
+
+    from src.utils.app_config import default_config
+    from src.utils.logger import SystemLogger
+    from src.utils.thread_budget import ThreadBudget
+
+    config = default_config()
+    config["stt"].update({"mode": args.stt_mode, "model": args.model, "device": args.device,
+                          "compute_type": args.compute_type, "streaming": args.streaming, "language": args.language})
+    config["context_update_interval"] = 1
+    config["log_dir"] = tempfile.mkdtemp(prefix="e2e_dialogue_") # Dialogue logs aren't part of the results
+    ThreadBudget.from_config(config).apply_env()
+
+    logger = SystemLogger("E2EBench")
+    logger.logger.setLevel(logging.WARNING)
+    paths = sorted(glob.glob(os.path.join(args.clips, "*.wav")))
+    if not paths:
+        parser.error(f"No .wav files in {args.clips}")
+
+    async def run_all(llm):
+        from src.pipeline.shared import SharedResources
+        if llm:
+            config.update({"base_url": llm.base_url, "api_key": "offline"})
+        shared = SharedResources(config)
+        results = []
+        try:
+            for path in paths:
+                result = await run_clip(path, config, shared, args.speed, logger, translate=llm is not None)
+                results.append(result)
+                fmt = lambda value, spec: format(value, spec) if value is not None else "-"
+                print(f"{result['clip']:<32} final {fmt(result['final_latency_ms'], '7.0f')} ms"
+                      f"  translation {fmt(result['translation_latency_ms'], '7.0f')} ms"
+                      f"  RTF {fmt(result['decode_rtf'], '5.2f')}  drops {result['dropped_chunks']}"
+                      f"  WER {fmt(result.get('wer'), '5.2f')}")
+        finally:
+            await shared.aclose()
+        return results
+
+    if args.no_translate:
+        clips = asyncio.run(run_all(None))
+    else:
+        with StandInLLM(args.llm_delay_ms) as llm:
+            clips = asyncio.run(run_all(llm))
+
+    summary = summarize(clips)
+    print(json.dumps(summary, indent=2))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(summary, json.load(f))
+    if args.json:
+        run = {"settings": vars(args), "summary": summary, "clips": clips}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Microbenchmarks for the per-block audio hot path.
+
+Cases (each over the parameter grid below):
+  convert        AudioFormatConverter.convert: int16 bytes -> mono float32 16 kHz, per source block
+  push           ChunkProcessor.push of one converted block (chunk events with no subscribers)
+  resampler      StreamingResampler.process (the capture-side resampler)
+  stt_resample   LocalSTTEngine._resample (librosa, or its interpolation fallback; named in the case)
+  energy_vad     EnergyVAD on the new samples of one chunk
+  silero_vad     SileroVAD, the same (only if the ONNX model is available)
+  process_chunk  STTManager._process_chunk: VAD, pre-roll and buffering (no decode)
+Grid: channels 1/2/6/8, source rates 44.1/48/96 kHz, block sizes 1024/4096/16384 frames.
+
+Reported per case: ns per input sample (the fastest of --repeat timing runs: the
+minimum is what the code costs, slower runs are the machine getting in the way), the
+case's noise (how much slower the median run was than the fastest) and, from
+tracemalloc, the peak bytes allocated during one call and the memory blocks left
+allocated per call (should be 0). CPython has no per-call allocation counter, so the
+number of allocations isn't reported; peak bytes shows the temporaries.
+
+Gating a change (A/B): check the baseline out next to the working tree and run
+    git worktree add /tmp/hot_path_base HEAD
+    python benchmarks/hot_path.py --ab /tmp/hot_path_base
+Both trees run in their own worker process and their timing runs alternate, so the
+machine speeding up or slowing down (frequency scaling, other load) hits both sides
+alike. Exits with status 1 if a case is slower than the baseline tree by more than its
+tolerance: --threshold (default 0.10), or 3x the case's noise if that is larger.
+A/B runs of two identical trees stayed within that tolerance.
+
+Tracking over time:
+    python benchmarks/hot_path.py --save hot_path_baseline.json
+    python benchmarks/hot_path.py --baseline hot_path_baseline.json
+Compares against a saved run with the same tolerance rule. Separate runs drift with the
+machine's state (up to +-40% on a shared VM), so use this for trends, not as a gate.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+CHANNELS = (1, 2, 6, 8)
+RATES = (44100, 48000, 96000)
+BLOCKS = (1024, 4096, 16384)
+PIPELINE_RATE = 16000
+
+
+def calibrate(call, min_time=0.05):
+    """Number of calls that makes one timing run last at least `min_time` seconds."""
+    call() # Warm caches and lazy state
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            call()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1 << 20:
+            return number
+        number *= 2
+
+
+def timing_run(call, number):
+    """Seconds per call, averaged over `number` calls."""
+    started = time.perf_counter()
+    for _ in range(number):
+        call()
+    return (time.perf_counter() - started) / number
+
+
+def summarize(runs, samples):
+    """Best run and noise (median run vs. best) of a list of seconds-per-call runs."""
+    runs = sorted(runs)
+    per_call = runs[0]
+    return {
+        "ns_per_sample": per_call * 1e9 / samples,
+        "us_per_call": per_call * 1e6,
+        "noise": round(runs[len(runs) // 2] / per_call - 1, 4),
+    }
+
+
+def allocations(call, calls=16):
+    """Peak bytes allocated during one call and memory blocks left allocated per call, via tracemalloc."""
+    tracemalloc.start()
+    call()
+    before_blocks = sys.getallocatedblocks()
+    peak = 0
+    for _ in range(calls):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        call()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    leaked_blocks = (sys.getallocatedblocks() - before_blocks) / calls
+    tracemalloc.stop()
+    return {"peak_alloc_bytes": peak, "blocks_retained_per_call": round(max(leaked_blocks, 0.0), 2)}
+
+
+def measure(call, samples, repeat=9, min_time=0.05):
+    """Times `call` and returns ns/sample (best run), the run-to-run noise and tracemalloc figures for one call."""
+    number = calibrate(call, min_time)
+    runs = [timing_run(call, number) for _ in range(repeat)]
+    return {**summarize(runs, samples), **allocations(call)}
+
+
+def make_block(frames, channels, rate, seed=0):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames) / rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)[:, None] + 0.02 * rng.standard_normal((frames, channels))
+    return (tone * 32767).astype(np.int16)
+
+
+def cases(grid_channels, grid_rates, grid_blocks):
+    import numpy as np
+    from src.audio.source import AudioFormatConverter
+    from src.audio.chunk_processor import ChunkProcessor
+    from src.audio.resampler import StreamingResampler
+    from src.transcription.vad import EnergyVAD, SileroVAD, _find_silero_model
+    from src.utils.event_bus import EventBus
+
+    quiet = logging.getLogger("HotPathBench")
+    quiet.disabled = True # The interpolation fallback warns on every call
+    try:
+        import librosa # noqa: F401
+        stt_resample = "librosa"
+    except ImportError:
+        stt_resample = "interp"
+
+    for channels in grid_channels:
+        for rate in grid_rates:
+            for frames in grid_blocks:
+                converter = AudioFormatConverter(PIPELINE_RATE)
+                raw = make_block(frames, channels, rate).tobytes()
+                yield f"convert/ch{channels}/{rate}/{frames}", lambda: converter.convert(raw, rate, channels), frames * channels
+
+    for rate in grid_rates:
+        for frames in grid_blocks:
+            mono = make_block(frames, 1, rate)[:, 0].astype(np.float32) / 32768.0
+            resampler = StreamingResampler(rate, PIPELINE_RATE)
+            yield f"resampler/{rate}/{frames}", lambda: resampler.process(mono), frames
+
+            from src.transcription.local_stt_engine import LocalSTTEngine
+            engine = LocalSTTEngine.__new__(LocalSTTEngine) # No model: only _resample is used
+            engine.logger = quiet
+            yield f"stt_resample/{stt_resample}/{rate}/{frames}", lambda: engine._resample(mono, rate, PIPELINE_RATE), frames
+
+    bus = EventBus()
+    for frames in grid_blocks:
+        block = np.zeros(frames * PIPELINE_RATE // 48000, dtype=np.float32) # One 48 kHz block after conversion
+        processor = ChunkProcessor(bus, PIPELINE_RATE, chunk_ms=250, overlap_ms=50)
+        yield f"push/{frames}", lambda: processor.push(block), len(block)
+
+    # Chunk-sized VAD input: the new (non-overlapping) 200 ms of a 250/50 ms chunk
+    new_samples = make_block(PIPELINE_RATE // 5, 1, PIPELINE_RATE)[:, 0].astype(np.float32) / 32768.0
+    energy_vad = EnergyVAD(0.005)
+    yield "energy_vad/200ms", lambda: energy_vad(new_samples), len(new_samples)
+    model_path = _find_silero_model()
+    if model_path:
+        silero = SileroVAD(model_path, PIPELINE_RATE)
+        yield "silero_vad/200ms", lambda: silero(new_samples), len(new_samples)
+
+    yield from process_chunk_case()
+
+
+def process_chunk_case():
+    """STTManager._process_chunk on alternating speech/silence chunks, decode stage not running."""
+    import numpy as np
+    from src.transcription.stt_manager import STTManager, STTEngine
+    from src.utils.event_bus import EventBus
+    from src.utils.logger import SystemLogger
+
+    class NullEngine(STTEngine):
+        async def transcribe(self, audio_chunk, sample_rate, profile="final"):
+            return ""
+
+    logger = SystemLogger("HotPathBench")
+    logger.logger.setLevel(logging.ERROR)
+    loop = asyncio.new_event_loop()
+    config = {"audio": {"sample_rate": PIPELINE_RATE}, "stt": {"mode": "none", "vad": {"enabled": False}}}
+    manager = STTManager(EventBus(), config, logger, load_engine=False)
+    manager.engine = NullEngine() # VAD disabled in config: the RMS energy gate
+
+    chunk_samples = PIPELINE_RATE // 4 # 250 ms chunks with 50 ms overlap, as configured by the GUI
+    speech = make_block(chunk_samples, 1, PIPELINE_RATE)[:, 0].astype(np.float32) / 32768.0
+    silence = np.zeros(chunk_samples, dtype=np.float32)
+    pattern = [speech] * 12 + [silence] * 3
+    state = {"i": 0}
+
+    def call():
+        i = state["i"]
+        state["i"] += 1
+        loop.run_until_complete(manager._process_chunk(pattern[i % len(pattern)], i, 50.0))
+        manager._final_jobs.clear() # The decode stage isn't running; keep the queue from growing
+        manager._partial_requested = False
+
+    yield "process_chunk/250ms", call, chunk_samples
+
+
+def tolerance(threshold, *results, noise_factor=3.0):
+    return max(threshold, noise_factor * max(result.get("noise", 0.0) for result in results))
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns (name, ratio, tolerance) for the cases slower than baseline by more than their
+    tolerance: `threshold` (a fraction), or `noise_factor` times the case's noise if larger.
+    """
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get("cases", {}).get(name)
+        if not old:
+            continue
+        ratio = result["ns_per_sample"] / old["ns_per_sample"]
+        allowed = tolerance(threshold, result, old)
+        result["vs_baseline"] = round(ratio, 3)
+        if ratio > 1 + allowed:
+            regressions.append((name, ratio, allowed))
+    return regressions
+
+
+def worker(args):
+    """
+    --ab worker: builds the cases from the code in --root and answers JSON-line
+    requests on stdin ("list", "calibrate", "run", "alloc").
+    """
+    sys.path.insert(0, os.path.abspath(args.root)) # Ahead of this script's own tree
+    out = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1) # Anything the code under test prints goes to stderr
+    def selected():
+        return ((name, call, samples) for name, call, samples in cases(args.channels, args.rates, args.blocks)
+                if not args.filter or args.filter in name)
+
+    # Cases are built lazily and their calls share loop variables, so requests walk them in order
+    pending, name, call = selected(), None, None
+    for line in sys.stdin:
+        request = json.loads(line)
+        op = request["op"]
+        if op == "list":
+            reply = [[name, samples] for name, _, samples in selected()]
+        else:
+            while name != request["case"]:
+                name, call, _ = next(pending)
+            if op == "calibrate":
+                reply = calibrate(call)
+            elif op == "run":
+                reply = timing_run(call, request["number"])
+            else:
+                reply = allocations(call)
+        out.write(json.dumps(reply) + "\n")
+        out.flush()
+
+
+class Worker:
+    def __init__(self, root, args):
+        import subprocess
+        # This script times both trees (the baseline may predate it); only `src` comes from `root`
+        command = [sys.executable, os.path.abspath(__file__), "--worker", "--root", root,
+                   "--channels", *map(str, args.channels), "--rates", *map(str, args.rates),
+                   "--blocks", *map(str, args.blocks)]
+        if args.filter:
+            command += ["--filter", args.filter]
+        self.process = subprocess.Popen(command, cwd=root, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+
+    def ask(self, op, **request):
+        self.process.stdin.write(json.dumps({"op": op, **request}) + "\n")
+        self.process.stdin.flush()
+        return json.loads(self.process.stdout.readline())
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+
+def run_ab(args):
+    """Interleaved A/B against the tree at args.ab; returns (results, regressions)."""
+    current, base = Worker(ROOT, args), Worker(os.path.abspath(args.ab), args)
+    try:
+        base_cases = dict(base.ask("list"))
+        results, regressions = {}, []
+        print(f"{'case':<34} {'ns/sample':>10} {'baseline':>10} {'ratio':>7} {'noise':>7} {'peak alloc':>12} {'retained':>9}")
+        for name, samples in current.ask("list"):
+            if name not in base_cases:
+                continue
+            number = current.ask("calibrate", case=name)
+            base.ask("calibrate", case=name) # Warm-up only; both sides time the same number of calls
+            runs, base_runs = [], []
+            for _ in range(args.repeat):
+                runs.append(current.ask("run", case=name, number=number))
+                base_runs.append(base.ask("run", case=name, number=number))
+            result = {**summarize(runs, samples), **current.ask("alloc", case=name)}
+            old = {**summarize(base_runs, samples), **base.ask("alloc", case=name)}
+            ratio = result["ns_per_sample"] / old["ns_per_sample"]
+            allowed = tolerance(args.threshold, result, old)
+            result.update({"vs_baseline": round(ratio, 3), "baseline": old})
+            results[name] = result
+            print(f"{name:<34} {result['ns_per_sample']:>10.2f} {old['ns_per_sample']:>10.2f} {ratio:>7.2f} "
+                  f"{max(result['noise'], old['noise']):>7.1%} {result['peak_alloc_bytes']:>10} B "
+                  f"{result['blocks_retained_per_call']:>9}")
+            if ratio > 1 + allowed:
+                regressions.append((name, ratio, allowed))
+        return results, regressions
+    finally:
+        current.close()
+        base.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=int, nargs="+", default=list(CHANNELS))
+    parser.add_argument("--rates", type=int, nargs="+", default=list(RATES))
+    parser.add_argument("--blocks", type=int, nargs="+", default=list(BLOCKS))
+    parser.add_argument("--filter", help="Only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--save", help="Write the results (usable as a baseline) to this file")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare against")
+    parser.add_argument("--ab", metavar="TREE", help="Checkout of the baseline code to time interleaved with this one")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--root", default=ROOT, help=argparse.SUPPRESS)
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed slowdown vs. baseline (0.10 = 10%%); noisy cases get 3x their noise")
+    args = parser.parse_args()
+    if args.worker:
+        return worker(args)
+
+    results, regressions = {}, None
+    if args.ab:
+        results, regressions = run_ab(args)
+    else:
+        print(f"{'case':<34} {'ns/sample':>10} {'us/call':>10} {'noise':>7} {'peak alloc':>12} {'retained':>9}")
+        for name, call, samples in cases(args.channels, args.rates, args.blocks):
+            if args.filter and args.filter not in name:
+                continue
+            result = measure(call, samples, repeat=args.repeat)
+            results[name] = result
+            print(f"{name:<34} {result['ns_per_sample']:>10.2f} {result['us_per_call']:>10.1f} {result['noise']:>7.1%} "
+                  f"{result['peak_alloc_bytes']:>10} B {result['blocks_retained_per_call']:>9}")
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                regressions = compare(results, json.load(f), args.threshold)
+
+    status = 0
+    if regressions is not None:
+        for name, ratio, allowed in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x baseline (tolerance {allowed:.0%})")
+        if regressions:
+            status = 1
+        else:
+            print(f"No case slower than baseline by more than its tolerance (at least {args.threshold:.0%})")
+
+    if args.save:
+        import numpy as np
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "numpy": np.__version__, "cases": results}, f, indent=2)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
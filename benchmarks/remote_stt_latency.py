@@ -0,0 +1,110 @@
+"""
+Latency the remote STT transport adds, measured over loopback on one host.
+
+Starts an STT server in a subprocess (no model is loaded: the benchmark never sends
+hello) and measures, for TCP and Unix sockets:
+  - ping: round trip of a small JSON message (an event coming back costs about half)
+  - chunk: an audio chunk followed by a ping; the pong can only come back after the
+    server read the whole chunk, so this is the cost of shipping one chunk plus an event back
+
+Usage:
+    python benchmarks/remote_stt_latency.py --chunk-ms 250 --count 500 --json remote.json
+
+Across a LAN add the network RTT; decode time on the server replaces local decode time.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+def percentiles(samples_ms):
+    import numpy as np
+    samples = np.array(samples_ms)
+    return {
+        "p50": float(np.percentile(samples, 50)),
+        "p95": float(np.percentile(samples, 95)),
+        "p99": float(np.percentile(samples, 99)),
+        "max": float(samples.max()),
+    }
+
+
+async def wait_for_server(address, timeout=10.0):
+    from src.transcription.remote_stt import open_connection
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            return await open_connection(address)
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def measure(address, chunk_samples, count):
+    import numpy as np
+    from src.transcription.remote_stt import encode_message, encode_audio, read_frame
+
+    reader, writer = await wait_for_server(address)
+    audio = (np.random.default_rng(0).standard_normal(chunk_samples) * 0.1).astype(np.float32)
+
+    async def round_trip(frames):
+        started = time.perf_counter()
+        for frame in frames:
+            writer.write(frame)
+        await writer.drain()
+        kind, message = await read_frame(reader)
+        assert message and message.get("type") == "pong"
+        return (time.perf_counter() - started) * 1000
+
+    ping = encode_message({"type": "ping", "t": 0})
+    for _ in range(20): # Warm up the connection and both event loops
+        await round_trip([ping])
+    ping_ms = [await round_trip([ping]) for _ in range(count)]
+    chunk_ms = [await round_trip([encode_audio(audio, i, 0.0, i * len(audio), f"bench-{i}"), ping]) for i in range(count)]
+    writer.close()
+    return {"ping_ms": percentiles(ping_ms), "chunk_ms": percentiles(chunk_ms)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-ms", type=int, default=250)
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--port", type=int, default=18765)
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    addresses = [f"tcp://127.0.0.1:{args.port}"]
+    if hasattr(asyncio, "start_unix_server") and os.name == "posix":
+        addresses.append(f"unix://{os.path.join(tempfile.mkdtemp(), 'stt.sock')}")
+
+    chunk_samples = args.sample_rate * args.chunk_ms // 1000
+    results = {"chunk_ms": args.chunk_ms, "chunk_bytes": chunk_samples * 2, "transports": {}}
+    for address in addresses:
+        server = subprocess.Popen([sys.executable, "-m", "src.transcription.remote_stt", "--listen", address],
+                                  cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            result = asyncio.run(measure(address, chunk_samples, args.count))
+        finally:
+            server.terminate()
+            server.wait()
+        transport = address.split(":")[0]
+        results["transports"][transport] = result
+        print(f"{transport:>5}  ping p50 {result['ping_ms']['p50']:.3f} ms  p99 {result['ping_ms']['p99']:.3f} ms"
+              f"   {args.chunk_ms} ms chunk + event p50 {result['chunk_ms']['p50']:.3f} ms  p99 {result['chunk_ms']['p99']:.3f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
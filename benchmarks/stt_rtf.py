@@ -0,0 +1,275 @@
+"""
+Real-time factor (RTF) of the local Whisper decoder under different CPU thread budgets.
+
+Each setting runs in a fresh subprocess, because the numeric-library thread caps only
+take effect before numpy is imported. A setting is "T" or "TxW": T CTranslate2 threads
+(cpu_threads) and W decoder workers (num_workers). With --pipeline-load, a thread that
+mimics capture (48 kHz stereo -> 16 kHz resampling every 85 ms) runs on the pipeline
+cores, and its scheduling lateness is reported next to the RTF.
+
+Usage:
+    python benchmarks/stt_rtf.py --model small.en --compute-type int8 --audio speech.wav \\
+        --settings 2 3 4 2x2 --pin --pipeline-load --json rtf.json
+
+RTF < 1 means the decoder keeps up with real time; on a 4-core box Small/int8 should
+be run with enough headroom (RTF around 0.5 or lower) for partials to keep flowing.
+
+Batched vs. sequential (stt.mode "batched"): with --streams N, each setting instead
+feeds N concurrent streams into a BatchedWhisperEngine, once with max_batch_size=1
+(requests decoded one after another) and once with max_batch_size=N, and reports the
+aggregate throughput (seconds of audio decoded per second) of both:
+    python benchmarks/stt_rtf.py --model small.en --audio speech.wav --settings 4 --streams 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+def parse_setting(text):
+    threads, _, workers = text.partition("x")
+    return int(threads), int(workers or 1)
+
+
+def load_audio(path, target_rate=16000):
+    import wave
+    import numpy as np
+    from src.audio.resampler import StreamingResampler
+
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError("Only 16-bit PCM WAV files are supported")
+        rate, channels = wav.getframerate(), wav.getnchannels()
+        audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    audio = audio.reshape(-1, channels).mean(axis=1).astype(np.float32) / 32768.0
+    if rate != target_rate:
+        resampler = StreamingResampler(rate, target_rate)
+        audio = np.concatenate((resampler.process(audio), resampler.process(np.zeros(resampler.taps, dtype=np.float32))))
+    return audio
+
+
+def synthetic_audio(seconds, rate=16000):
+    # Not speech: the decoder's work differs from real audio, so prefer --audio
+    import numpy as np
+    t = np.arange(int(seconds * rate)) / rate
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    audio = sum(np.sin(2 * np.pi * k * np.cumsum(f0) / rate) / k for k in range(1, 6))
+    return (0.05 * audio * (np.sin(2 * np.pi * 2 * t) > -0.3)).astype(np.float32)
+
+
+class PipelineLoad(threading.Thread):
+    """Stands in for the capture thread: resamples one 4096-frame 48 kHz stereo block per period."""
+    def __init__(self, budget, period=4096 / 48000):
+        super().__init__(daemon=True)
+        self.budget = budget
+        self.period = period
+        self.lateness = []
+        self.stop_event = threading.Event()
+
+    def run(self):
+        import numpy as np
+        from src.audio.resampler import StreamingResampler
+
+        self.budget.pin_pipeline_thread()
+        resampler = StreamingResampler(48000, 16000)
+        block = (np.random.default_rng(0).standard_normal((4096, 2)) * 3000).astype(np.int16)
+        deadline = time.perf_counter()
+        while not self.stop_event.is_set():
+            deadline += self.period
+            resampler.process(block.mean(axis=1).astype(np.float32) / 32768.0)
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.lateness.append(max(0.0, time.perf_counter() - deadline))
+
+
+def measure_batching(options, budget, windows):
+    """Throughput of N concurrent streams, decoded one request at a time vs. as batches."""
+    from src.transcription.batched_stt_engine import BatchedWhisperEngine
+
+    n = options["streams"]
+    results = {}
+    for label, batch_size in (("sequential", 1), ("batched", n)):
+        profiles = {p: {"max_length": options["max_length"]} for p in options["profiles"]} if options["max_length"] else None
+        engine = BatchedWhisperEngine(options["model"], "cpu", options["compute_type"], decode_profiles=profiles,
+                                      max_batch_size=batch_size, max_wait_ms=options["max_wait_ms"],
+                                      **budget.whisper_kwargs())
+        if engine.model is None:
+            return None
+        streams = [engine.open_stream() for _ in range(n)]
+        for stream in streams:
+            stream.set_language(options["language"])
+
+        async def measure():
+            await streams[0].warm_up()
+            profiles = {}
+            for profile in options["profiles"]:
+                started = time.perf_counter()
+                for _ in range(options["repeat"]):
+                    for i in range(len(windows)):
+                        # Every stream has a window pending at once, as when N pipelines speak together
+                        await asyncio.gather(*(stream.transcribe(windows[(i + k) % len(windows)], 16000, profile=profile)
+                                               for k, stream in enumerate(streams)))
+                wall_sec = time.perf_counter() - started
+                audio_sec = n * options["repeat"] * sum(len(w) for w in windows) / 16000
+                profiles[profile] = {"audio_sec_per_sec": audio_sec / wall_sec,
+                                     "ms_per_window": wall_sec / (options["repeat"] * len(windows)) * 1000}
+            return profiles
+
+        profiles = asyncio.run(measure())
+        results[label] = {"profiles": profiles, "avg_batch": engine.metrics()["avg_batch"]}
+        for stream in streams:
+            stream.close()
+    for profile in options["profiles"]:
+        results.setdefault("speedup", {})[profile] = (results["batched"]["profiles"][profile]["audio_sec_per_sec"]
+                                                     / results["sequential"]["profiles"][profile]["audio_sec_per_sec"])
+    return results
+
+
+def run_child(options):
+    """Runs one setting in this (fresh) process and prints its result as JSON."""
+    from src.utils.thread_budget import ThreadBudget
+
+    budget = ThreadBudget(total=options["total"], pipeline_cores=options["pipeline_cores"],
+                          stt_threads=options["threads"], num_workers=options["workers"],
+                          numeric_threads=options["numeric_threads"], pin=options["pin"])
+    budget.apply_env()
+    budget.pin_stt_thread()
+
+    import numpy as np
+    from src.transcription.local_stt_engine import LocalSTTEngine
+
+    audio = load_audio(options["audio"]) if options["audio"] else synthetic_audio(options["window"] * 3)
+    window = int(options["window"] * 16000)
+    windows = [audio[i:i + window] for i in range(0, max(len(audio) - window, 0) + 1, window)]
+
+    if options["streams"] > 1:
+        batching = measure_batching(options, budget, windows)
+        if batching is None:
+            print(json.dumps({"error": "model failed to load"}))
+            return
+        print(json.dumps({"setting": f"{options['threads']}x{options['workers']}", "budget": budget.describe(),
+                          "streams": options["streams"], "batching": batching}))
+        return
+
+    engine = LocalSTTEngine(model_name=options["model"], device="cpu", compute_type=options["compute_type"],
+                            **budget.whisper_kwargs())
+    if engine.model is None:
+        print(json.dumps({"error": "model failed to load"}))
+        return
+    engine.vad_filter = False
+    engine.set_language(options["language"])
+
+    load = PipelineLoad(budget) if options["pipeline_load"] else None
+    if load:
+        load.start()
+
+    async def measure():
+        await engine.warm_up()
+        results = {}
+        for profile in options["profiles"]:
+            decode_sec = 0.0
+            for _ in range(options["repeat"]):
+                for w in windows:
+                    started = time.perf_counter()
+                    await engine.transcribe(w, 16000, profile=profile)
+                    decode_sec += time.perf_counter() - started
+            audio_sec = options["repeat"] * sum(len(w) for w in windows) / 16000
+            results[profile] = {"rtf": decode_sec / audio_sec, "decode_ms_per_window": decode_sec / (options["repeat"] * len(windows)) * 1000}
+        return results
+
+    profiles = asyncio.run(measure())
+    result = {"setting": f"{options['threads']}x{options['workers']}", "budget": budget.describe(), "profiles": profiles}
+    if load:
+        load.stop_event.set()
+        load.join()
+        lateness = np.array(load.lateness) * 1000
+        result["pipeline_lateness_ms"] = {"p50": float(np.percentile(lateness, 50)),
+                                          "p99": float(np.percentile(lateness, 99)),
+                                          "max": float(lateness.max())}
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="small.en")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--language", default="auto")
+    parser.add_argument("--audio", help="16-bit PCM WAV file (synthetic audio if omitted)")
+    parser.add_argument("--window", type=float, default=5.0, help="Seconds of audio per decode (default 5)")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--profiles", nargs="+", default=["partial", "final"])
+    parser.add_argument("--settings", nargs="+", default=None, help='"T" or "TxW" (default: 1..all cores)')
+    parser.add_argument("--total", type=int, default=None, help="Cores to use in total (default: all available)")
+    parser.add_argument("--pipeline-cores", type=int, default=1)
+    parser.add_argument("--numeric-threads", type=int, default=1)
+    parser.add_argument("--pin", action="store_true", help="Pin decoder and pipeline threads (Linux)")
+    parser.add_argument("--pipeline-load", action="store_true", help="Run a capture-like thread alongside")
+    parser.add_argument("--streams", type=int, default=1,
+                        help="Compare batched vs. sequential decoding of this many concurrent streams")
+    parser.add_argument("--max-wait-ms", type=float, default=50, help="Batching window with --streams")
+    parser.add_argument("--max-length", type=int, default=None,
+                        help="Cap on tokens per window with --streams (for models that don't stop on their own)")
+    parser.add_argument("--json", help="Write all results to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(json.loads(args.child))
+        return
+
+    from src.utils.thread_budget import available_cores
+    cores = args.total or len(available_cores())
+    settings = args.settings or [str(n) for n in range(1, cores + 1)]
+
+    results = []
+    if args.streams > 1:
+        print(f"{'setting':>8} {'profile':>8} {'sequential':>12} {'batched':>12} {'speedup':>8}  (audio sec decoded per sec, "
+              f"{args.streams} streams)")
+    else:
+        print(f"{'setting':>8} " + " ".join(f"{p + ' RTF':>12}" for p in args.profiles) + f" {'lateness p99':>14}")
+    for setting in settings:
+        threads, workers = parse_setting(setting)
+        options = {
+            "model": args.model, "compute_type": args.compute_type, "language": args.language,
+            "audio": args.audio, "window": args.window, "repeat": args.repeat, "profiles": args.profiles,
+            "threads": threads, "workers": workers, "total": args.total, "pipeline_cores": args.pipeline_cores,
+            "numeric_threads": args.numeric_threads, "pin": args.pin, "pipeline_load": args.pipeline_load,
+            "streams": args.streams, "max_wait_ms": args.max_wait_ms, "max_length": args.max_length,
+        }
+        proc = subprocess.run([sys.executable, __file__, "--child", json.dumps(options)],
+                              capture_output=True, text=True)
+        lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            print(f"{setting:>8} failed: {proc.stderr.strip().splitlines()[-1:] or proc.returncode}")
+            continue
+        result = json.loads(lines[-1])
+        if "error" in result:
+            print(f"{setting:>8} failed: {result['error']}")
+            continue
+        results.append(result)
+        if "batching" in result:
+            batching = result["batching"]
+            for p in args.profiles:
+                print(f"{result['setting']:>8} {p:>8} {batching['sequential']['profiles'][p]['audio_sec_per_sec']:>12.2f} "
+                      f"{batching['batched']['profiles'][p]['audio_sec_per_sec']:>12.2f} {batching['speedup'][p]:>7.2f}x")
+            continue
+        lateness = result.get("pipeline_lateness_ms", {}).get("p99")
+        print(f"{result['setting']:>8} "
+              + " ".join(f"{result['profiles'][p]['rtf']:>12.3f}" for p in args.profiles)
+              + (f" {lateness:>11.1f} ms" if lateness is not None else f" {'-':>14}"))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,22 @@ import os
 import asyncio
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QThread
 
 # Ensure project root is in path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from src.utils.event_bus import EventBus
-from src.utils.logger import SystemLogger
-from src.audio.capture import AudioCapture
-from src.transcription.stt_manager import STTManager
-from src.translation.manager import TranslationManager
-from src.gui.main_window import MainWindow
-from src.gui.qt_event_bridge import QtEventBridge
+from src.utils.startup_timer import startup_timer
+with startup_timer.phase("gui_imports"):
+    from src.utils.event_bus import EventBus
+    from src.utils.logger import SystemLogger
+    from src.utils.thread_budget import ThreadBudget
+    from src.utils.app_config import default_config, load_user_config
+    from src.gui.main_window import MainWindow
+    from src.gui.qt_event_bridge import QtEventBridge
+# Backend modules (numpy, onnxruntime, faster-whisper, openai...) are imported by BackendWorker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -27,21 +30,28 @@ class BackendWorker(QThread):
         self.config = config
         self.logger = logger
         self.loop = None
+        self.shared = None
+        self.pipeline = None
+        self.extra_pipelines = [] # Headless pipelines from config["pipelines"], started/stopped with this one
         self.capture = None
         self.stt_manager = None
         self.translation_manager = None
         self._ready_event = threading.Event()
+        self._start_task = None
 
     def run(self):
         self.logger.info("BackendWorker thread started")
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
+        self._backend_ready = asyncio.Event()
+        budget = ThreadBudget.from_config(self.config)
+        if budget.pin:
+            # Executor threads run decodes and model loads; CTranslate2 threads they create inherit the STT cores
+            self.loop.set_default_executor(ThreadPoolExecutor(thread_name_prefix="stt", initializer=budget.pin_stt_thread))
         
-        # Initialize components inside the thread to be safe
-        self.capture = AudioCapture(self.bus, self.config, self.logger)
-        self.stt_manager = STTManager(self.bus, self.config, self.logger)
-        self.translation_manager = TranslationManager(self.bus, self.config)
-        
+        # Components are built by the first callback on the loop, so they exist before any
+        # GUI command queued via call_soon_threadsafe runs; the model loads in the background after
+        self.loop.call_soon(self._init_components)
         self._ready_event.set()
         
         try:
@@ -53,11 +63,37 @@ class BackendWorker(QThread):
             self.logger.info("BackendWorker thread stopped")
 
     def wait_until_ready(self):
+        """Waits for the event loop only; components and the model load after the GUI is up."""
         self._ready_event.wait()
 
+    def _init_components(self):
+        # Initialize components inside the thread to be safe
+        with startup_timer.phase("backend_imports"):
+            from src.pipeline.pipeline import Pipeline, create_pipelines
+            from src.pipeline.shared import SharedResources
+        with startup_timer.phase("backend_components"):
+            # The GUI drives the "main" pipeline on its own bus; any extra pipelines share its models and LLM client
+            self.shared = SharedResources(self.config)
+            self.pipeline = Pipeline("main", self.config, self.shared, self.logger, bus=self.bus).build()
+            self.extra_pipelines = create_pipelines(self.config, self.shared)
+            self.capture = self.pipeline.capture
+            self.stt_manager = self.pipeline.stt_manager
+            self.translation_manager = self.pipeline.translation_manager
+        self.loop.create_task(self._load_models())
+
+    async def _load_models(self):
+        with startup_timer.phase("stt_model_load"): # Includes the warm-up
+            await self.pipeline.load()
+            for pipeline in self.extra_pipelines:
+                await pipeline.load()
+        self._backend_ready.set()
+        startup_timer.mark("backend_ready")
+        startup_timer.report(self.logger)
+        self.bus.emit("app.startup_report", startup_timer.summary())
+
     def start_services(self):
         if self.loop:
-            self.loop.call_soon_threadsafe(self._start_services_async)
+            self.loop.call_soon_threadsafe(self._schedule_start)
 
     def stop_services(self):
         if self.loop:
@@ -77,8 +113,8 @@ class BackendWorker(QThread):
     
     def set_model(self, model_name):
         if self.loop:
-            # Model loading is heavy, maybe offload to executor? 
-            # For now, running it in loop might freeze audio processing for a few seconds, which is acceptable during config change.
+            # STTManager loads the new model in the background and swaps it in when ready,
+            # so audio processing keeps running on the current model meanwhile
             self.loop.call_soon_threadsafe(lambda: self.stt_manager.set_model(model_name))
 
     def set_audio_device(self, device_index):
@@ -120,7 +156,7 @@ class BackendWorker(QThread):
         self.config["audio"]["device_index"] = device_index
         
         # If capture is initialized and running, restart it
-        if self.capture and self.capture.stream and self.capture.stream.is_active():
+        if self.capture and self.capture.is_running:
              self.logger.info("Restarting audio capture with new device...")
              self.capture.stop()
              # Give it a moment to fully close if needed, though stop() is synchronous usually
@@ -131,21 +167,31 @@ class BackendWorker(QThread):
             self.loop.call_soon_threadsafe(self.loop.stop)
         self.quit()
         self.wait()
+        if self.shared:
+            self.shared.dialogue_writer.close() # Writes out the queued dialogue records
+
+    def _schedule_start(self):
+        self._start_task = asyncio.ensure_future(self._start_services_async())
 
-    def _start_services_async(self):
+    async def _start_services_async(self):
         self.logger.info("Starting STT and Audio Capture...")
-        self.stt_manager.start_processing()
-        self.capture.start()
+        if not self._backend_ready.is_set():
+            self.logger.info("Waiting for the STT model to finish loading...")
+            await self._backend_ready.wait()
+        # Pipelines warm up before their streams open so the first sentence runs at steady-state latency
+        await asyncio.gather(self.pipeline.start(), *(pipeline.start() for pipeline in self.extra_pipelines))
 
     def _stop_services_async(self):
         self.logger.info("Stopping STT and Audio Capture...")
-        self.capture.stop()
-        self.stt_manager.stop_processing()
-        if self.translation_manager:
-            self.translation_manager.stop()
+        if self._start_task and not self._start_task.done():
+            self._start_task.cancel() # Stop pressed during warm-up
+        for pipeline in (self.pipeline, *self.extra_pipelines):
+            if pipeline:
+                pipeline.stop()
 
 def main():
-    app = QApplication(sys.argv)
+    with startup_timer.phase("qt_app"):
+        app = QApplication(sys.argv)
     app.setApplicationName("Livestream Translator")
 
     # 1. Shared Components
@@ -153,56 +199,23 @@ def main():
     bus = EventBus()
     bridge = QtEventBridge(bus)
     
-    # 2. Configuration (from smoke test)
-    config = {
-        "audio": {
-            "output_device": "default",
-            "use_loopback": True
-        },
-        "chunk": {
-            "size_ms": 250,
-            "overlap_ms": 50
-        },
-        "stt": {
-            "mode": "local",
-            "model": "deepdml/faster-whisper-large-v3-turbo-ct2",
-            "device": "cuda",
-            "compute_type": "float16"
-        }
-    }
-
-    # Load User_config.txt
-    config_path = os.path.join(os.path.dirname(__file__), "User_config.txt")
-    if os.path.exists(config_path):
-        logger.info(f"Loading config from {config_path}")
-        with open(config_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    os.environ[key] = value # Set as env var for other components
-                    
-                    # Update config dict if applicable
-                    if key == "LLM_TRANSLATION_MODEL":
-                        # This might be used by translation manager, which reads from config or env?
-                        # TranslationManager uses config passed to it.
-                        config["llm_translation_model"] = value
-                    elif key == "LLM_SUMMARY_MODEL":
-                        config["llm_summary_model"] = value
-                    elif key == "USE_ORIGINAL_TEXT_FOR_CONTEXT":
-                        config["use_original_text_for_context"] = (value.lower() == "true")
-                    elif key == "TARGET_TRANSLATION_LANGUAGE":
-                        config["target_translation_language"] = value
+    # 2. Configuration (defaults, then User_config.txt)
+    config = load_user_config(default_config(), os.path.join(os.path.dirname(__file__), "User_config.txt"), logger)
+
+    # CPU thread budget (only with threads.enabled): env caps must be set before the backend imports numpy/librosa
+    budget = ThreadBudget.from_config(config)
+    budget.apply_env()
+    budget.pin_pipeline_thread() # Threads started from here on (backend loop, capture) inherit this
+    logger.info("CPU thread budget", **budget.describe())
 
     # 3. Backend Worker
     worker = BackendWorker(bus, config, logger)
     worker.start()
-    worker.wait_until_ready() # Wait for loop to initialize
+    worker.wait_until_ready() # Wait for loop to initialize (the model keeps loading in the background)
 
     # 4. GUI
-    window = MainWindow(bridge)
+    with startup_timer.phase("main_window"):
+        window = MainWindow(bridge)
     
     # Connect Window signals to Backend
     window.sig_start.connect(worker.start_services)
@@ -216,6 +229,7 @@ def main():
     window.sig_reset_context.connect(worker.reset_context)
     
     window.show()
+    startup_timer.mark("window_shown")
 
     logger.info("Application started")
     
@@ -0,0 +1,192 @@
+"""
+Headless runner: the same capture -> STT -> translation pipeline as the GUI, on a plain
+asyncio loop without Qt (servers, containers, benchmarks).
+
+    python main_headless.py --source loopback
+    python main_headless.py --source device:3 --language ja --target-language English
+    python main_headless.py --source talk.wav --output subs.jsonl --format jsonl
+    python main_headless.py --source talk.wav --speed 4 --no-translate --model tiny --device cpu --compute-type int8
+    python main_headless.py --source synthetic --duration 120 --speed 0 --no-translate
+
+Subtitles go to stdout (or --output), logs to stderr. Ctrl+C / SIGTERM stops capture and
+waits for the sentences already captured to be transcribed and translated before exiting;
+a file source exits on its own once it has been replayed.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Ensure project root is in path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.utils.startup_timer import startup_timer
+from src.utils.app_config import default_config, load_user_config
+from src.utils.trace import trace_log, fork
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="loopback",
+                        help='"loopback" (default output device), "device:<index>", "synthetic" or a WAV file')
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="File/synthetic pacing: 1 = real time, N = N x real time, 0 = as fast as the STT stage keeps up")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of synthetic audio")
+    parser.add_argument("--output", help="Write subtitles to this file instead of stdout")
+    parser.add_argument("--format", choices=["text", "jsonl"], default="text")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "User_config.txt"))
+    parser.add_argument("--stt-mode", help="local, process, batched, api or remote")
+    parser.add_argument("--model")
+    parser.add_argument("--device")
+    parser.add_argument("--compute-type")
+    parser.add_argument("--language", help="Spoken language, e.g. en, ja (default: auto-detect)")
+    parser.add_argument("--target-language", help='Translation target, e.g. "English"')
+    parser.add_argument("--no-translate", action="store_true", help="Only transcribe (no LLM calls)")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="Seconds to wait for pending work on shutdown")
+    return parser.parse_args()
+
+
+def build_config(args, logger):
+    config = load_user_config(default_config(), args.config, logger)
+    stt_config = config["stt"]
+    for key, value in (("mode", args.stt_mode), ("model", args.model), ("device", args.device),
+                       ("compute_type", args.compute_type), ("language", args.language)):
+        if value is not None:
+            stt_config[key] = value
+    if args.target_language:
+        config["target_translation_language"] = args.target_language
+    if args.source == "loopback":
+        config["audio"]["source"] = "wasapi"
+    elif args.source.startswith("device:"):
+        config["audio"]["source"] = "wasapi"
+        config["audio"]["device_index"] = int(args.source.split(":", 1)[1])
+    elif args.source == "synthetic":
+        config["audio"]["source"] = {"type": "synthetic", "duration_sec": args.duration, "speed": args.speed}
+    else:
+        config["audio"]["source"] = {"type": "file", "path": args.source, "speed": args.speed}
+    return config
+
+
+class SubtitleWriter:
+    """
+    Prints final sentences (and their translations) as plain text or JSON lines.
+    JSON lines also carry the sentence's trace ID, audio position and per-stage latency.
+    """
+    def __init__(self, stream, format="text"):
+        self.stream = stream
+        self.format = format
+        self.t0 = time.perf_counter()
+        self.count = 0
+
+    def write(self, original, translation=None, sentence_id=None, trace=None):
+        self.count += 1
+        elapsed = time.perf_counter() - self.t0
+        stages = trace_log.finish(fork(trace), "output_written")
+        if self.format == "jsonl":
+            record = {"t": round(elapsed, 3), "id": sentence_id or self.count, "original": original}
+            if translation is not None:
+                record["translation"] = translation
+            if stages:
+                record["trace"] = stages
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            stamp = time.strftime("%H:%M:%S", time.gmtime(elapsed))
+            self.stream.write(f"[{stamp}] {original}\n")
+            if translation is not None:
+                self.stream.write(f"           {translation}\n")
+        self.stream.flush()
+
+
+async def run(args, config, logger, output, budget=None):
+    with startup_timer.phase("backend_imports"):
+        from src.pipeline.pipeline import Pipeline
+        from src.pipeline.shared import SharedResources
+
+    loop = asyncio.get_running_loop()
+    if budget is not None and budget.pin:
+        # Executor threads run decodes and model loads; CTranslate2 threads they create inherit the STT cores
+        loop.set_default_executor(ThreadPoolExecutor(thread_name_prefix="stt", initializer=budget.pin_stt_thread))
+    stop_event = asyncio.Event()
+    shared = SharedResources(config)
+    pipeline = Pipeline("main", config, shared, logger, translate=not args.no_translate)
+
+    with startup_timer.phase("backend_components"):
+        pipeline.build()
+
+    writer = SubtitleWriter(output, args.format)
+    if args.no_translate:
+        pipeline.bus.subscribe("stt.final_sentence", lambda data: writer.write(
+            data.get("sentence", ""), trace=data.get("trace")))
+    else:
+        pipeline.bus.subscribe("llm.translation_ready", lambda data: writer.write(
+            data.get("original", ""), data.get("translation", ""), data.get("id"), data.get("trace")))
+    # File and synthetic sources end on their own (emitted on their feed thread)
+    pipeline.bus.subscribe("audio.source_finished", lambda data: loop.call_soon_threadsafe(stop_event.set))
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, AttributeError):
+            pass # Windows: Ctrl+C raises KeyboardInterrupt instead
+
+    try:
+        with startup_timer.phase("stt_model_load"):
+            await pipeline.load()
+        with startup_timer.phase("pipeline_start"): # Includes the warm-up
+            await pipeline.start()
+        startup_timer.mark("listening")
+        startup_timer.report(logger)
+
+        await stop_event.wait()
+        logger.info("Stopping, waiting for pending transcriptions and translations...")
+    finally:
+        await pipeline.shutdown(args.drain_timeout)
+        await pipeline.close()
+        await shared.aclose()
+    logger.info(f"{writer.count} subtitle(s) written")
+    if pipeline.translation_manager:
+        report_latency(pipeline.translation_manager.latency_snapshot(), logger)
+
+
+def report_latency(snapshot, logger):
+    """Logs the per-stage percentiles since startup (the rolling window may have moved on)."""
+    rows = [
+        f"  {stage:<20} n={stats['total_count']:<5} mean {stats['total_mean']:>8.1f} ms  "
+        f"p99 {stats['total_p99']:>8.1f} ms  max {stats['total_max']:>8.1f} ms"
+        for stage, stats in snapshot["stages"].items() if stats["total_count"]
+    ]
+    if rows:
+        logger.info("Latency per stage:\n" + "\n".join(rows))
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    from src.utils.logger import SystemLogger
+    from src.utils.thread_budget import ThreadBudget
+
+    logger = SystemLogger("Headless")
+    config = build_config(args, logger)
+
+    # CPU thread budget (only with threads.enabled): env caps must be set before the backend imports numpy/librosa
+    budget = ThreadBudget.from_config(config)
+    budget.apply_env()
+    budget.pin_pipeline_thread()
+
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        asyncio.run(run(args, config, logger, output, budget))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
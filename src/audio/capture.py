@@ -1,77 +1,22 @@
 import threading
-import time
 import wave
-import numpy as np
-import pyaudiowpatch as pyaudio
 from typing import Optional, Dict, Any
 from src.utils.event_bus import EventBus
 from src.utils.logger import SystemLogger
-from src.audio.chunk_processor import ChunkProcessor
+from src.audio.source import AudioSource, AudioFormatConverter # AudioFormatConverter re-exported for existing imports
 
-class AudioFormatConverter:
-    """Converts audio to mono, 44100Hz, float32."""
-    
-    def convert(self, raw_bytes: bytes, source_rate: int, source_channels: int) -> np.ndarray:
-        # 1. Bytes -> Int16 numpy array
-        # pyaudiowpatch loopback usually gives Int16 or Float32 depending on setup, 
-        # but here we assume Int16 based on the stream open format paInt16.
-        audio_data = np.frombuffer(raw_bytes, dtype=np.int16)
-        
-        # 2. Reshape to (samples, channels)
-        if source_channels > 1:
-            audio_data = audio_data.reshape(-1, source_channels)
-            # Mix to mono - CRITICAL for consistency
-            audio_data = audio_data.mean(axis=1)
-        
-        # 3. Convert to float32 [-1.0, 1.0]
-        # Note: PyAudio Int16 is [-32768, 32767].
-        audio_float32 = audio_data.astype(np.float32) / 32768.0
-        
-        # IMPORTANT: Check if the audio needs normalization or gain boost
-        # Sometimes loopback volume is very low.
-        # rms = np.sqrt(np.mean(audio_float32**2))
-        # if rms > 0 and rms < 0.1:
-        #    audio_float32 = audio_float32 * (0.1 / rms) # Normalize to target RMS
-        
-        # 4. Resample if needed (Linear interpolation for simplicity)
-        if source_rate != 44100:
-            audio_float32 = self._resample(audio_float32, source_rate, 44100)
-            
-        return audio_float32
-
-    def _resample(self, audio: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
-        # Use librosa for high quality resampling in capture as well if available
-        try:
-            import librosa
-            return librosa.resample(audio, orig_sr=source_rate, target_sr=target_rate)
-        except ImportError:
-            duration_s = len(audio) / source_rate
-            target_length = int(duration_s * target_rate)
-            return np.interp(
-                np.linspace(0, len(audio), target_length, endpoint=False),
-                np.arange(len(audio)),
-                audio
-            )
-
-class AudioCapture:
+class AudioCapture(AudioSource):
+    """WASAPI loopback/input capture (Windows, pyaudiowpatch)."""
     def __init__(self, bus: EventBus, config: Dict[str, Any], logger: SystemLogger, save_wav_path: Optional[str] = None):
-        self.bus = bus
-        self.config = config
-        self.logger = logger
+        super().__init__(bus, config, logger)
         self.save_wav_path = save_wav_path
         
         self.output_device_name = config.get("audio", {}).get("output_device", "default")
         self.use_loopback = config.get("audio", {}).get("use_loopback", True)
-        self.chunk_ms = config.get("chunk", {}).get("size_ms", 640)
-        self.overlap_ms = config.get("chunk", {}).get("overlap_ms", 160)
-        
-        self.chunk_processor = ChunkProcessor(bus, 44100, self.chunk_ms, self.overlap_ms)
-        self.format_converter = AudioFormatConverter()
         
-        self.pyaudio_instance: Optional[pyaudio.PyAudio] = None
-        self.stream: Optional[pyaudio.Stream] = None
-        self.capture_thread: Optional[threading.Thread] = None
-        self.stop_event = threading.Event()
+        # pyaudiowpatch is imported on first use; PortAudio isn't needed to show the GUI
+        self.pyaudio_instance = None # pyaudio.PyAudio
+        self.stream = None # pyaudio.Stream
         
         self._wav_file = None
 
@@ -80,6 +25,7 @@ class AudioCapture:
         """Lists available audio input devices (including loopback)."""
         devices = []
         try:
+            import pyaudiowpatch as pyaudio
             p = pyaudio.PyAudio()
             try:
                 wasapi_info = p.get_host_api_info_by_type(pyaudio.paWASAPI)
@@ -108,6 +54,7 @@ class AudioCapture:
     def start(self):
         """Starts the audio capture stream."""
         try:
+            import pyaudiowpatch as pyaudio
             self.pyaudio_instance = pyaudio.PyAudio()
             wasapi_info = self.pyaudio_instance.get_host_api_info_by_type(pyaudio.paWASAPI)
             
@@ -161,6 +108,7 @@ class AudioCapture:
             if self.save_wav_path:
                 self._init_wav_file(native_rate, native_channels)
 
+            self.format_converter.reset()
             self.stop_event.clear()
             self.capture_thread = threading.Thread(
                 target=self._capture_loop, 
@@ -207,8 +155,7 @@ class AudioCapture:
                     self._wav_file.writeframes(data)
                 
                 # Convert and Process
-                audio_float32 = self.format_converter.convert(data, source_rate, source_channels)
-                self.chunk_processor.push(audio_float32)
+                self._process_block(data, source_rate, source_channels)
                 
             except Exception as e:
                 self.logger.error("Capture loop error", exc=e)
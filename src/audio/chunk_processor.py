@@ -1,43 +1,65 @@
+import time
 import numpy as np
 from src.utils.event_bus import EventBus
+from src.utils.trace import new_stream_id
+from src.audio.ring_buffer import AudioRingBuffer
 
 class ChunkProcessor:
-    def __init__(self, bus: EventBus, sample_rate: int, chunk_ms: int = 640, overlap_ms: int = 160):
+    def __init__(self, bus: EventBus, sample_rate: int, chunk_ms: int = 640, overlap_ms: int = 160, buffer_seconds: float = 0.5):
         self.bus = bus
         self.sample_rate = sample_rate
         self.chunk_samples = int(sample_rate * chunk_ms / 1000)
         self.overlap_samples = int(sample_rate * overlap_ms / 1000)
-        self.buffer = np.zeros(0, dtype=np.float32)
+        # Sliding window over the incoming blocks. Chunks leave it as copies, so it only holds
+        # one chunk plus `buffer_seconds` of headroom; larger blocks are taken in pieces
+        self.buffer = AudioRingBuffer(self.chunk_samples + int(sample_rate * buffer_seconds))
         self.chunk_id = 0
+        # Audio clock for tracing: stream offset (in samples) of the first sample in the buffer
+        self.sample_offset = 0
+        self.stream_id = new_stream_id()
+        # Set by unpaced sources: consumers may block the pushing thread rather than drop chunks
+        self.blocking = False
         
         # Validate
         if self.overlap_samples >= self.chunk_samples:
             raise ValueError("Overlap cannot be greater than or equal to chunk size")
 
     def push(self, data: np.ndarray):
-        self.buffer = np.concatenate([self.buffer, data])
+        # After the loop below fewer than chunk_samples remain, so this much always fits
+        room = self.buffer.capacity - self.chunk_samples + 1
+        for start in range(0, len(data), room):
+            self._push(data[start:start + room])
+
+    def _push(self, data: np.ndarray):
+        self.buffer.append(data)
         
         step = self.chunk_samples - self.overlap_samples
         
         while len(self.buffer) >= self.chunk_samples:
-            # Extract chunk
-            chunk = self.buffer[:self.chunk_samples]
+            # Extract chunk. Copied rather than leased: subscribers hand it to other threads
+            # (STT event loop, remote client) and this capture thread can't wait for them
+            chunk = self.buffer.view(0, self.chunk_samples).copy()
             
             # Emit event
             self.chunk_id += 1
-            # Debug log (remove later)
-            # print(f"[DEBUG] Chunk {self.chunk_id} ready, size: {len(chunk)}")
             
             self.bus.emit(
                 "audio.chunk_ready",
                 {
                     "chunk_id": self.chunk_id,
+                    "sample_rate": self.sample_rate,
                     "overlap_ms": self.overlap_samples * 1000 / self.sample_rate,
                     "duration_ms": self.chunk_samples * 1000 / self.sample_rate,
-                    "chunk": chunk  # Passing the actual data in the event payload for now
+                    "chunk": chunk,  # Passing the actual data in the event payload for now
+                    # Tracing: the utterance a chunk opens takes its trace ID (see src/utils/trace.py)
+                    "trace_id": f"{self.stream_id}-{self.chunk_id}",
+                    "sample_offset": self.sample_offset,
+                    "emitted_at": time.perf_counter(),
+                    "blocking": self.blocking
                 }
             )
             
             # Slide window: remove the non-overlapping part
-            self.buffer = self.buffer[step:]
+            self.buffer.consume(step)
+            self.sample_offset += step
 
@@ -0,0 +1,46 @@
+import wave
+from typing import Dict, Any, Optional
+from src.utils.event_bus import EventBus
+from src.utils.logger import SystemLogger
+from src.audio.source import PacedAudioSource
+
+
+class FileAudioSource(PacedAudioSource):
+    """
+    Replays a 16-bit PCM WAV file through the capture path, at its native rate and channel
+    count so the converter and resampler do the same work as for a live device.
+    speed: 1.0 = real time, N = N x real time, 0 = as fast as the consumer keeps up. `loop` restarts
+    the file at the end (load tests); the source then runs until stopped.
+    """
+    def __init__(self, bus: EventBus, config: Dict[str, Any], logger: SystemLogger, path: str,
+                 speed: float = 1.0, loop: bool = False, block_frames: int = 4096, tail_silence_sec: float = 1.0):
+        super().__init__(bus, config, logger, speed=speed, block_frames=block_frames, tail_silence_sec=tail_silence_sec)
+        self.path = path
+        self.loop = loop
+        self.stream = None # wave.Wave_read while replaying
+
+    def _describe(self) -> str:
+        return self.path
+
+    def _open(self) -> tuple:
+        self.stream = wave.open(self.path, "rb")
+        if self.stream.getsampwidth() != 2:
+            self.stream.close()
+            self.stream = None
+            raise ValueError(f"{self.path}: only 16-bit PCM WAV files are supported")
+        rate, channels = self.stream.getframerate(), self.stream.getnchannels()
+        self.logger.info(f"Replaying {self.path}: Rate={rate}, Channels={channels}, "
+                         f"Duration={self.stream.getnframes() / rate:.1f}s, Speed={self.speed or 'max'}")
+        return rate, channels
+
+    def _read_block(self) -> Optional[bytes]:
+        data = self.stream.readframes(self.block_frames)
+        if not data and self.loop:
+            self.stream.rewind()
+            data = self.stream.readframes(self.block_frames)
+        return data or None
+
+    def _close(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
@@ -0,0 +1,89 @@
+from math import gcd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class StreamingResampler:
+    """
+    Stateful polyphase FIR resampler for block-wise audio streams.
+
+    Converts source_rate -> target_rate by the rational factor up/down using a
+    Kaiser-windowed sinc low-pass split into `up` polyphase branches. The filter
+    spans `taps_per_phase` samples at the lower of the two rates, so its length
+    grows with max(up, down) and downsampling by a large factor (96k -> 16k) keeps
+    a sharp cutoff. The last input samples of every block are kept as history, so
+    consecutive blocks produce exactly the same output as resampling the whole
+    stream at once (no seams).
+
+    Every `up` consecutive outputs read one stretch of input that starts `down`
+    samples after the previous one, so the branches are laid out as a filter bank
+    over that stretch and a block is one product of strided input windows (a view,
+    no gather) with the bank. Allocation per call is O(block), not O(block * taps).
+    """
+    def __init__(self, source_rate: int, target_rate: int, taps_per_phase: int = 32,
+                 cutoff: float = 0.92, beta: float = 8.0):
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+        g = gcd(source_rate, target_rate)
+        self.up = target_rate // g
+        self.down = source_rate // g
+        # Taps per polyphase branch (input samples per output); the cutoff sits at the lower rate
+        self.taps = -(-taps_per_phase * max(self.up, self.down) // self.up)
+
+        # Prototype low-pass designed at the upsampled rate (source_rate * up)
+        num_taps = self.taps * self.up
+        fc = cutoff * 0.5 / max(self.up, self.down) # cycles per upsampled sample
+        n = np.arange(num_taps) - (num_taps - 1) / 2
+        h = 2 * fc * np.sinc(2 * fc * n) * np.kaiser(num_taps, beta) * self.up
+
+        # poly[p, k] = h[p + k * up]; reversed along k so a forward window dot-product applies it
+        self.poly = np.ascontiguousarray(h.reshape(self.taps, self.up).T[:, ::-1], dtype=np.float32)
+
+        # Output q * up + c ends its window at input q * down + newest[c] and uses branch (c * down) % up;
+        # bank[c] is that branch placed at its offset within the `span` inputs a group of outputs reads
+        newest = np.arange(self.up) * self.down // self.up
+        self.span = int(newest[-1]) + self.taps
+        self.bank = np.zeros((self.up, self.span), dtype=np.float32)
+        for c in range(self.up):
+            self.bank[c, newest[c]:newest[c] + self.taps] = self.poly[c * self.down % self.up]
+        # History must reach back to the first group of the next block, up to `down` inputs earlier
+        self._keep = self.taps - 1 + self.down
+        self.reset()
+
+    def reset(self):
+        """Clears the filter state (e.g. when a stream is reopened)."""
+        self.history = np.zeros(self._keep, dtype=np.float32)
+        self.history_start = -self._keep # Absolute input index of history[0]
+        self.next_output = 0 # Absolute index of the next output sample
+
+    @property
+    def delay_samples(self) -> float:
+        """Group delay of the filter in output samples."""
+        return (self.taps * self.up - 1) / 2 / self.down
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if self.up == self.down:
+            return block.astype(np.float32, copy=False)
+
+        # Zero padding lets the last group run past the input; outputs that read it are dropped
+        buf = np.concatenate((self.history, block.astype(np.float32, copy=False), np.zeros(self.span, dtype=np.float32)))
+        buf_start = self.history_start
+        buf_end = buf_start + len(buf) - self.span # Absolute index one past the last input sample
+
+        # Output n needs input sample floor(n * down / up), which must already be available
+        last_output = -(-(buf_end * self.up) // self.down) # ceil
+        first_group = self.next_output // self.up
+        groups = -(-last_output // self.up) - first_group
+        start = first_group * self.down - (self.taps - 1) - buf_start # Position in buf of the first group's input
+        windows = sliding_window_view(buf, self.span)[start:start + groups * self.down:self.down]
+        if self.up > 4:
+            out = (windows @ self.bank.T).reshape(-1) # BLAS pays off once the bank has many rows
+        else:
+            out = np.einsum("gs,cs->gc", windows, self.bank).reshape(-1) # Reads the strided view in place
+        skip = self.next_output - first_group * self.up
+        out = out[skip:skip + last_output - self.next_output]
+        self.next_output = last_output
+
+        self.history = buf[buf_end - buf_start - self._keep:buf_end - buf_start].copy()
+        self.history_start = buf_end - self._keep
+        return out
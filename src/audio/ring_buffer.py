@@ -0,0 +1,111 @@
+from collections import Counter
+import numpy as np
+
+
+class RingLease:
+    """
+    A zero-copy view of ring samples that the owner promises not to overwrite until it
+    is released (see AudioRingBuffer.lease). Usable as a context manager.
+    """
+    def __init__(self, ring, start: int, audio: np.ndarray):
+        self.ring = ring
+        self.start = start # Absolute index of audio[0]
+        self.audio = audio
+
+    def release(self):
+        if self.ring is not None:
+            self.ring._release(self.start)
+            self.ring = None
+
+    def __enter__(self) -> np.ndarray:
+        return self.audio
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity float32 FIFO with zero-copy contiguous views.
+
+    The storage is mirrored (every sample is written at i and i + capacity), so
+    any window of up to `capacity` samples is one contiguous slice and can be
+    handed out as a numpy view without copying. Appends cost O(len(data)) and
+    memory stays flat no matter how long the stream runs.
+
+    A view stays valid until `capacity` newer samples have been appended after
+    its start. Consumers that hold data longer than that either copy it or take a
+    lease: append() itself never blocks, so the writer checks writable() and waits
+    for leases to be released before appending more than that.
+    """
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.capacity = int(capacity)
+        self._storage = np.zeros(2 * self.capacity, dtype=np.float32)
+        self.head = 0 # Absolute index of the oldest buffered sample
+        self.tail = 0 # Absolute index one past the newest sample
+        self.dropped = 0 # Samples discarded because the buffer overflowed
+        self._leases = Counter() # Absolute start index -> number of live leases
+
+    def __len__(self) -> int:
+        return self.tail - self.head
+
+    def append(self, data: np.ndarray):
+        """Appends samples, discarding the oldest ones if the buffer would overflow."""
+        n = len(data)
+        if n > self.capacity:
+            self.dropped += n - self.capacity
+            self.head += n - self.capacity
+            self.tail += n - self.capacity
+            data = data[n - self.capacity:]
+            n = self.capacity
+
+        overflow = len(self) + n - self.capacity
+        if overflow > 0:
+            self.head += overflow
+            self.dropped += overflow
+
+        pos = self.tail % self.capacity
+        first = min(n, self.capacity - pos)
+        rest = n - first
+        cap = self.capacity
+        self._storage[pos:pos + first] = data[:first]
+        self._storage[pos + cap:pos + cap + first] = data[:first]
+        if rest:
+            self._storage[:rest] = data[first:]
+            self._storage[cap:cap + rest] = data[first:]
+        self.tail += n
+
+    def view(self, start: int = 0, length: int = None) -> np.ndarray:
+        """Returns a zero-copy view of `length` samples starting `start` samples after the head."""
+        available = len(self) - start
+        if length is None or length > available:
+            length = max(available, 0)
+        pos = (self.head + start) % self.capacity
+        return self._storage[pos:pos + length]
+
+    def lease(self, start: int = 0, length: int = None) -> RingLease:
+        """Like view(), but writable() keeps appends from overwriting it until it is released."""
+        audio = self.view(start, length)
+        absolute = self.head + min(max(start, 0), len(self))
+        self._leases[absolute] += 1
+        return RingLease(self, absolute, audio)
+
+    def _release(self, start: int):
+        self._leases[start] -= 1
+        if self._leases[start] <= 0:
+            del self._leases[start]
+
+    def writable(self) -> int:
+        """How many samples can be appended without overwriting a leased view (None: no limit)."""
+        if not self._leases:
+            return None
+        return min(self._leases) + self.capacity - self.tail
+
+    def consume(self, n: int):
+        """Drops the `n` oldest samples."""
+        self.head += min(max(n, 0), len(self))
+
+    def clear(self):
+        self.head = self.tail
@@ -0,0 +1,194 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any
+import numpy as np
+from src.utils.event_bus import EventBus
+from src.utils.logger import SystemLogger
+from src.audio.chunk_processor import ChunkProcessor
+from src.audio.resampler import StreamingResampler
+
+class AudioFormatConverter:
+    """Converts audio to mono, float32 at the pipeline sample rate (16000Hz by default)."""
+
+    def __init__(self, target_rate: int = 16000):
+        self.target_rate = target_rate
+        self._resampler: Optional[StreamingResampler] = None
+
+    def reset(self):
+        """Drops resampler state so a reopened stream does not inherit old samples."""
+        self._resampler = None
+
+    def convert(self, raw_bytes: bytes, source_rate: int, source_channels: int) -> np.ndarray:
+        # 1. Bytes -> Int16 numpy array
+        # pyaudiowpatch loopback usually gives Int16 or Float32 depending on setup,
+        # but here we assume Int16 based on the stream open format paInt16.
+        audio_data = np.frombuffer(raw_bytes, dtype=np.int16)
+
+        # 2. Reshape to (samples, channels)
+        if source_channels > 1:
+            audio_data = audio_data.reshape(-1, source_channels)
+            # Mix to mono - CRITICAL for consistency
+            audio_data = audio_data.mean(axis=1)
+
+        # 3. Convert to float32 [-1.0, 1.0]
+        # Note: PyAudio Int16 is [-32768, 32767].
+        audio_float32 = audio_data.astype(np.float32) / 32768.0
+
+        # IMPORTANT: Check if the audio needs normalization or gain boost
+        # Sometimes loopback volume is very low.
+        # rms = np.sqrt(np.mean(audio_float32**2))
+        # if rms > 0 and rms < 0.1:
+        #    audio_float32 = audio_float32 * (0.1 / rms) # Normalize to target RMS
+
+        # 4. Resample straight to the target rate with a stateful polyphase filter,
+        # so block edges are seamless and the STT stage never has to resample again
+        if source_rate != self.target_rate:
+            if self._resampler is None or self._resampler.source_rate != source_rate:
+                self._resampler = StreamingResampler(source_rate, self.target_rate)
+            audio_float32 = self._resampler.process(audio_float32)
+
+        return audio_float32
+
+class AudioSource(ABC):
+    """
+    Something that produces interleaved int16 blocks at its native rate and channel count.
+    Every source hands its blocks to `_process_block`, i.e. the same converter and
+    ChunkProcessor path, so audio.chunk_ready looks the same whatever the source is.
+    """
+    def __init__(self, bus: EventBus, config: Dict[str, Any], logger: SystemLogger):
+        self.bus = bus
+        self.config = config
+        self.logger = logger
+        self.chunk_ms = config.get("chunk", {}).get("size_ms", 640)
+        self.overlap_ms = config.get("chunk", {}).get("overlap_ms", 160)
+        # Pipeline-wide sample rate: everything after the converter (chunks, VAD, STT) runs at this rate
+        self.sample_rate = config.get("audio", {}).get("sample_rate", 16000)
+
+        self.chunk_processor = ChunkProcessor(bus, self.sample_rate, self.chunk_ms, self.overlap_ms)
+        self.format_converter = AudioFormatConverter(target_rate=self.sample_rate)
+        self.capture_thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+
+    @abstractmethod
+    def start(self):
+        """Opens the source and starts feeding chunks from a background thread."""
+        pass
+
+    @abstractmethod
+    def stop(self):
+        """Stops feeding and releases the source; emits audio.stream_closed."""
+        pass
+
+    @property
+    def is_running(self) -> bool:
+        return self.capture_thread is not None and self.capture_thread.is_alive()
+
+    def _process_block(self, data: bytes, source_rate: int, source_channels: int):
+        audio_float32 = self.format_converter.convert(data, source_rate, source_channels)
+        self.chunk_processor.push(audio_float32)
+
+class PacedAudioSource(AudioSource):
+    """
+    Base for sources that generate or read their blocks rather than wait for a device.
+    `speed` paces them: 1.0 = real time, N = N x real time, 0 = as fast as the consumer
+    takes the chunks: the chunks are marked "blocking", so the STT manager holds the feed
+    thread while its queue is full instead of dropping them.
+    At the end, `tail_silence_sec` of silence lets the last utterance finalize; then
+    audio.source_finished is emitted and `finished` is set.
+    """
+    def __init__(self, bus: EventBus, config: Dict[str, Any], logger: SystemLogger,
+                 speed: float = 1.0, block_frames: int = 4096, tail_silence_sec: float = 1.0):
+        super().__init__(bus, config, logger)
+        self.speed = speed
+        self.block_frames = block_frames # Same block size the WASAPI capture reads
+        self.tail_silence_sec = tail_silence_sec
+        self.finished = threading.Event()
+        self.blocks_late = 0 # Blocks that were pushed after their real-time deadline
+
+    @abstractmethod
+    def _open(self) -> tuple:
+        """Prepares the source and returns (native rate, channels)."""
+        pass
+
+    @abstractmethod
+    def _read_block(self) -> Optional[bytes]:
+        """Next block of interleaved int16 bytes (up to block_frames), None at the end."""
+        pass
+
+    def _close(self):
+        pass
+
+    def _describe(self) -> str:
+        return type(self).__name__
+
+    def start(self):
+        rate, channels = self._open()
+        self.bus.emit("audio.stream_opened", {
+            "device_name": self._describe(),
+            "sample_rate": rate,
+            "channels": channels
+        })
+        self.format_converter.reset()
+        self.chunk_processor.blocking = self.speed <= 0
+        self.stop_event.clear()
+        self.finished.clear()
+        self.capture_thread = threading.Thread(target=self._feed_loop, args=(rate, channels), daemon=True)
+        self.capture_thread.start()
+
+    def _feed_loop(self, source_rate, source_channels):
+        frame_bytes = 2 * source_channels
+        deadline = time.perf_counter()
+        try:
+            while not self.stop_event.is_set():
+                data = self._read_block()
+                if not data:
+                    break
+                self._process_block(data, source_rate, source_channels)
+                if self.speed > 0:
+                    # Pace like a live device: one block per block duration (divided by speed)
+                    deadline += len(data) / frame_bytes / source_rate / self.speed
+                    delay = deadline - time.perf_counter()
+                    if delay > 0:
+                        self.stop_event.wait(delay)
+                    else:
+                        self.blocks_late += 1
+
+            if not self.stop_event.is_set() and self.tail_silence_sec > 0:
+                self.chunk_processor.push(np.zeros(int(self.tail_silence_sec * self.sample_rate), dtype=np.float32))
+        except Exception as e:
+            self.logger.error(f"{self._describe()} feed loop error", exc=e)
+        self.finished.set()
+        self.bus.emit("audio.source_finished", {"source": self._describe()})
+
+    def stop(self):
+        self.stop_event.set()
+        if self.capture_thread:
+            self.capture_thread.join()
+        self._close()
+        self.bus.emit("audio.stream_closed", {})
+
+def create_audio_source(bus: EventBus, config: Dict[str, Any], logger: SystemLogger) -> AudioSource:
+    """
+    Builds the source named by config["audio"]["source"]:
+        "wasapi" (default): the loopback/input device (AudioCapture)
+        {"type": "file", "path": "talk.wav", "speed": 1.0, "loop": False}
+        {"type": "synthetic", "duration_sec": 60, "seed": 0, "speed": 1.0}
+    A plain string is the type, or a WAV path.
+    """
+    source = config.get("audio", {}).get("source", "wasapi")
+    if isinstance(source, str):
+        source = {"type": source} if source in ("wasapi", "synthetic") else {"type": "file", "path": source}
+    options = {key: value for key, value in source.items() if key != "type"}
+    kind = source.get("type", "wasapi")
+
+    if kind == "wasapi":
+        from src.audio.capture import AudioCapture
+        return AudioCapture(bus, config, logger, **options)
+    elif kind == "file":
+        from src.audio.file_source import FileAudioSource
+        return FileAudioSource(bus, config, logger, **options)
+    elif kind == "synthetic":
+        from src.audio.synthetic_source import SyntheticAudioSource
+        return SyntheticAudioSource(bus, config, logger, **options)
+    raise ValueError(f"Unknown audio source type: {kind}")
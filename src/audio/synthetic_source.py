@@ -0,0 +1,78 @@
+from typing import Dict, Any, Optional
+import numpy as np
+from src.utils.event_bus import EventBus
+from src.utils.logger import SystemLogger
+from src.audio.source import PacedAudioSource
+
+
+class SyntheticAudioSource(PacedAudioSource):
+    """
+    Deterministic speech/silence generator for load tests and profiling without audio files.
+
+    "Speech" segments are voiced tones (harmonics of a gliding 100-220 Hz pitch, modulated
+    at a syllable rate) alternating with silence, over a low noise floor. It exercises VAD,
+    chunking, finalization and the decoder's workload, not recognition: decoders return
+    little or no text for it. Output is interleaved int16 at `rate`/`channels` (48 kHz
+    stereo by default, like a loopback device), so the converter does its usual work.
+    The same seed gives the same audio; `segments` lists the (start, end) seconds of speech.
+    """
+    def __init__(self, bus: EventBus, config: Dict[str, Any], logger: SystemLogger,
+                 duration_sec: float = 60.0, speech_sec=(1.0, 4.0), silence_sec=(0.4, 1.5),
+                 rate: int = 48000, channels: int = 2, level: float = 0.2, noise_level: float = 0.003,
+                 seed: int = 0, speed: float = 1.0, block_frames: int = 4096, tail_silence_sec: float = 1.0):
+        super().__init__(bus, config, logger, speed=speed, block_frames=block_frames, tail_silence_sec=tail_silence_sec)
+        self.duration_sec = duration_sec # 0/None: until stopped
+        self.speech_sec = speech_sec
+        self.silence_sec = silence_sec
+        self.rate = rate
+        self.channels = channels
+        self.level = level
+        self.noise_level = noise_level
+        self.seed = seed
+        self.segments = []
+
+    def _describe(self) -> str:
+        return f"synthetic(seed={self.seed})"
+
+    def _open(self) -> tuple:
+        self._rng = np.random.default_rng(self.seed)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._produced = 0 # Frames generated so far
+        self._speech_next = False # Start with a short silence, like a stream
+        self.segments = []
+        self.logger.info(f"Synthetic audio: Rate={self.rate}, Channels={self.channels}, "
+                         f"Duration={self.duration_sec or 'unlimited'}s, Speed={self.speed or 'max'}")
+        return self.rate, self.channels
+
+    def _read_block(self) -> Optional[bytes]:
+        total = int(self.duration_sec * self.rate) if self.duration_sec else None
+        while len(self._pending) < self.block_frames and (total is None or self._produced < total):
+            self._pending = np.concatenate((self._pending, self._next_segment()))
+        if total is not None:
+            remaining = total - (self._produced - len(self._pending))
+            self._pending = self._pending[:max(remaining, 0)]
+        if not len(self._pending):
+            return None
+
+        block, self._pending = self._pending[:self.block_frames], self._pending[self.block_frames:]
+        block = block + self._rng.standard_normal(len(block)).astype(np.float32) * self.noise_level
+        pcm = (np.clip(block, -1.0, 1.0) * 32767).astype(np.int16)
+        return np.repeat(pcm[:, None], self.channels, axis=1).tobytes()
+
+    def _next_segment(self) -> np.ndarray:
+        speech, self._speech_next = self._speech_next, not self._speech_next
+        low, high = self.speech_sec if speech else self.silence_sec
+        n = int(self._rng.uniform(low, high) * self.rate)
+        start = self._produced
+        self._produced += n
+        if not speech:
+            return np.zeros(n, dtype=np.float32)
+
+        self.segments.append((start / self.rate, self._produced / self.rate))
+        t = np.arange(n) / self.rate
+        f0 = self._rng.uniform(100, 220) * (1 + 0.15 * np.sin(2 * np.pi * self._rng.uniform(0.3, 1.0) * t))
+        phase = 2 * np.pi * np.cumsum(f0) / self.rate
+        voice = sum(np.sin(k * phase) / k for k in range(1, 9))
+        syllables = 0.55 - 0.45 * np.cos(2 * np.pi * self._rng.uniform(3.0, 5.0) * t)
+        fade = np.minimum(1.0, np.minimum(t, t[::-1]) / 0.02) # 20 ms ramps, no clicks
+        return (self.level * voice * syllables * fade / 2.7).astype(np.float32)
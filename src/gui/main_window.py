@@ -1,10 +1,9 @@
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QPlainTextEdit, QLabel, QGroupBox, QComboBox, QSpinBox, QStyle
-from PySide6.QtCore import Signal, Slot, QSize
+from PySide6.QtCore import Signal, Slot, QSize, QTimer
 from PySide6.QtGui import QIcon, QFont
 from src.utils.localization import i18n
 from .overlay_window import OverlayWindow
 from .settings_window import SettingsWindow
-from src.audio.capture import AudioCapture
 
 class MainWindow(QMainWindow):
     # Signals to control the backend
@@ -264,8 +263,8 @@ class MainWindow(QMainWindow):
         # Load initial overlay settings
         self.load_overlay_settings()
 
-        # Initial population of audio devices
-        self.refresh_audio_devices()
+        # Initial population of audio devices, once the window is up (enumeration loads PortAudio)
+        QTimer.singleShot(0, self.refresh_audio_devices)
 
         # Initialize device and compute type from config (will be set by main_gui)
         # Default to CUDA and float16
@@ -314,6 +313,7 @@ class MainWindow(QMainWindow):
         self.combo_audio.addItem("Default System Output (Loopback)", None)
         
         try:
+            from src.audio.capture import AudioCapture
             devices = AudioCapture.list_audio_devices()
             for dev in devices:
                 name = dev["name"]
@@ -2,6 +2,7 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGraphicsDropShadowE
 from PySide6.QtCore import Qt, QPoint, QRect, QTimer
 from PySide6.QtGui import QFont, QColor, QCursor, QLinearGradient, QPalette, QBrush
 from src.utils.localization import i18n
+from src.utils.trace import trace_log
 
 class OverlayWindow(QWidget):
     MARGIN = 10  # Resize boundary width
@@ -193,14 +194,15 @@ class OverlayWindow(QWidget):
         self.bg_color.setAlpha(alpha)
         self.update()
 
-    def update_partial(self, text):
+    def update_partial(self, text, trace=None):
         self.lbl_ongoing.setText(text)
         if not self.is_transcribing:
             self.is_transcribing = True
             self.shimmer_timer.start(100) # 100ms update rate
             self.lbl_ongoing.show()
+        trace_log.finish(trace, "overlay_rendered")
 
-    def on_final_sentence(self, text):
+    def on_final_sentence(self, text, trace=None):
         # Stop shimmer
         self.is_transcribing = False
         self.shimmer_timer.stop()
@@ -227,11 +229,14 @@ class OverlayWindow(QWidget):
             
         # Set new final
         self.lbl_final.setText(text)
+        trace_log.finish(trace, "overlay_rendered")
         # Keep old translation until new one arrives to avoid flickering "..."
         # self.lbl_translation.setText("...") 
         
-    def update_translation(self, text):
+    def update_translation(self, text, trace=None):
         self.lbl_translation.setText(text)
+        # The repaint itself follows in this event loop iteration
+        trace_log.finish(trace, "overlay_rendered")
         
     def update_context(self, text):
         self.lbl_context.setText(f"Context: {text}")
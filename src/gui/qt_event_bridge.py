@@ -1,12 +1,15 @@
 from PySide6.QtCore import QObject, Signal
+from src.utils import trace as tracing
 
 class QtEventBridge(QObject):
     """
     Bridges non-Qt events (EventBus) to Qt Signals for thread-safe UI updates.
+    Text signals carry the utterance trace (or None) so the overlay can stamp when it
+    rendered; each gets its own copy, the bus side may still be adding stages.
     """
-    sig_stt_partial = Signal(str)
-    sig_stt_final = Signal(str)
-    sig_translation = Signal(str)
+    sig_stt_partial = Signal(str, object) # text, trace
+    sig_stt_final = Signal(str, object)
+    sig_translation = Signal(str, object)
     sig_context = Signal(str)
     sig_log = Signal(str, str) # level, message
 
@@ -19,27 +22,47 @@ class QtEventBridge(QObject):
         self.bus.subscribe("stt.final_sentence", self._on_stt_final)
         self.bus.subscribe("llm.translation_ready", self._on_translation_ready)
         self.bus.subscribe("llm2.context_update_finished", self._on_context_update)
+        self.bus.subscribe("stt.model_loading", self._on_model_loading)
+        self.bus.subscribe("stt.model_ready", self._on_model_ready)
+        self.bus.subscribe("stt.model_failed", self._on_model_failed)
 
     def _on_stt_partial(self, data):
         text = data.get("text", "")
         if text:
-            self.sig_stt_partial.emit(text)
+            self.sig_stt_partial.emit(text, self._hop(data, "partial"))
 
     def _on_stt_final(self, data):
         text = data.get("sentence", "")
         if text:
-            self.sig_stt_final.emit(text)
+            self.sig_stt_final.emit(text, self._hop(data, "final"))
 
     def _on_translation_ready(self, data):
         text = data.get("translation", "")
         if text:
-            self.sig_translation.emit(text)
+            self.sig_translation.emit(text, self._hop(data, "translation"))
+
+    @staticmethod
+    def _hop(data, kind):
+        # Stamped here on the emitting thread; the overlay stamps the other end on the GUI thread
+        return tracing.mark(tracing.fork(data.get("trace"), kind), "qt_queued")
 
     def _on_context_update(self, data):
         context = data.get("context", "")
         if context:
             self.sig_context.emit(context)
 
+    def _on_model_loading(self, data):
+        self.sig_log.emit("INFO", f"Loading STT model in background: {data.get('model')}")
+
+    def _on_model_ready(self, data):
+        self.sig_log.emit("INFO", f"STT model ready: {data.get('model')} ({data.get('load_ms', 0) / 1000:.1f}s)")
+
+    def _on_model_failed(self, data):
+        if data.get("error"):
+            self.sig_log.emit("ERROR", f"STT model {data.get('model') or '(server default)'} failed: {data['error']}")
+        else:
+            self.sig_log.emit("ERROR", f"Failed to load STT model: {data.get('model')}, keeping the current one")
+
     def emit_log(self, level, message):
         """Can be called by a custom logging handler."""
         self.sig_log.emit(level, message)
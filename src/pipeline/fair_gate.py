@@ -0,0 +1,62 @@
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+
+class FairGate:
+    """
+    Limits how many jobs run at once and hands free slots to waiting pipelines round-robin.
+
+    A pipeline that queues many jobs only gets every n-th slot while n pipelines are
+    waiting, so a busy stream can't starve the others. Within one pipeline jobs keep
+    their order. All users must share one event loop.
+    """
+    def __init__(self, slots: int = 1):
+        self.slots = max(1, slots)
+        self.active = 0
+        self._waiters = OrderedDict() # key -> deque of futures, in rotation order
+        self.granted = {} # key -> number of slots granted, for metrics
+
+    @asynccontextmanager
+    async def slot(self, key):
+        if self.active < self.slots and not self._waiters:
+            self.active += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.setdefault(key, deque()).append(future)
+            try:
+                await future # The releasing job hands its slot over
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release() # Granted just before the cancel; pass it on
+                else:
+                    self._discard(key, future)
+                raise
+        self.granted[key] = self.granted.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        while self._waiters:
+            key, queue = next(iter(self._waiters.items()))
+            future = queue.popleft()
+            if queue:
+                self._waiters.move_to_end(key) # Next pipeline's turn
+            else:
+                del self._waiters[key]
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def _discard(self, key, future):
+        queue = self._waiters.get(key)
+        if queue and future in queue:
+            queue.remove(future)
+            if not queue:
+                del self._waiters[key]
+
+    def waiting(self) -> dict:
+        return {key: len(queue) for key, queue in self._waiters.items()}
@@ -0,0 +1,151 @@
+import asyncio
+import copy
+from typing import Dict, Any, List
+from src.utils.event_bus import EventBus
+from src.utils.logger import SystemLogger
+from .shared import SharedResources
+
+
+def pipeline_config(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of `base` with `overrides` merged in (nested dicts are merged key by key)."""
+    merged = copy.deepcopy(base)
+    merged.pop("pipelines", None)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = pipeline_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+class Pipeline:
+    """
+    One capture -> STT -> translation chain with its own event bus, audio source, spoken
+    language and target language. Several can run on one event loop; model weights,
+    the LLM client and the dialogue writer come from SharedResources, and decodes and
+    LLM requests of different pipelines take turns through its fair gates.
+    """
+    def __init__(self, name: str, config: Dict[str, Any], shared: SharedResources = None,
+                 logger=None, bus: EventBus = None, translate: bool = True):
+        self.name = name
+        self.config = config
+        self.shared = shared or SharedResources(config)
+        self.logger = logger or SystemLogger(f"Pipeline[{name}]")
+        self.bus = bus or EventBus()
+        self.capture = None
+        self.stt_manager = None
+        self.translation_manager = None
+        self.translate = translate # False: STT only, no LLM client is created
+        self.running = False
+
+    def build(self, capture=None):
+        """
+        Creates the components without loading the model (see load).
+        The audio source comes from config["audio"]["source"] unless `capture` (an AudioSource on this bus) is given.
+        """
+        from src.audio.source import create_audio_source
+        from src.transcription.stt_manager import STTManager
+        from src.translation.manager import TranslationManager
+        from src.translation.llm_client import LLMClient
+        from src.utils.dialogue_logger import DialogueLogger
+
+        self.capture = capture or create_audio_source(self.bus, self.config, self.logger)
+        stt_class = STTManager
+        if self.config.get("stt", {}).get("mode") == "remote":
+            # Decoding runs on an STT server; the client stands in for STTManager
+            from src.transcription.remote_stt import RemoteSTTClient
+            stt_class = RemoteSTTClient
+        self.stt_manager = stt_class(self.bus, self.config, self.logger, load_engine=False,
+                                    decode_gate=self.shared.stt_gate, name=self.name)
+        self.stt_manager.language = self.config.get("stt", {}).get("language")
+
+        if not self.translate:
+            return self
+        client = self.shared.openai_client(self.config.get("api_key"), self.config.get("base_url"))
+        llm_client = LLMClient(self.config, client=client, gate=self.shared.llm_gate, gate_key=self.name)
+        # Only name the log file when there is more than the default pipeline
+        dialogue_logger = DialogueLogger(output_dir=self.config.get("log_dir", "logs/dialogue"),
+                                         writer=self.shared.dialogue_writer,
+                                         name=None if self.name == "main" else self.name)
+        self.translation_manager = TranslationManager(self.bus, self.config, llm_client=llm_client,
+                                                      dialogue_logger=dialogue_logger)
+        return self
+
+    async def load(self) -> bool:
+        """Loads (or reuses from the registry) the STT model."""
+        return await self.stt_manager.load_engine()
+
+    async def start(self):
+        await self.stt_manager.warm_up()
+        self.stt_manager.start_processing()
+        self.capture.start()
+        self.running = True
+        self.logger.info(f"Pipeline {self.name} started")
+
+    def stop(self):
+        self.capture.stop()
+        self._stop_processing()
+
+    async def shutdown(self, timeout: float = 30.0):
+        """Stops capture, lets STT and translation finish what was already captured, then stops."""
+        if not self.running:
+            return
+        self.capture.stop()
+        if hasattr(self.stt_manager, 'drain'):
+            await self.stt_manager.drain(timeout)
+        if self.translation_manager:
+            await self.translation_manager.drain(timeout)
+        self._stop_processing()
+
+    def _stop_processing(self):
+        self.running = False
+        self.stt_manager.stop_processing()
+        if self.translation_manager:
+            self.translation_manager.stop()
+        self.logger.info(f"Pipeline {self.name} stopped")
+
+    async def close(self):
+        if self.running:
+            self.stop()
+        if hasattr(self.stt_manager, 'aclose'):
+            await self.stt_manager.aclose()
+        engine = self.stt_manager.engine if self.stt_manager else None
+        if engine is not None and hasattr(engine, 'close'):
+            self.stt_manager.engine = None
+            await self.stt_manager._close_engine(engine)
+
+    # --- Per-pipeline settings ---
+
+    def set_language(self, lang_code):
+        self.stt_manager.set_language(lang_code)
+
+    def set_target_language(self, lang_name):
+        if self.translation_manager:
+            self.translation_manager.set_target_language(lang_name)
+
+    def set_model(self, model_name):
+        self.stt_manager.set_model(model_name)
+
+
+def create_pipelines(config: Dict[str, Any], shared: SharedResources = None, logger=None) -> List[Pipeline]:
+    """
+    Builds one pipeline per entry of config["pipelines"], each entry overriding the base config, e.g.
+        "pipelines": [{"name": "en", "audio": {"device_index": 3}, "stt": {"language": "en"}},
+                      {"name": "ja", "audio": {"device_index": 5}, "stt": {"language": "ja"},
+                       "target_translation_language": "English"}]
+    User_config.txt fills it from PIPELINE_<NAME>_<FIELD> keys (see load_user_config).
+    """
+    shared = shared or SharedResources(config)
+    pipelines = []
+    for i, overrides in enumerate(config.get("pipelines", [])):
+        overrides = dict(overrides)
+        name = overrides.pop("name", f"pipeline{i + 1}")
+        pipelines.append(Pipeline(name, pipeline_config(config, overrides), shared, logger).build())
+    return pipelines
+
+
+async def run_pipelines(pipelines: List[Pipeline]):
+    """Loads the models (each distinct model once, via the registry) and starts every pipeline."""
+    for pipeline in pipelines:
+        await pipeline.load()
+    await asyncio.gather(*(pipeline.start() for pipeline in pipelines))
@@ -0,0 +1,49 @@
+from typing import Dict, Any
+from src.transcription.model_registry import model_registry
+from src.utils.dialogue_logger import DialogueWriter
+from .fair_gate import FairGate
+
+
+class SharedResources:
+    """
+    What the pipelines of one process share: model weights (through the model registry),
+    one OpenAI client per endpoint (so one HTTP connection pool), the dialogue log writer
+    thread, and fair gates for STT decodes and LLM requests.
+
+    Config (all optional):
+        "shared": {"stt_slots": 1, "llm_slots": 4}
+    One STT slot means in-process decodes of different pipelines take turns on the model
+    instead of oversubscribing the CPU/GPU; LLM requests are network bound, so several may run.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        shared_config = config.get("shared", {})
+        self.models = model_registry
+        self.stt_gate = FairGate(shared_config.get("stt_slots", 1))
+        self.llm_gate = FairGate(shared_config.get("llm_slots", 4))
+        self.dialogue_writer = DialogueWriter()
+        self._clients = {} # (api_key, base_url) -> AsyncOpenAI
+
+    def openai_client(self, api_key, base_url):
+        key = (api_key, base_url)
+        client = self._clients.get(key)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+            self._clients[key] = client
+        return client
+
+    def metrics(self) -> dict:
+        return {
+            "stt_granted": dict(self.stt_gate.granted),
+            "stt_waiting": self.stt_gate.waiting(),
+            "llm_granted": dict(self.llm_gate.granted),
+            "llm_waiting": self.llm_gate.waiting(),
+            "resident_models": self.models.stats(),
+        }
+
+    async def aclose(self):
+        """Flushes the dialogue logs and closes the HTTP clients. Call after every pipeline stopped."""
+        self.dialogue_writer.close()
+        for client in self._clients.values():
+            await client.close()
+        self._clients.clear()
@@ -15,7 +15,7 @@ class APISTTEngine(STTEngine):
         if not self.api_key:
             self.logger.warning(f"API Key environment variable {self.api_key_env} not found.")
 
-    async def transcribe(self, audio_chunk: bytes, sample_rate: int) -> str:
+    async def transcribe(self, audio_chunk: bytes, sample_rate: int, profile: str = "final") -> str:
         """
         Sends audio chunk to API. 
         Note: Most APIs expect a file-like object with headers (WAV/MP3) rather than raw PCM.
@@ -0,0 +1,326 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+import numpy as np
+from .stt_manager import STTEngine
+from .local_stt_engine import DECODE_PROFILES
+from .model_registry import model_registry
+
+N_FRAMES = 3000 # 30 s of log-mel frames, the Whisper encoder's fixed input
+
+
+def _pad_or_trim(features: np.ndarray, length: int = N_FRAMES) -> np.ndarray:
+    if features.shape[-1] > length:
+        return features[:, :length]
+    if features.shape[-1] < length:
+        return np.pad(features, [(0, 0), (0, length - features.shape[-1])])
+    return features
+
+
+class _Request:
+    __slots__ = ("stream_id", "audio", "language", "profile", "loop", "future", "enqueued")
+
+    def __init__(self, stream_id, audio, language, profile, loop, future):
+        self.stream_id = stream_id
+        self.audio = audio
+        self.language = language
+        self.profile = profile
+        self.loop = loop
+        self.future = future
+        self.enqueued = time.perf_counter()
+
+
+class BatchedWhisperEngine:
+    """
+    One Whisper model shared by several streams, decoding their pending windows as a batch.
+
+    Each STTManager holds a BatchedStreamEngine handle (see open_shared_stream). Requests wait
+    at most `max_wait_ms` for other streams to join; a batch starts earlier once every
+    open stream has a request pending or `max_batch_size` is reached. A batch takes at
+    most one request per stream, oldest first, so a busy stream can't starve the others.
+
+    The batch is run through faster-whisper's building blocks rather than
+    WhisperModel.transcribe (which handles one audio at a time): log-mel features are
+    stacked, encoded once, languages are detected for auto-detect streams, and one
+    generate call runs per decode profile. Windows are single utterances (< 30 s), so
+    there is no seeking, temperature fallback or word timestamps; streams using this
+    engine decode whole utterances instead of LocalAgreement tails.
+    Batching runs on its own thread, so streams may live on different event loops.
+    """
+    def __init__(self, model_name="small.en", device="cuda", compute_type="float16", logger=None,
+                 decode_profiles=None, max_batch_size=8, max_wait_ms=50, cpu_threads=0, num_workers=1,
+                 no_speech_threshold=0.6):
+        self.logger = logger or logging.getLogger("BatchedSTT")
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.no_speech_threshold = no_speech_threshold
+        self.decode_profiles = {name: dict(options) for name, options in DECODE_PROFILES.items()}
+        for name, options in (decode_profiles or {}).items():
+            self.decode_profiles.setdefault(name, {}).update(options)
+
+        self.model = self._load_model(cpu_threads, num_workers)
+        self._tokenizers = {} # language -> Tokenizer
+        self._pending = {} # stream_id -> deque of requests
+        self._cond = threading.Condition()
+        self._stream_ids = itertools.count()
+        self._thread = None
+        self._closed = False
+        self._warmup = None
+        self.stats = {"batches": 0, "requests": 0, "max_batch": 0, "wait_ms_total": 0.0, "decode_ms_total": 0.0}
+
+    def _load_model(self, cpu_threads, num_workers):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            self.logger.error("faster_whisper not installed. Please install it with 'pip install faster-whisper'")
+            return None
+
+        def load():
+            self.logger.info(f"Loading FasterWhisper model: {self.model_name} on {self.device} ({self.compute_type})")
+            return WhisperModel(self.model_name, device=self.device, compute_type=self.compute_type,
+                                cpu_threads=cpu_threads, num_workers=num_workers)
+        try:
+            return model_registry.get(self.model_name, self.device, self.compute_type, load,
+                                      cpu_threads=cpu_threads, num_workers=num_workers)
+        except Exception as e:
+            self.logger.error(f"Failed to load model: {e}")
+            return None
+
+    # --- Streams ---
+
+    def open_stream(self) -> "BatchedStreamEngine":
+        with self._cond:
+            stream_id = next(self._stream_ids)
+            self._pending[stream_id] = deque()
+            self._closed = False # Reopened after the last stream closed: the batcher runs again
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="STTBatcher")
+                self._thread.start()
+        return BatchedStreamEngine(self, stream_id)
+
+    def release_stream(self, stream_id):
+        # Under the shared-engine lock, so open_shared_stream can't pick this engine up
+        # between the close decision and its removal
+        with _shared_lock:
+            with self._cond:
+                for request in self._pending.pop(stream_id, ()):
+                    request.loop.call_soon_threadsafe(self._resolve, request.future, "")
+                # Last stream gone: stop the batcher; the model stays in the registry cache
+                self._closed = not self._pending
+                self._cond.notify()
+                closed = self._closed
+            if closed:
+                _drop_shared_engine(self)
+
+    @property
+    def open_streams(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, stream_id, audio, sample_rate, language, profile) -> str:
+        if self.model is None:
+            return ""
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if sample_rate != 16000:
+            from src.audio.resampler import StreamingResampler
+            resampler = StreamingResampler(sample_rate, 16000)
+            audio = np.concatenate((resampler.process(audio), resampler.process(np.zeros(resampler.taps, dtype=np.float32))))
+        # Otherwise the batch reads the caller's buffer directly: STTManager leases it until this returns
+
+        loop = asyncio.get_running_loop()
+        request = _Request(stream_id, audio, language, profile, loop, loop.create_future())
+        with self._cond:
+            if stream_id not in self._pending:
+                return ""
+            self._pending[stream_id].append(request)
+            self._cond.notify()
+        return await request.future
+
+    async def warm_up(self) -> dict:
+        """Runs one throwaway batch per profile (once per engine)."""
+        if self._warmup is None and self.model is not None:
+            self._warmup = {}
+            t = np.arange(32000) / 16000
+            audio = (0.05 * np.sin(2 * np.pi * 150 * t)).astype(np.float32)
+            for profile in self.decode_profiles:
+                started = time.perf_counter()
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._decode_batch, [_Request(None, audio, "en", profile, None, None)]
+                )
+                self._warmup[profile] = (time.perf_counter() - started) * 1000
+        return self._warmup or {}
+
+    def metrics(self) -> dict:
+        batches = max(self.stats["batches"], 1)
+        return {
+            "streams": self.open_streams,
+            "batches": self.stats["batches"],
+            "avg_batch": self.stats["requests"] / batches,
+            "max_batch": self.stats["max_batch"],
+            "avg_wait_ms": self.stats["wait_ms_total"] / max(self.stats["requests"], 1),
+            "avg_decode_ms": self.stats["decode_ms_total"] / batches,
+        }
+
+    # --- Batching thread ---
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and not any(self._pending.values()):
+                    self._cond.wait()
+                if self._closed:
+                    self._thread = None # Under the lock, so open_stream knows to start a new one
+                    return
+                # Give the other streams until the oldest request's deadline to join
+                while True:
+                    waiting = [queue for queue in self._pending.values() if queue]
+                    if not waiting or len(waiting) >= min(self.max_batch_size, len(self._pending)):
+                        break
+                    remaining = min(queue[0].enqueued for queue in waiting) + self.max_wait - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take_batch()
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            try:
+                texts = self._decode_batch(batch)
+            except Exception as e:
+                self.logger.error(f"Batched transcribe error: {e}")
+                texts = [""] * len(batch)
+            finished = time.perf_counter()
+
+            self.stats["batches"] += 1
+            self.stats["requests"] += len(batch)
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+            self.stats["decode_ms_total"] += (finished - started) * 1000
+            self.stats["wait_ms_total"] += sum(started - request.enqueued for request in batch) * 1000
+            for request, text in zip(batch, texts):
+                request.loop.call_soon_threadsafe(self._resolve, request.future, text)
+
+    def _take_batch(self):
+        """Oldest request of each stream, oldest streams first, up to max_batch_size."""
+        queues = sorted((queue for queue in self._pending.values() if queue), key=lambda queue: queue[0].enqueued)
+        return [queue.popleft() for queue in queues[:self.max_batch_size]]
+
+    @staticmethod
+    def _resolve(future, text):
+        if not future.done(): # Cancelled when the stream stopped
+            future.set_result(text)
+
+    def _decode_batch(self, batch) -> list:
+        texts = [""] * len(batch)
+        groups = {}
+        for i, request in enumerate(batch):
+            groups.setdefault(request.profile if request.profile in self.decode_profiles else "final", []).append(i)
+
+        for profile, indices in groups.items():
+            options = self.decode_profiles[profile]
+            features = np.stack([_pad_or_trim(self.model.feature_extractor(batch[i].audio)) for i in indices])
+            encoder_output = self.model.encode(features)
+
+            languages = [batch[i].language for i in indices]
+            if not self.model.model.is_multilingual:
+                languages = ["en"] * len(indices)
+            elif any(language is None for language in languages):
+                detected = self.model.model.detect_language(encoder_output)
+                languages = [language or detected[k][0][0][2:-2] for k, language in enumerate(languages)]
+
+            tokenizers = [self._tokenizer(language) for language in languages]
+            # Same length for every item: language tokens differ, the prompt structure doesn't
+            prompts = [list(tokenizer.sot_sequence) + [tokenizer.no_timestamps] for tokenizer in tokenizers]
+            length_penalty = options.get("length_penalty", 1)
+            results = self.model.model.generate(
+                encoder_output,
+                prompts,
+                beam_size=options.get("beam_size", 5),
+                patience=options.get("patience", 1),
+                length_penalty=length_penalty,
+                max_length=options.get("max_length", 448),
+                return_scores=True,
+                return_no_speech_prob=True,
+                suppress_blank=options.get("suppress_blank", True),
+            )
+
+            for k, (i, result, tokenizer) in enumerate(zip(indices, results, tokenizers)):
+                tokens = [token for token in result.sequences_ids[0] if token < tokenizer.eot]
+                # Whisper's silence rule: likely no speech and a low-confidence decode
+                avg_logprob = result.scores[0] * (len(tokens) ** length_penalty) / (len(tokens) + 1)
+                if result.no_speech_prob > self.no_speech_threshold and avg_logprob < -1.0:
+                    continue
+                texts[i] = tokenizer.decode(tokens).strip()
+        return texts
+
+    def _tokenizer(self, language):
+        tokenizer = self._tokenizers.get(language)
+        if tokenizer is None:
+            from faster_whisper.tokenizer import Tokenizer
+            tokenizer = Tokenizer(self.model.hf_tokenizer, self.model.model.is_multilingual,
+                                  task="transcribe", language=language)
+            self._tokenizers[language] = tokenizer
+        return tokenizer
+
+
+class BatchedStreamEngine(STTEngine):
+    """Per-stream handle on a BatchedWhisperEngine; this is what each STTManager holds."""
+    def __init__(self, shared: BatchedWhisperEngine, stream_id: int):
+        self.shared = shared
+        self.stream_id = stream_id
+        self.target_language = None
+
+    @property
+    def model(self):
+        return self.shared.model
+
+    @property
+    def model_name(self):
+        return self.shared.model_name
+
+    def set_language(self, lang_code):
+        """Sets the target language for this stream. None for auto-detect."""
+        self.target_language = lang_code if lang_code != "auto" else None
+
+    def is_auto_detect(self):
+        return self.target_language is None
+
+    async def transcribe(self, audio_chunk: np.ndarray, sample_rate: int, profile: str = "final") -> str:
+        return await self.shared.submit(self.stream_id, audio_chunk, sample_rate, self.target_language, profile)
+
+    async def warm_up(self, streaming: bool = False) -> dict:
+        return await self.shared.warm_up()
+
+    def metrics(self) -> dict:
+        return self.shared.metrics()
+
+    def close(self):
+        self.shared.release_stream(self.stream_id)
+
+
+_shared_engines = {} # (model, device, compute_type) -> BatchedWhisperEngine
+_shared_lock = threading.Lock()
+
+
+def open_shared_stream(model_name, device, compute_type, **kwargs) -> BatchedStreamEngine:
+    """Opens a stream on the process-wide batched engine for this model, creating it on first use."""
+    key = (model_name, device, compute_type)
+    with _shared_lock:
+        engine = _shared_engines.get(key)
+        if engine is None or engine._closed:
+            engine = BatchedWhisperEngine(model_name, device, compute_type, **kwargs)
+            if engine.model is not None:
+                _shared_engines[key] = engine
+        return engine.open_stream()
+
+
+def _drop_shared_engine(engine):
+    """Removes a closed engine from the shared ones; the caller holds _shared_lock."""
+    key = (engine.model_name, engine.device, engine.compute_type)
+    if _shared_engines.get(key) is engine:
+        del _shared_engines[key]
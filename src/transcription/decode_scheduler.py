@@ -0,0 +1,77 @@
+import math
+
+
+class DecodeScheduler:
+    """
+    Adapts STT decode frequency to the measured real-time factor (RTF).
+
+    Every transcribe call reports how long it took for how much audio, and with
+    which decode profile. Partials (greedy, on the tail) and finals (beam search,
+    on the whole utterance) cost very differently, so each profile is smoothed on
+    its own and each decision uses the profile it schedules:
+    - the partial throttle: partials are spaced so a partial decode fits in the
+      interval with some headroom, instead of queueing up behind each other;
+    - the maximum utterance length: a final decode of the whole buffer should
+      finish within the configured latency target.
+    """
+    def __init__(self, base_interval_chunks: int = 2, max_buffer_sec: float = 10.0,
+                 latency_target_ms: float = 1500.0, min_buffer_sec: float = 3.0,
+                 headroom: float = 1.25, alpha: float = 0.3):
+        self.base_interval_chunks = base_interval_chunks
+        self.max_buffer_limit = max_buffer_sec
+        self.min_buffer_sec = min_buffer_sec
+        self.latency_target_sec = latency_target_ms / 1000.0
+        self.headroom = headroom
+        self.alpha = alpha
+
+        self.rtf = {} # Profile -> smoothed decode_time / audio_time
+        self.decode_sec = {} # Profile -> smoothed wall time of one decode
+        self.decodes = 0
+        self.throttle = base_interval_chunks
+
+    def record(self, decode_sec: float, audio_sec: float, profile: str = "final"):
+        """Feeds the duration of one transcribe call, the audio length it covered and its profile."""
+        if audio_sec <= 0:
+            return
+        rtf = decode_sec / audio_sec
+        if profile not in self.rtf:
+            self.rtf[profile], self.decode_sec[profile] = rtf, decode_sec
+        else:
+            self.rtf[profile] += self.alpha * (rtf - self.rtf[profile])
+            self.decode_sec[profile] += self.alpha * (decode_sec - self.decode_sec[profile])
+        self.decodes += 1
+
+    def throttle_chunks(self, chunk_sec: float, auto_detect: bool = False) -> int:
+        """Number of new chunks between partial decodes."""
+        base = self.base_interval_chunks + (1 if auto_detect else 0) # Slower updates for auto-detect
+        decode_sec = self.decode_sec.get("partial")
+        if decode_sec is None or chunk_sec <= 0:
+            self.throttle = base
+        else:
+            needed = math.ceil(decode_sec * self.headroom / chunk_sec)
+            # Never wait longer than the latency target between partials
+            cap = max(base, math.floor(self.latency_target_sec / chunk_sec))
+            self.throttle = min(max(base, needed), cap)
+        return self.throttle
+
+    @property
+    def max_buffer_sec(self) -> float:
+        """Longest utterance whose final decode still meets the latency target."""
+        rtf = self.rtf.get("final")
+        if not rtf:
+            return self.max_buffer_limit
+        return min(self.max_buffer_limit, max(self.min_buffer_sec, self.latency_target_sec / rtf))
+
+    def metrics(self) -> dict:
+        smoothed = {}
+        for profile in ("partial", "final"):
+            decode_sec = self.decode_sec.get(profile)
+            smoothed[f"rtf_{profile}"] = self.rtf.get(profile)
+            smoothed[f"decode_ms_{profile}"] = decode_sec * 1000 if decode_sec is not None else None
+        return {
+            **smoothed,
+            "throttle_chunks": self.throttle,
+            "max_buffer_sec": self.max_buffer_sec,
+            "latency_target_ms": self.latency_target_sec * 1000,
+            "decodes": self.decodes,
+        }
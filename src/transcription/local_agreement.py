@@ -0,0 +1,72 @@
+import re
+from typing import List, Tuple
+
+# (start_sec, end_sec, text) relative to the start of the current utterance
+Word = Tuple[float, float, str]
+
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class LocalAgreement:
+    """
+    LocalAgreement-2 commit policy for streaming Whisper decoding.
+
+    Every decode of the uncommitted audio tail produces a word hypothesis.
+    A word is committed once two consecutive hypotheses agree on it, so the
+    committed prefix never changes and its audio can be dropped from the buffer.
+    """
+    def __init__(self):
+        self.committed: List[Word] = []
+        self.hypothesis: List[Word] = []
+        self.last_committed_end = 0.0
+
+    def reset(self):
+        self.committed = []
+        self.hypothesis = []
+        self.last_committed_end = 0.0
+
+    def insert(self, words: List[Word], offset: float) -> List[Word]:
+        """
+        Feeds a new decode of the tail (word times relative to the tail start,
+        which sits `offset` seconds into the utterance).
+        Returns the words that became committed with this decode.
+        """
+        new = [(s + offset, e + offset, w) for s, e, w in words]
+        # Words ending before the commit point belong to audio we already dropped
+        new = [w for w in new if w[1] > self.last_committed_end + 0.05]
+        new = self._strip_repeated_prefix(new)
+
+        newly_committed = []
+        while new and self.hypothesis:
+            if _normalize(new[0][2]) != _normalize(self.hypothesis[0][2]):
+                break
+            word = new.pop(0)
+            self.hypothesis.pop(0)
+            newly_committed.append(word)
+            self.last_committed_end = word[1]
+
+        self.committed.extend(newly_committed)
+        self.hypothesis = new
+        return newly_committed
+
+    def _strip_repeated_prefix(self, new: List[Word]) -> List[Word]:
+        # Whisper often re-emits the last committed words at the start of the tail
+        if not new or not self.committed:
+            return new
+        for n in range(min(5, len(self.committed), len(new)), 0, -1):
+            tail = [_normalize(w[2]) for w in self.committed[-n:]]
+            head = [_normalize(w[2]) for w in new[:n]]
+            if tail == head:
+                return new[n:]
+        return new
+
+    def committed_text(self) -> str:
+        return "".join(w[2] for w in self.committed).strip()
+
+    def hypothesis_text(self) -> str:
+        return "".join(w[2] for w in self.hypothesis).strip()
+
+    def text(self) -> str:
+        return "".join(w[2] for w in self.committed + self.hypothesis).strip()
@@ -1,16 +1,43 @@
 import os
 import logging
+import time
 import numpy as np
 from .stt_manager import STTEngine
+from .model_registry import model_registry
+
+# Decode settings per request type. Partials are replaced by the next decode within a
+# second, so they take the fast greedy path; finals keep beam search and temperature fallback.
+DECODE_PROFILES = {
+    "partial": dict(
+        beam_size=1,
+        best_of=1,
+        temperature=0.0, # No fallback re-decodes
+        condition_on_previous_text=False,
+        without_timestamps=True
+    ),
+    "final": dict(
+        beam_size=5,
+        condition_on_previous_text=True
+    ),
+}
 
 class LocalSTTEngine(STTEngine):
-    def __init__(self, model_name="small.en", device="cuda", compute_type="float16", logger=None):
+    def __init__(self, model_name="small.en", device="cuda", compute_type="float16", logger=None, decode_profiles=None,
+                 cpu_threads=0, num_workers=1):
         self.logger = logger or logging.getLogger("LocalSTT")
         self.model_name = model_name
         self.device = device
         self.compute_type = compute_type
+        self.cpu_threads = cpu_threads # 0 lets CTranslate2 decide (see ThreadBudget)
+        self.num_workers = num_workers
         self.model = None
         self.target_language = None
+        self.vad_filter = True # Disabled by STTManager when its own neural VAD gates the audio
+        
+        # Config overrides are merged per profile, e.g. {"partial": {"without_timestamps": False}}
+        self.decode_profiles = {name: dict(options) for name, options in DECODE_PROFILES.items()}
+        for name, options in (decode_profiles or {}).items():
+            self.decode_profiles.setdefault(name, {}).update(options)
         
         self._load_model()
 
@@ -23,57 +50,91 @@ class LocalSTTEngine(STTEngine):
         return self.target_language is None
 
     def reload_model(self, model_name):
-        """Reloads the model with a new model name."""
+        """Reloads the model with a new model name (blocking; see reload_model_async)."""
         if model_name == self.model_name:
             return
         
         self.logger.info(f"Reloading model to: {model_name}")
-        # Unload current model (if possible) to free VRAM
-        self.model = None
-        import gc
-        gc.collect()
-        
+        # The previous model stays in the registry cache until evicted by its memory budget
         self.model_name = model_name
         self._load_model()
 
+    async def reload_model_async(self, model_name) -> bool:
+        """
+        Loads a new model in a worker thread while the current one keeps serving,
+        then swaps it in with a single assignment on the event loop.
+        A decode already in flight finishes on the model it started with.
+        Note: both models are resident until the swap, so VRAM peaks briefly.
+        Returns True if the new model is active.
+        """
+        if model_name == self.model_name and self.model:
+            return True
+
+        import asyncio
+        loop = asyncio.get_running_loop()
+        self.logger.info(f"Loading model in background: {model_name}")
+        model, device, compute_type = await loop.run_in_executor(
+            None, self._build_model, model_name, self.device, self.compute_type
+        )
+        if model is None:
+            return False
+
+        self.model, self.model_name, self.device, self.compute_type = model, model_name, device, compute_type
+        self.logger.info(f"Switched to model: {model_name}")
+        return True
+
     def _load_model(self):
+        model, self.device, self.compute_type = self._build_model(self.model_name, self.device, self.compute_type)
+        if model is not None:
+            self.model = model
+
+    def _build_model(self, model_name, device, compute_type):
+        """Creates a WhisperModel, falling back to CPU int8 if CUDA fails. Returns (model, device, compute_type)."""
+        # Recently used models are kept resident, so switching back is instant
         try:
             from faster_whisper import WhisperModel
-            self.logger.info(f"Loading FasterWhisper model: {self.model_name} on {self.device} ({self.compute_type})")
-            self.model = WhisperModel(self.model_name, device=self.device, compute_type=self.compute_type)
-            self.logger.info("Model loaded successfully.")
+            model = model_registry.get(
+                model_name, device, compute_type,
+                lambda: self._create_whisper_model(WhisperModel, model_name, device, compute_type),
+                cpu_threads=self.cpu_threads, num_workers=self.num_workers
+            )
+            return model, device, compute_type
         except ImportError:
             self.logger.error("faster_whisper not installed. Please install it with 'pip install faster-whisper'")
         except Exception as e:
             self.logger.error(f"Failed to load model: {e}")
             # Fallback to CPU if CUDA fails?
-            if self.device == "cuda":
+            if device == "cuda":
                 self.logger.warning("Falling back to CPU int8")
-                self.device = "cpu"
-                self.compute_type = "int8"
                 try:
-                    self.model = WhisperModel(self.model_name, device=self.device, compute_type=self.compute_type)
+                    model = model_registry.get(
+                        model_name, "cpu", "int8",
+                        lambda: self._create_whisper_model(WhisperModel, model_name, "cpu", "int8"),
+                        cpu_threads=self.cpu_threads, num_workers=self.num_workers
+                    )
+                    return model, "cpu", "int8"
                 except Exception as e2:
                     self.logger.error(f"Fallback failed: {e2}")
+        return None, device, compute_type
+
+    def _create_whisper_model(self, WhisperModel, model_name, device, compute_type):
+        self.logger.info(f"Loading FasterWhisper model: {model_name} on {device} ({compute_type})")
+        model = WhisperModel(model_name, device=device, compute_type=compute_type,
+                             cpu_threads=self.cpu_threads, num_workers=self.num_workers)
+        self.logger.info("Model loaded successfully.")
+        return model
 
-    async def transcribe(self, audio_chunk: np.ndarray, sample_rate: int) -> str:
+    async def transcribe(self, audio_chunk: np.ndarray, sample_rate: int, profile: str = "final") -> str:
         """
         Transcribe audio chunk using FasterWhisper.
-        Note: FasterWhisper expects float32 array, which we already have.
-        It also handles resampling internally if needed, but typically expects 16kHz.
-        However, passing 'sample_rate' argument to transcribe() is not standard in WhisperModel.transcribe().
-        WhisperModel.transcribe() usually expects audio at 16k. 
-        If our input is 44.1k, we SHOULD resample it to 16k before passing to model, 
-        OR rely on faster-whisper's internal resampling if it supports it (it accepts ndarray).
-        
-        Actually, faster-whisper/CTranslate2 expects 16kHz audio. 
-        We should resample if input is 44100.
+        Note: FasterWhisper expects float32 array at 16kHz.
+        The capture path already delivers 16kHz (see AudioFormatConverter), so the
+        resampling below is only a fallback for callers feeding other rates.
+        `profile` selects the decode settings from DECODE_PROFILES ("partial" or "final").
         """
         if not self.model:
             return ""
 
-        # Resample if needed (Naive check, ideally we assume input is standard 44100 from capture)
-        # FasterWhisper expects 16000 Hz
         if sample_rate != 16000:
             audio_chunk = self._resample(audio_chunk, sample_rate, 16000)
             
@@ -84,23 +145,8 @@ class LocalSTTEngine(STTEngine):
         # Let's try to normalize the chunk to -1..1 range if max amp is too low, or just leave it.
         # Actually, standard whisper preprocessing does not strictly require normalization, but it helps.
         
-        # Run inference in a thread pool to avoid blocking the async loop
-        import asyncio
-        loop = asyncio.get_running_loop()
-        
         try:
-            # Relax VAD settings slightly to catch more speech
-            segments, info = await loop.run_in_executor(
-                None, 
-                lambda: list(self.model.transcribe(
-                    audio_chunk, 
-                    beam_size=5, 
-                    language=self.target_language, # Use configured language
-                    condition_on_previous_text=True,
-                    vad_filter=True, # Re-enable VAD
-                    vad_parameters=dict(min_silence_duration_ms=500) # Default 500
-                ))
-            )
+            segments = await self._decode(audio_chunk, profile)
             
             # Combine segments
             text = " ".join([segment.text for segment in segments]).strip()
@@ -111,6 +157,85 @@ class LocalSTTEngine(STTEngine):
             self.logger.error(f"Transcribe error: {e}")
             return ""
 
+    async def transcribe_words(self, audio_chunk: np.ndarray, sample_rate: int, initial_prompt: str = None, profile: str = "final") -> list:
+        """
+        Transcribe with word timestamps for streaming (LocalAgreement) decoding.
+        Returns a list of (start_sec, end_sec, word) tuples relative to the start of audio_chunk.
+        """
+        if not self.model:
+            return []
+
+        if sample_rate != 16000:
+            audio_chunk = self._resample(audio_chunk, sample_rate, 16000)
+
+        try:
+            segments = await self._decode(
+                audio_chunk,
+                profile,
+                initial_prompt=initial_prompt, # Committed text keeps the tail decode in context
+                word_timestamps=True,
+                without_timestamps=False # Word alignment needs segment timestamps
+            )
+            return [(w.start, w.end, w.word) for segment in segments for w in (segment.words or [])]
+
+        except Exception as e:
+            self.logger.error(f"Transcribe error: {e}")
+            return []
+
+    async def _decode(self, audio_chunk: np.ndarray, profile: str, **overrides) -> list:
+        """Runs model.transcribe with the given profile in a thread pool and returns all segments."""
+        options = dict(self.decode_profiles.get(profile, self.decode_profiles["final"]))
+        options.update(overrides)
+        vad_filter = options.pop("vad_filter", self.vad_filter)
+        model = self.model
+
+        def run():
+            segments, _ = model.transcribe(
+                audio_chunk,
+                language=self.target_language, # Use configured language
+                vad_filter=vad_filter,
+                vad_parameters=dict(min_silence_duration_ms=500), # Default 500
+                **options
+            )
+            # Segments are a lazy generator; consume it here so decoding stays off the event loop
+            return list(segments)
+
+        # Run inference in a thread pool to avoid blocking the async loop
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, run)
+
+    async def warm_up(self, streaming: bool = False) -> dict:
+        """
+        Runs one throwaway decode per profile on synthetic audio, so CTranslate2 allocates
+        its buffers and selects kernels before the first real utterance.
+        Returns the time of each pass in ms.
+        """
+        if not self.model:
+            return {}
+
+        # A voiced-like tone with a little noise; pure silence would be dropped by the VAD filter
+        t = np.arange(32000) / 16000
+        audio = sum(np.sin(2 * np.pi * f * t) / k for k, f in enumerate((150, 300, 450, 700), 1))
+        audio = (0.05 * audio + 0.005 * np.random.default_rng(0).standard_normal(len(t))).astype(np.float32)
+
+        passes = {profile: {} for profile in self.decode_profiles}
+        if streaming:
+            passes["words"] = dict(word_timestamps=True, without_timestamps=False)
+
+        timings = {}
+        for name, overrides in passes.items():
+            started = time.perf_counter()
+            await self._decode(
+                audio,
+                name if name in self.decode_profiles else "final",
+                vad_filter=False,
+                max_new_tokens=16, # Enough to exercise the decoder; the text is discarded
+                **overrides
+            )
+            timings[name] = (time.perf_counter() - started) * 1000
+        return timings
+
     def _resample(self, audio: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
         if source_rate == target_rate:
             return audio
@@ -0,0 +1,178 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Approximate parameter counts (millions) used to estimate model memory when it can't be measured
+MODEL_PARAMS_M = {
+    "tiny": 39,
+    "base": 74,
+    "small": 244,
+    "medium": 769,
+    "large": 1550,
+    "turbo": 809,
+    "distil-small": 166,
+    "distil-medium": 394,
+    "distil-large": 756,
+}
+
+BYTES_PER_PARAM = {
+    "float32": 4,
+    "float16": 2,
+    "bfloat16": 2,
+    "int16": 2,
+    "int8": 1,
+    "int8_float16": 1,
+    "int8_bfloat16": 1,
+    "int8_float32": 1,
+}
+
+
+def estimate_model_mb(model_name: str, compute_type: str) -> float:
+    """Rough resident size of a Whisper model from its parameter count and weight type."""
+    name = model_name.lower().rsplit("/", 1)[-1].replace("faster-whisper-", "")
+    params = None
+    if "turbo" in name:
+        params = MODEL_PARAMS_M["turbo"]
+    else:
+        # Longest key first so "distil-small" wins over "small"
+        for key in sorted(MODEL_PARAMS_M, key=len, reverse=True):
+            if name.startswith(key) or f"-{key}" in name or f"{key}-" in name:
+                params = MODEL_PARAMS_M[key]
+                break
+    if params is None:
+        params = MODEL_PARAMS_M["small"]
+    # "default"/"auto" usually ends up as float16 on GPU and int8 on CPU; assume the larger
+    return params * BYTES_PER_PARAM.get(compute_type, 2) * 1.1 # + ~10% for runtime buffers
+
+
+def _process_rss_mb():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+
+
+class ModelRegistry:
+    """
+    LRU cache of loaded Whisper models keyed by (model, device, compute_type, cpu_threads, num_workers).
+
+    Models stay resident until the total size exceeds the memory budget, then the
+    least recently used ones are dropped. The model just requested is never evicted,
+    and an evicted model is only freed once no engine holds it anymore.
+    CPU model sizes are measured from the process RSS (if psutil is installed),
+    GPU sizes are estimated from the parameter count.
+    """
+    def __init__(self, budget_mb: float = 4096, logger=None):
+        self.budget_mb = budget_mb
+        self.logger = logger or logging.getLogger("ModelRegistry")
+        self._models = OrderedDict() # key -> entry dict, least recently used first
+        self._loading = {} # key -> Future of a load in progress
+        self._lock = threading.Lock() # Only guards the dicts; loads run outside it
+
+    def configure(self, budget_mb=None, logger=None):
+        if logger is not None:
+            self.logger = logger
+        if budget_mb is not None:
+            self.budget_mb = budget_mb
+            with self._lock:
+                self._evict()
+
+    def get(self, model_name, device, compute_type, loader, cpu_threads=0, num_workers=1):
+        """
+        Returns the cached model for the key, or calls `loader()` to build it.
+        The load runs outside the registry lock, so hits and stats() never wait on it;
+        concurrent requests for the same key wait for the one load in progress.
+        """
+        key = (model_name, device, compute_type, cpu_threads, num_workers)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                entry["hits"] += 1
+                entry["last_used"] = time.time()
+                self.logger.info(f"Model cache hit: {model_name} ({device}, {compute_type})")
+                return entry["model"]
+            pending = self._loading.get(key)
+            if pending is None:
+                future = self._loading[key] = Future()
+
+        if pending is not None:
+            self.logger.info(f"Waiting for model {model_name} ({device}, {compute_type}) to finish loading")
+            return pending.result()
+
+        try:
+            # Another key loading at the same time also shows up in the RSS delta; the
+            # estimate is only used to size the budget
+            rss_before = _process_rss_mb() if device == "cpu" else None
+            started = time.perf_counter()
+            model = loader()
+            load_ms = (time.perf_counter() - started) * 1000
+
+            memory_mb, source = estimate_model_mb(model_name, compute_type), "estimated"
+            if rss_before is not None:
+                measured = _process_rss_mb() - rss_before
+                if measured > 0:
+                    memory_mb, source = measured, "measured"
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._models[key] = {
+                "model": model,
+                "memory_mb": memory_mb,
+                "memory_source": source,
+                "load_ms": load_ms,
+                "hits": 0,
+                "last_used": time.time(),
+            }
+            del self._loading[key]
+            self.logger.info(f"Cached model {model_name} ({device}, {compute_type}): ~{memory_mb:.0f} MB, loaded in {load_ms:.0f} ms")
+            self._evict()
+        future.set_result(model)
+        return model
+
+    def _evict(self):
+        while len(self._models) > 1 and self.total_mb() > self.budget_mb:
+            (model_name, device, compute_type, *_), entry = self._models.popitem(last=False)
+            self.logger.info(f"Evicting model {model_name} ({device}, {compute_type}), ~{entry['memory_mb']:.0f} MB")
+
+    def discard(self, model_name, device, compute_type):
+        """Drops every cached variant (thread settings) of the model."""
+        with self._lock:
+            for key in [key for key in self._models if key[:3] == (model_name, device, compute_type)]:
+                del self._models[key]
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def total_mb(self) -> float:
+        return sum(entry["memory_mb"] for entry in self._models.values())
+
+    def stats(self) -> list:
+        """Resident models, most recently used first, for sizing the budget."""
+        with self._lock:
+            return [
+                {
+                    "model": model_name,
+                    "device": device,
+                    "compute_type": compute_type,
+                    "cpu_threads": cpu_threads,
+                    "num_workers": num_workers,
+                    "memory_mb": round(entry["memory_mb"], 1),
+                    "memory_source": entry["memory_source"],
+                    "load_ms": round(entry["load_ms"], 1),
+                    "hits": entry["hits"],
+                }
+                for (model_name, device, compute_type, cpu_threads, num_workers), entry in reversed(self._models.items())
+            ]
+
+# Global instance, shared by every engine in the process
+model_registry = ModelRegistry()
@@ -0,0 +1,338 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import weakref
+from multiprocessing import shared_memory
+import numpy as np
+from .stt_manager import STTEngine
+
+
+def _attach_shm(name):
+    """
+    Attaches to the parent's audio block without registering it with a resource tracker.
+    The parent creates, registers and unlinks the block; a worker that crashes or is restarted
+    then can't unlink it or have it reported as leaked.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 attaching always registers. Skip just that call: unregistering afterwards would
+    # also drop the parent's entry from the tracker spawned workers share with it
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda res_name, rtype: None if rtype == "shared_memory" else register(res_name, rtype)
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _worker_main(conn, shm_name, model_name, device, compute_type, decode_profiles, cpu_threads, num_workers, cpu_affinity):
+    """
+    Entry point of the STT worker process. Hosts a LocalSTTEngine and serves requests from
+    the pipe; audio is read straight from the shared-memory block the parent wrote it to.
+    """
+    from src.utils.logger import SystemLogger
+    from .local_stt_engine import LocalSTTEngine
+
+    logger = SystemLogger("STTWorker")
+    if cpu_affinity:
+        os.sched_setaffinity(0, cpu_affinity) # Decoder threads created from here inherit it
+    shm = _attach_shm(shm_name) # Owned by the parent, which unlinks it
+    audio_slot = np.ndarray((shm.size // 4,), dtype=np.float32, buffer=shm.buf)
+
+    engine = LocalSTTEngine(model_name=model_name, device=device, compute_type=compute_type,
+                            logger=logger, decode_profiles=decode_profiles,
+                            cpu_threads=cpu_threads, num_workers=num_workers)
+    conn.send(("ready", engine.model is not None, engine.device, engine.compute_type))
+    if engine.model is None:
+        return
+
+    loop = asyncio.new_event_loop()
+    while True:
+        try:
+            kind, req_id, args = conn.recv()
+        except (EOFError, OSError):
+            break # Parent went away
+        if kind == "stop":
+            break
+
+        try:
+            if kind == "transcribe":
+                n, sample_rate, profile = args
+                # The parent doesn't write the slot again until this request is answered
+                result = loop.run_until_complete(engine.transcribe(audio_slot[:n], sample_rate, profile=profile))
+            elif kind == "words":
+                n, sample_rate, initial_prompt, profile = args
+                result = loop.run_until_complete(
+                    engine.transcribe_words(audio_slot[:n], sample_rate, initial_prompt=initial_prompt, profile=profile)
+                )
+            elif kind == "warm_up":
+                result = loop.run_until_complete(engine.warm_up(streaming=args))
+            elif kind == "set_language":
+                result = engine.set_language(args)
+            elif kind == "set_vad_filter":
+                engine.vad_filter = args
+                result = None
+            else:
+                raise ValueError(f"Unknown request: {kind}")
+            conn.send((req_id, True, result))
+        except Exception as e:
+            conn.send((req_id, False, repr(e)))
+
+    shm.close()
+
+
+def _shutdown(process, conn, shm):
+    # Also runs at interpreter exit via weakref.finalize
+    try:
+        if conn is not None:
+            conn.send(("stop", None, None))
+    except (OSError, ValueError):
+        pass
+    if process is not None:
+        process.join(timeout=2)
+        if process.is_alive():
+            process.kill()
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class ProcessSTTEngine(STTEngine):
+    """
+    Runs a LocalSTTEngine in a dedicated worker process that keeps the model loaded.
+
+    Decoding and segment iteration then never compete with capture, the asyncio loop
+    or the GUI for the GIL. Audio is written into a shared-memory block (no pickling);
+    only small request/result tuples go over the pipe. Requests are serialized, since
+    there is one audio slot. If the worker dies or hangs, it is restarted and the
+    language, VAD and warm-up settings are replayed; the request that was in flight
+    returns an empty result.
+
+    There is no in-place model reload: STTManager starts a new worker with the new
+    model while this one keeps serving, then closes this one. close() waits up to 2 s
+    for the worker to exit, so async callers run it in an executor.
+
+    The audio slot holds `max_audio_sec` at `sample_rate`, the rate the pipeline feeds.
+    Starting a worker gives up after `start_timeout_sec` (the first run may download the model).
+    """
+    def __init__(self, model_name="small.en", device="cuda", compute_type="float16", logger=None,
+                 decode_profiles=None, sample_rate=16000, max_audio_sec=60.0, request_timeout_sec=60.0,
+                 start_timeout_sec=600.0, max_restarts=5, cpu_threads=0, num_workers=1, cpu_affinity=None):
+        self.logger = logger or logging.getLogger("ProcessSTT")
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type
+        self.decode_profiles = decode_profiles
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.cpu_affinity = cpu_affinity # Cores the worker process is pinned to (Linux), None to leave as is
+        self.target_language = None
+        self.request_timeout = request_timeout_sec
+        self.start_timeout = start_timeout_sec
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self._vad_filter = True
+        self._warm_streaming = None # Replayed after a restart
+
+        self._ctx = multiprocessing.get_context("spawn") # fork is unsafe with CUDA and threads
+        self._shm = shared_memory.SharedMemory(create=True, size=int(max_audio_sec * sample_rate) * 4)
+        self._audio_slot = np.ndarray((self._shm.size // 4,), dtype=np.float32, buffer=self._shm.buf)
+        self._process = None
+        self._conn = None
+        self._send_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._closed = False
+        self._ids = itertools.count()
+        self._pending = {} # req_id -> (loop, future)
+        self._request_lock = asyncio.Lock() # One request at a time: there is one audio slot
+        self._finalizer = None
+
+        if not self._spawn():
+            self._shm.close()
+            self._shm.unlink()
+
+    @property
+    def model(self):
+        """The worker process while it is up, None otherwise (the engine interface checks `model`)."""
+        return self._process if self._ready.is_set() else None
+
+    @property
+    def vad_filter(self):
+        return self._vad_filter
+
+    @vad_filter.setter
+    def vad_filter(self, value):
+        self._vad_filter = value
+        self._notify("set_vad_filter", value)
+
+    def set_language(self, lang_code):
+        self.target_language = lang_code if lang_code != "auto" else None
+        self._notify("set_language", lang_code)
+        self.logger.info(f"Target language set to: {self.target_language}")
+
+    def is_auto_detect(self):
+        return self.target_language is None
+
+    async def transcribe(self, audio_chunk: np.ndarray, sample_rate: int, profile: str = "final") -> str:
+        result = await self._request("transcribe", audio_chunk, (sample_rate, profile))
+        return result or ""
+
+    async def transcribe_words(self, audio_chunk: np.ndarray, sample_rate: int, initial_prompt: str = None, profile: str = "final") -> list:
+        result = await self._request("words", audio_chunk, (sample_rate, initial_prompt, profile))
+        return result or []
+
+    async def warm_up(self, streaming: bool = False) -> dict:
+        self._warm_streaming = streaming
+        return await self._request("warm_up", args=streaming) or {}
+
+    def close(self):
+        self._closed = True
+        self._ready.clear()
+        if self._finalizer:
+            self._finalizer()
+
+    # --- Worker lifecycle ---
+
+    def _spawn(self):
+        """Starts the worker and blocks until its model is loaded."""
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self._shm.name, self.model_name, self.device, self.compute_type, self.decode_profiles,
+                  self.cpu_threads, self.num_workers, self.cpu_affinity),
+            name="STTWorker",
+            daemon=True
+        )
+        self.logger.info(f"Starting STT worker process ({self.model_name} on {self.device})")
+        process.start()
+        child_conn.close()
+
+        ok = False
+        try:
+            if parent_conn.poll(self.start_timeout):
+                _, ok, device, compute_type = parent_conn.recv()
+            else:
+                self.logger.error(f"STT worker did not load the model within {self.start_timeout}s")
+                process.kill()
+        except (EOFError, OSError):
+            pass
+        if not ok:
+            self.logger.error("STT worker failed to load the model")
+            process.join(timeout=1)
+            parent_conn.close()
+            return False
+
+        self.device, self.compute_type = device, compute_type
+        self._process, self._conn = process, parent_conn
+        if self._finalizer:
+            self._finalizer.detach()
+        self._finalizer = weakref.finalize(self, _shutdown, process, parent_conn, self._shm)
+        threading.Thread(target=self._read_results, args=(process, parent_conn), daemon=True, name="STTWorkerReader").start()
+
+        # Replay settings before any request reaches a restarted worker
+        self._send(("set_language", None, self.target_language or "auto"))
+        self._send(("set_vad_filter", None, self._vad_filter))
+        if self._warm_streaming is not None:
+            self._send(("warm_up", None, self._warm_streaming))
+        self._ready.set()
+        self.logger.info(f"STT worker ready (pid {process.pid})")
+        return True
+
+    def _read_results(self, process, conn):
+        while True:
+            try:
+                req_id, ok, result = conn.recv()
+            except (EOFError, OSError):
+                break
+            entry = self._pending.get(req_id)
+            if entry:
+                loop, future = entry
+                loop.call_soon_threadsafe(self._resolve, future, ok, result)
+
+        # Worker exited
+        self._ready.clear()
+        for loop, future in list(self._pending.values()):
+            loop.call_soon_threadsafe(self._resolve, future, False, "STT worker exited")
+        # Not when closed or shutting down at exit (the finalizer has run)
+        if not self._closed and self._finalizer.alive and process is self._process:
+            self._restart()
+
+    @staticmethod
+    def _resolve(future, ok, result):
+        if future.done(): # Timed out or abandoned
+            return
+        if ok:
+            future.set_result(result)
+        else:
+            future.set_exception(RuntimeError(result))
+
+    def _restart(self):
+        self._process.join(timeout=1)
+        exitcode = self._process.exitcode
+        while not self._closed and self.restarts < self.max_restarts:
+            self.restarts += 1
+            delay = min(2 ** (self.restarts - 1), 10)
+            self.logger.warning(f"STT worker exited (exit code {exitcode}), restarting in {delay}s "
+                                f"({self.restarts}/{self.max_restarts})")
+            time.sleep(delay)
+            if self._spawn():
+                return
+        self.logger.error("STT worker restart limit reached; transcription is unavailable")
+
+    def _notify(self, kind, args):
+        """Sends a request without waiting for its result."""
+        if self._ready.is_set():
+            self._send((kind, None, args))
+
+    def _send(self, message):
+        with self._send_lock:
+            self._conn.send(message)
+
+    # --- Requests ---
+
+    async def _request(self, kind, audio=None, args=None):
+        timeout = self.request_timeout
+        async with self._request_lock:
+            loop = asyncio.get_running_loop()
+            if not self._ready.is_set():
+                # Give a restarting worker a chance to come back
+                if self._closed or not await loop.run_in_executor(None, self._ready.wait, self.request_timeout):
+                    self.logger.warning(f"STT worker unavailable, dropping {kind} request")
+                    return None
+
+            if audio is not None:
+                audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+                if len(audio) > len(self._audio_slot):
+                    self.logger.warning(f"Audio longer than the shared buffer, keeping the last {len(self._audio_slot)} samples")
+                    audio = audio[-len(self._audio_slot):]
+                self._audio_slot[:len(audio)] = audio
+                args = (len(audio), *args)
+
+            req_id = next(self._ids)
+            future = loop.create_future()
+            self._pending[req_id] = (loop, future)
+            try:
+                self._send((kind, req_id, args))
+                result = await asyncio.wait_for(future, timeout)
+                self.restarts = 0 # Healthy again; the restart limit is for crash loops
+                return result
+            except asyncio.TimeoutError:
+                self.logger.error(f"STT worker did not answer within {timeout}s, restarting it")
+                self._ready.clear()
+                self._process.kill() # The reader thread notices the exit and restarts it
+                return None
+            except Exception as e:
+                self.logger.error(f"STT worker request failed: {e}")
+                return None
+            finally:
+                self._pending.pop(req_id, None)
+                if not future.done():
+                    future.cancel()
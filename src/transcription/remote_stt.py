@@ -0,0 +1,613 @@
+"""
+Remote STT: the capture/GUI machine streams audio to an STT server on another host
+(an STTManager + local engine per connection) and gets the STT events back.
+
+Wire format, both directions: 4-byte big-endian length, 1-byte kind, payload.
+    kind J: UTF-8 JSON message {"type": ..., ...}
+    kind A: audio (client -> server): chunk_id (int64), overlap_ms (float32),
+            sample_offset (int64, -1 if unknown), flags (uint8, AUDIO_BLOCKING: the
+            server waits for queue room instead of dropping), trace ID length (uint8),
+            the ASCII trace ID, then mono int16 PCM at the pipeline sample rate. int16 halves the
+            bandwidth of the float32 pipeline audio (32 KB/s at 16 kHz) without audible
+            loss for STT.
+
+Client messages: hello {language, model?, sample_rate} (no model: the server's default), start, stop,
+set_language {language}, configure {stt: {model}}, ping {t}, drain {timeout}.
+The server has no authentication: it listens on localhost by default, and clients can
+only pick the language and a model from the server's --allow-model list; any other
+key is rejected. Expose it beyond localhost only on a trusted network.
+Server messages: ready {model, device, compute_type}, event {name, data}, pong {t, clock},
+drained {ok}, error {message, model?} (model: the requested model was refused).
+
+Traces (src/utils/trace.py) in event payloads are stamped with the server's clock; the
+client shifts them onto its own using the clock offset measured with ping/pong.
+
+Run a server:
+    python -m src.transcription.remote_stt --listen tcp://0.0.0.0:8765 --model small.en --device cuda --allow-model tiny.en
+and point clients at it with "stt": {"mode": "remote", "remote": {"address": "tcp://host:8765"}}.
+"""
+import asyncio
+import copy
+import json
+import struct
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+import numpy as np
+
+FRAME_HEADER = struct.Struct("!IB")
+AUDIO_HEADER = struct.Struct("!qfqBB")
+AUDIO_BLOCKING = 0x01
+KIND_JSON = ord("J")
+KIND_AUDIO = ord("A")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+# The only hello keys a client may send; everything else about the engine is server-side
+HELLO_KEYS = {"type", "language", "model", "sample_rate"}
+SAMPLE_RATES = (8000, 16000, 22050, 24000, 32000, 44100, 48000)
+
+# Events an STTManager emits that the client re-emits on its own bus
+FORWARDED_EVENTS = (
+    "stt.partial",
+    "stt.final_sentence",
+    "stt.decode_started",
+    "stt.metrics",
+    "stt.model_loading",
+    "stt.model_ready",
+    "stt.model_failed",
+    "stt.warmup_finished",
+)
+
+
+class ServerRefused(ConnectionError):
+    """The server answered hello with an error; reconnecting would get the same answer."""
+
+
+def _json_default(value):
+    # numpy scalars in metrics payloads
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    payload = json.dumps(message, default=_json_default).encode("utf-8")
+    return FRAME_HEADER.pack(len(payload) + 1, KIND_JSON) + payload
+
+
+def encode_audio(audio: np.ndarray, chunk_id: int = -1, overlap_ms: float = 0.0,
+                 sample_offset: Optional[int] = None, trace_id: Optional[str] = None, blocking: bool = False) -> bytes:
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    trace_bytes = (trace_id or "").encode("ascii")[:255]
+    header = AUDIO_HEADER.pack(-1 if chunk_id is None else chunk_id, overlap_ms,
+                               -1 if sample_offset is None else sample_offset,
+                               AUDIO_BLOCKING if blocking else 0, len(trace_bytes))
+    payload = header + trace_bytes + pcm
+    return FRAME_HEADER.pack(len(payload) + 1, KIND_AUDIO) + payload
+
+
+def decode_audio(payload: bytes):
+    """Returns the chunk_ready-style payload: chunk, chunk_id, overlap_ms, sample_offset, trace_id, blocking."""
+    chunk_id, overlap_ms, sample_offset, flags, trace_len = AUDIO_HEADER.unpack_from(payload)
+    trace_id = payload[AUDIO_HEADER.size:AUDIO_HEADER.size + trace_len].decode("ascii") or None
+    audio = np.frombuffer(payload, dtype="<i2", offset=AUDIO_HEADER.size + trace_len).astype(np.float32) / 32768.0
+    return {
+        "chunk": audio,
+        "chunk_id": chunk_id,
+        "overlap_ms": overlap_ms,
+        "sample_offset": sample_offset if sample_offset >= 0 else None,
+        "trace_id": trace_id,
+        "blocking": bool(flags & AUDIO_BLOCKING),
+    }
+
+
+async def read_frame(reader: asyncio.StreamReader):
+    """Returns (kind, payload), or (None, None) once the peer closed the connection."""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None, None
+    length, kind = FRAME_HEADER.unpack(header)
+    if not 1 <= length <= MAX_FRAME_BYTES:
+        raise ValueError(f"Invalid frame length {length}")
+    try:
+        payload = await reader.readexactly(length - 1)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None, None
+    if kind == KIND_JSON:
+        return kind, json.loads(payload)
+    return kind, payload
+
+
+def parse_address(address: str):
+    """"tcp://host:port" or "unix:///path/to/socket" -> ("tcp", (host, port)) / ("unix", path)."""
+    if address.startswith("unix://"):
+        return "unix", address[len("unix://"):]
+    host, _, port = address.removeprefix("tcp://").rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+async def open_connection(address: str):
+    scheme, target = parse_address(address)
+    if scheme == "unix":
+        return await asyncio.open_unix_connection(target)
+    reader, writer = await asyncio.open_connection(*target)
+    _set_nodelay(writer)
+    return reader, writer
+
+
+def _set_nodelay(writer):
+    # Small frames (events, 250 ms audio chunks) must not wait for Nagle's algorithm
+    import socket
+    sock = writer.get_extra_info("socket")
+    if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class STTServer:
+    """
+    Serves remote STT clients. Each connection gets its own STTManager (and event bus)
+    built from the server config plus the client's hello; the models themselves are
+    shared through the model registry, and decodes of different connections take turns
+    through a FairGate.
+    """
+    def __init__(self, config: Dict[str, Any], logger, stt_slots: int = 1, allowed_models=()):
+        from src.pipeline.fair_gate import FairGate
+
+        self.config = config
+        self.logger = logger
+        # Models clients may ask for (besides the server's default); anything else is rejected
+        self.allowed_models = set(allowed_models) | {config.get("stt", {}).get("model")}
+        self.decode_gate = FairGate(stt_slots)
+        self.connections = 0
+        self._server = None
+
+    async def start(self, address: str):
+        scheme, target = parse_address(address)
+        if scheme == "unix":
+            self._server = await asyncio.start_unix_server(self._handle, path=target)
+        else:
+            self._server = await asyncio.start_server(self._handle, *target)
+        self.logger.info(f"STT server listening on {address}")
+        return self._server
+
+    async def serve_forever(self, address: str):
+        server = await self.start(address)
+        async with server:
+            await server.serve_forever()
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _validate_hello(self, hello) -> Optional[str]:
+        """Returns why the hello is rejected, None if it is acceptable."""
+        unknown = set(hello) - HELLO_KEYS
+        if unknown:
+            return f"Unsupported hello keys: {sorted(unknown)}"
+        if hello.get("model") is not None and hello["model"] not in self.allowed_models:
+            return f"Model not allowed on this server: {hello['model']}"
+        if hello.get("sample_rate", 16000) not in SAMPLE_RATES:
+            return f"Unsupported sample rate: {hello.get('sample_rate')}"
+        return self._validate_language(hello.get("language"))
+
+    @staticmethod
+    def _validate_language(language) -> Optional[str]:
+        if language is None or (isinstance(language, str) and len(language) <= 16
+                                and language.replace("-", "").replace("_", "").isalnum()):
+            return None
+        return f"Invalid language: {language!r}"
+
+    def _connection_config(self, hello):
+        config = copy.deepcopy(self.config)
+        stt_config = config.setdefault("stt", {})
+        if hello.get("model") is not None:
+            stt_config["model"] = hello["model"]
+        config.setdefault("audio", {})["sample_rate"] = hello.get("sample_rate", 16000)
+        return config
+
+    async def _handle(self, reader, writer):
+        from src.utils.event_bus import EventBus
+        from .stt_manager import STTManager
+
+        self.connections += 1
+        name = f"conn{self.connections}"
+        _set_nodelay(writer)
+        peer = writer.get_extra_info("peername") or name
+        manager = None
+
+        def send(message):
+            if not writer.is_closing():
+                writer.write(encode_message(message))
+
+        try:
+            while True:
+                kind, message = await read_frame(reader)
+                if kind is None:
+                    break
+                if kind == KIND_AUDIO:
+                    if manager is not None:
+                        chunk = decode_audio(message)
+                        if chunk["blocking"]:
+                            # Unpaced client source: stop reading until there is room, TCP pushes back
+                            await manager.put_chunk(chunk)
+                        else:
+                            manager.handle_chunk(chunk)
+                    continue
+
+                kind = message.get("type")
+                if kind == "hello" and manager is None:
+                    error = self._validate_hello(message)
+                    if error:
+                        self.logger.warning(f"Rejected STT client {peer}: {error}")
+                        send({"type": "error", "message": error})
+                        break
+                    self.logger.info(f"STT client connected: {peer}")
+                    bus = EventBus()
+                    for event in FORWARDED_EVENTS:
+                        bus.subscribe(event, lambda data, event=event: send({"type": "event", "name": event, "data": data}))
+                    manager = STTManager(bus, self._connection_config(message), self.logger, load_engine=False,
+                                         decode_gate=self.decode_gate, name=name)
+                    manager.language = message.get("language")
+                    await manager.load_engine()
+                    engine = manager.engine
+                    await manager.warm_up()
+                    send({
+                        "type": "ready",
+                        "model": getattr(engine, "model_name", None),
+                        "device": getattr(engine, "device", None),
+                        "compute_type": getattr(engine, "compute_type", None),
+                        "ok": getattr(engine, "model", None) is not None,
+                    })
+                elif kind == "ping":
+                    send({"type": "pong", "t": message.get("t"), "clock": time.perf_counter()})
+                elif manager is None:
+                    send({"type": "error", "message": f"{kind} before hello"})
+                elif kind == "start":
+                    manager.start_processing()
+                elif kind == "stop":
+                    manager.stop_processing()
+                elif kind == "set_language":
+                    error = self._validate_language(message.get("language"))
+                    if error:
+                        send({"type": "error", "message": error})
+                    else:
+                        manager.set_language(message.get("language"))
+                elif kind == "drain":
+                    # Answered once the audio received so far is decoded; keeps reading meanwhile
+                    async def drain(timeout):
+                        send({"type": "drained", "ok": await manager.drain(timeout)})
+                    asyncio.ensure_future(drain(message.get("timeout", 30.0)))
+                elif kind == "configure":
+                    # Clients may only switch between the allowed models
+                    stt_config = message.get("stt", {})
+                    if set(message) - {"type", "stt"} or set(stt_config) != {"model"}:
+                        send({"type": "error", "message": "configure only accepts {\"stt\": {\"model\": ...}}"})
+                    elif stt_config["model"] not in self.allowed_models:
+                        send({"type": "error", "message": f"Model not allowed on this server: {stt_config['model']}",
+                              "model": stt_config["model"]})
+                    else:
+                        manager.set_model(stt_config["model"])
+                else:
+                    send({"type": "error", "message": f"Unknown message type: {kind}"})
+        except Exception as e:
+            self.logger.error(f"STT connection {peer} failed", exc=e)
+        finally:
+            if manager is not None:
+                manager.stop_processing()
+                if hasattr(manager.engine, "close"):
+                    await manager._close_engine(manager.engine)
+            writer.close()
+            self.logger.info(f"STT client disconnected: {peer}")
+
+
+class RemoteSTTClient:
+    """
+    Stands in for STTManager when "stt.mode" is "remote": forwards audio.chunk_ready
+    chunks to an STT server and re-emits the server's STT events on the local bus, so the
+    translation manager and GUI don't know the difference. Reconnects with backoff and
+    replays the language and running state if the connection drops.
+
+    Config:
+        "stt": {"mode": "remote", "remote": {"address": "tcp://10.0.0.5:8765", "connect_timeout_sec": 10,
+                                             "max_send_buffer_kb": 512, "model": None}}
+    The server decodes with its own default model unless remote.model is set or the user
+    picks one (set_model); stt.model is the local engine's default and isn't sent.
+    If the server refuses the hello (e.g. a model it doesn't allow) the reason is logged and
+    emitted with stt.model_failed, and the client stops reconnecting.
+    Audio that would grow the socket's send buffer past max_send_buffer_kb (a stalled
+    link; 512 KB is ~16 s of audio) is dropped and counted in dropped_chunks.
+    """
+    def __init__(self, bus, config: Dict[str, Any], logger, load_engine: bool = True, name: str = "main", **kwargs):
+        self.bus = bus
+        self.config = config
+        self.logger = logger
+        self.name = name
+        self.engine = None # Decoding happens on the server
+        self.language = None
+        stt_config = config.get("stt", {})
+        remote_config = stt_config.get("remote", {})
+        self.address = remote_config.get("address", "tcp://127.0.0.1:8765")
+        self.connect_timeout = remote_config.get("connect_timeout_sec", 10.0)
+        self.max_send_buffer = int(remote_config.get("max_send_buffer_kb", 512) * 1024)
+        self.model = remote_config.get("model") # Explicitly requested model, None for the server's default
+        self.sample_rate = config.get("audio", {}).get("sample_rate", 16000)
+        self.server_info = {}
+        self.dropped_chunks = 0
+
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._loop = None
+        self._connected = asyncio.Event()
+        self._processing = False
+        self._closed = False
+        self._pings = {} # t -> future
+        self._drained = None # Future answered by the server's "drained"
+        # Tracing: server clock minus ours (from ping/pong), and when recent chunks were
+        # emitted, keyed by their end sample (the server doesn't see our clock)
+        self.clock_offset = 0.0
+        self._chunk_times = OrderedDict()
+        self.bus.subscribe("audio.chunk_ready", self.handle_chunk)
+
+    # --- STTManager interface ---
+
+    async def load_engine(self) -> bool:
+        """Connects and waits until the server has loaded and warmed up the model."""
+        try:
+            return await self._connect()
+        except ServerRefused as e:
+            self._refused(e)
+            return False
+        except Exception as e:
+            self.logger.error(f"Could not connect to STT server at {self.address}", exc=e)
+            self.bus.emit("stt.model_failed", {"model": self.model, "error": str(e)})
+            self._reader_task = asyncio.ensure_future(self._reconnect())
+            return False
+
+    async def warm_up(self, engine=None):
+        pass # The server warms up before it answers hello
+
+    def start_processing(self):
+        self._loop = asyncio.get_running_loop()
+        self._processing = True
+        self._send({"type": "start"})
+
+    def stop_processing(self):
+        self._processing = False
+        self._loop = None
+        self._send({"type": "stop"})
+
+    def set_language(self, lang_code):
+        self.language = lang_code
+        self._send({"type": "set_language", "language": lang_code})
+
+    def set_model(self, model_name):
+        self.model = model_name
+        self._send({"type": "configure", "stt": {"model": model_name}})
+
+    def reload_engine(self):
+        # Device and compute type are the server's choice; only the model can be switched
+        if self.model:
+            self._send({"type": "configure", "stt": {"model": self.model}})
+
+    def handle_chunk(self, data):
+        # Called on the capture thread; the socket belongs to the event loop
+        chunk = data.get("chunk")
+        loop = self._loop
+        if not isinstance(chunk, np.ndarray) or loop is None:
+            return
+        sample_offset = data.get("sample_offset")
+        blocking = bool(data.get("blocking"))
+        frame = encode_audio(chunk, data.get("chunk_id"), data.get("overlap_ms", 0.0), sample_offset,
+                             data.get("trace_id"), blocking)
+        end_sample = sample_offset + len(chunk) if sample_offset is not None else None
+        if blocking:
+            # Unpaced source: hold its feed thread while the link is backed up instead of dropping
+            while self._send_buffer_size() + len(frame) > self.max_send_buffer and self._loop is loop:
+                time.sleep(0.01)
+        try:
+            loop.call_soon_threadsafe(self._write_chunk, frame, end_sample, data.get("emitted_at"), blocking)
+        except RuntimeError:
+            pass # Loop already closed during shutdown
+
+    async def ping(self) -> Optional[float]:
+        """Round-trip time to the server in ms, None if not connected."""
+        if not self._connected.is_set():
+            return None
+        t = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        self._pings[t] = future
+        self._send({"type": "ping", "t": t})
+        try:
+            await asyncio.wait_for(future, self.connect_timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pings.pop(t, None)
+        return (time.perf_counter() - t) * 1000
+
+    async def drain(self, timeout: float = 30.0) -> bool:
+        """Waits until the server has decoded the audio sent so far (its finals arrive before the answer)."""
+        if not self._connected.is_set():
+            return False
+        await asyncio.sleep(0) # Let chunks the capture thread already handed to the loop go out first
+        self._drained = asyncio.get_running_loop().create_future()
+        self._send({"type": "drain", "timeout": timeout})
+        try:
+            return await asyncio.wait_for(self._drained, timeout + self.connect_timeout)
+        except asyncio.TimeoutError:
+            return False
+
+    async def aclose(self):
+        self._closed = True
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self._writer:
+            self._writer.close()
+
+    # --- Connection ---
+
+    async def _connect(self) -> bool:
+        self._reader, self._writer = await asyncio.wait_for(open_connection(self.address), self.connect_timeout)
+        hello = {"type": "hello", "language": self.language, "sample_rate": self.sample_rate}
+        if self.model:
+            hello["model"] = self.model
+        self._writer.write(encode_message(hello))
+        # Loading the model on the server may take a while; events (model_loading...) arrive first
+        while True:
+            kind, message = await read_frame(self._reader)
+            if kind is None:
+                raise ConnectionError("STT server closed the connection")
+            if kind == KIND_JSON and message.get("type") == "ready":
+                break
+            if kind == KIND_JSON and message.get("type") == "error":
+                self._writer.close()
+                raise ServerRefused(message.get("message"))
+            self._dispatch(message)
+
+        self.server_info = message
+        self.logger.info(f"Connected to STT server {self.address}", **message)
+        self._connected.set()
+        if self._processing:
+            self._send({"type": "start"})
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+        asyncio.ensure_future(self.ping()) # Measures the clock offset for traces
+        return message.get("ok", True)
+
+    async def _read_loop(self):
+        try:
+            while True:
+                kind, message = await read_frame(self._reader)
+                if kind is None:
+                    break
+                self._dispatch(message)
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            self.logger.error("STT server connection failed", exc=e)
+        self._connected.clear()
+        if not self._closed:
+            self.logger.warning(f"Lost connection to STT server {self.address}")
+            await self._reconnect()
+
+    async def _reconnect(self):
+        delay = 1
+        while not self._closed:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect()
+                return
+            except ServerRefused as e:
+                self._refused(e)
+                return
+            except Exception as e:
+                self.logger.warning(f"Reconnecting to STT server failed: {e}, retrying in {delay}s")
+                delay = min(delay * 2, 30)
+
+    def _refused(self, error):
+        self.logger.error(f"STT server {self.address} refused the connection: {error}")
+        self.bus.emit("stt.model_failed", {"model": self.model, "error": f"STT server refused the connection: {error}"})
+
+    def _dispatch(self, message):
+        kind = message.get("type")
+        if kind == "event":
+            data = message.get("data") or {}
+            if data.get("trace"):
+                self._rebase_trace(data["trace"])
+            self.bus.emit(message["name"], data)
+        elif kind == "pong":
+            t = message.get("t")
+            if t is not None and message.get("clock") is not None:
+                # NTP-style: the server read its clock halfway through the round trip
+                self.clock_offset = message["clock"] - (t + time.perf_counter()) / 2
+            future = self._pings.get(t)
+            if future and not future.done():
+                future.set_result(None)
+        elif kind == "drained":
+            if self._drained and not self._drained.done():
+                self._drained.set_result(message.get("ok", False))
+        elif kind == "error":
+            self.logger.error(f"STT server error: {message.get('message')}")
+            if message.get("model") is not None:
+                self.bus.emit("stt.model_failed", {"model": message["model"], "error": message.get("message")})
+
+    def _rebase_trace(self, trace):
+        trace["stages"] = {stage: t - self.clock_offset for stage, t in trace.get("stages", {}).items()}
+        emitted_at = self._chunk_times.get(trace.get("sample_end"))
+        if emitted_at is not None:
+            trace["stages"]["chunk_emitted"] = emitted_at
+
+    def _write_chunk(self, frame, end_sample, emitted_at, blocking=False):
+        """Runs on the event loop thread."""
+        if end_sample is not None and emitted_at is not None:
+            self._chunk_times[end_sample] = emitted_at
+            while len(self._chunk_times) > 64: # Far more than a final decode lags behind
+                self._chunk_times.popitem(last=False)
+        self._write(frame, limit=not blocking)
+
+    def _send(self, message):
+        if self._connected.is_set():
+            self._write(encode_message(message))
+
+    def _send_buffer_size(self) -> int:
+        writer = self._writer
+        if writer is None or writer.transport is None:
+            return 0
+        return writer.transport.get_write_buffer_size()
+
+    def _write(self, frame, limit=True):
+        writer = self._writer
+        is_audio = frame[4] == KIND_AUDIO
+        if writer is None or writer.is_closing() or not self._connected.is_set():
+            self.dropped_chunks += is_audio
+            return
+        if is_audio and limit and self._send_buffer_size() + len(frame) > self.max_send_buffer:
+            # The link stalled: drop audio rather than queue it without bound (control messages still go)
+            self.dropped_chunks += 1
+            if self.dropped_chunks % 20 == 1:
+                self.logger.warning(f"STT server link backed up, dropping audio (dropped so far: {self.dropped_chunks})")
+            return
+        writer.write(frame)
+
+
+def main():
+    import argparse
+    from src.utils.logger import SystemLogger
+    from src.utils.thread_budget import ThreadBudget
+
+    parser = argparse.ArgumentParser(description="Remote STT server")
+    parser.add_argument("--listen", default="tcp://127.0.0.1:8765",
+                        help='"tcp://host:port" or "unix:///path". No authentication: only listen on trusted networks')
+    parser.add_argument("--mode", default="local", help="Engine mode on the server: local, process or batched")
+    parser.add_argument("--model", default="small.en", help="Default model (clients may ask for another)")
+    parser.add_argument("--device", default="cuda")
+    parser.add_argument("--compute-type", default="float16")
+    parser.add_argument("--allow-model", action="append", default=[],
+                        help="Another model clients may request (repeatable); --model is always allowed")
+    parser.add_argument("--stt-slots", type=int, default=1, help="Concurrent decodes across clients")
+    parser.add_argument("--model-cache-mb", type=int, default=4096)
+    args = parser.parse_args()
+
+    config = {
+        "stt": {
+            "mode": args.mode,
+            "model": args.model,
+            "device": args.device,
+            "compute_type": args.compute_type,
+            "model_cache_mb": args.model_cache_mb,
+        },
+        "threads": {},
+    }
+    ThreadBudget.from_config(config).apply_env()
+    logger = SystemLogger("STTServer")
+    server = STTServer(config, logger, stt_slots=args.stt_slots, allowed_models=args.allow_model)
+    try:
+        asyncio.run(server.serve_forever(args.listen))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,127 @@
 import asyncio
+import contextlib
 import logging
-import queue
 import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import Dict, Any
+from .local_agreement import LocalAgreement
+from .decode_scheduler import DecodeScheduler
+from .vad import create_vad
+from .model_registry import model_registry
+from src.utils.thread_budget import ThreadBudget
+from src.utils import trace as tracing
 
 class STTEngine(ABC):
     @abstractmethod
-    async def transcribe(self, audio_chunk: Any, sample_rate: int) -> str:
+    async def transcribe(self, audio_chunk: Any, sample_rate: int, profile: str = "final") -> str:
+        """profile: "partial" for throwaway interim results, "final" for finalized sentences."""
         pass
 
 class STTManager:
-    def __init__(self, bus, config: Dict[str, Any], logger):
+    def __init__(self, bus, config: Dict[str, Any], logger, load_engine: bool = True,
+                 decode_gate=None, name: str = "main"):
         self.bus = bus
         self.config = config
         self.logger = logger
         self.engine: STTEngine = None
         self.mode = config.get("stt", {}).get("mode", "local")
+        self.sample_rate = config.get("audio", {}).get("sample_rate", 16000)
         
-        # Buffer for "Streaming" style accumulation
-        import numpy as np
-        self.audio_buffer = np.array([], dtype=np.float32)
         self.silence_counter = 0
         self.chunks_since_transcribe = 0
+        self._last_chunk_id = -1
         self.VAD_THRESHOLD = 0.005 # Adjust based on noise floor
         self.SILENCE_CHUNKS_THRESHOLD = 1 # 1 * 200ms = 200 silence triggers finalize
         self.MAX_BUFFER_DURATION = 10.0 # Force finalize after 15 seconds
+        
+        # Streaming VAD gate: scores each new chunk once, decides what enters the utterance
+        # buffer and drives finalization. Silero (ONNX) when available, RMS energy otherwise.
+        vad_config = config.get("stt", {}).get("vad", {})
+        self.vad = create_vad(vad_config, self.sample_rate, self.VAD_THRESHOLD, self.logger)
+        self.VAD_SPEECH_THRESHOLD = vad_config.get("threshold", 0.5)
+        self.VAD_SILENCE_THRESHOLD = vad_config.get("neg_threshold", 0.35) # Hysteresis while speaking
+        self.preroll_samples = int(vad_config.get("preroll_ms", 200) * self.sample_rate / 1000)
+        self._preroll = deque()
+        self._preroll_len = 0
+        self._speaking = False
+        
+        # Buffer for "Streaming" style accumulation
+        # Preallocated ring with headroom over MAX_BUFFER_DURATION. Decodes get leased zero-copy
+        # views of it; ingestion waits for a lease to be released before overwriting its audio
+        from src.audio.ring_buffer import AudioRingBuffer
+        self.audio_buffer = AudioRingBuffer(int((self.MAX_BUFFER_DURATION + 5.0) * self.sample_rate))
+        self._buffer_released = asyncio.Event()
         self.TRANSCRIBE_INTERVAL = 2 # Transcribe every 2 chunks (500ms) to save GPU
         
-        # Use thread-safe queue for audio data transfer (can be called from any thread)
-        self.audio_queue = queue.Queue(maxsize=20)  # Thread-safe queue
+        # Adapts TRANSCRIBE_INTERVAL and MAX_BUFFER_DURATION to the measured real-time factor
+        self.scheduler = DecodeScheduler(
+            base_interval_chunks=self.TRANSCRIBE_INTERVAL,
+            max_buffer_sec=self.MAX_BUFFER_DURATION,
+            latency_target_ms=config.get("stt", {}).get("latency_target_ms", 1500)
+        )
+        self._chunk_sec = 0.0
+        
+        # Streaming (LocalAgreement) mode: commit the agreed word prefix and only decode the tail
+        self.streaming = config.get("stt", {}).get("streaming", False)
+        self.agreement = LocalAgreement()
+        self._utterance_start = 0 # Ring index where the current utterance began
+        self._utterance_generation = 0 # Bumped on every finalize, marks stale partial results
+        
+        # Decode stage state (see _decode_loop)
+        self._final_jobs = deque()
+        self._partial_requested = False
+        self._decoding_final = False
+        self._partial_requested_at = None
+        self._decode_wakeup = asyncio.Event()
+        self._trace = None # Trace of the current utterance (src/utils/trace.py), None without chunk metadata
+        self.coalesced_decodes = 0
+        # Shared by pipelines in one process (FairGate), so their decodes take turns on the model
+        self.decode_gate = decode_gate
+        self.name = name
         
-        self._setup_engine()
+        # Bounded asyncio queue fed from the capture thread via loop.call_soon_threadsafe,
+        # so the processing task wakes up as soon as a chunk arrives instead of polling
+        self.audio_queue = asyncio.Queue(maxsize=20)
+        self.dropped_chunks = 0
+        self._loop = None
+        
+        self._swap_lock = asyncio.Lock() # Serializes background model/engine swaps
+        self._warmed = None # (engine, model) ids of the last warm-up
+        self._vad_warm = False
+        self.language = None
+        if load_engine:
+            self._setup_engine()
         
         # Subscribe to audio events
         self.bus.subscribe("audio.chunk_ready", self.handle_chunk)
         
         # We need to start the processing loop explicitly
         self._processing_task = None
+        self._decode_task = None
 
     def set_language(self, lang_code):
         """Sets the language on the engine if supported."""
+        self.language = lang_code # Re-applied to engines built later (deferred load, hot-swap)
         if self.engine and hasattr(self.engine, 'set_language'):
             self.engine.set_language(lang_code)
         else:
             self.logger.warning("Engine does not support language switching or not initialized")
 
     def set_model(self, model_name):
-        """Reloads the model on the engine if supported."""
-        if self.engine and hasattr(self.engine, 'reload_model'):
-            # This might block, so ideally it should be called in a way that doesn't freeze the UI too long
-            # But since we are in BackendWorker thread (asyncio loop), we should be careful.
-            # Ideally, reload_model should be async or fast. 
-            # Loading a model takes time (seconds), so it WILL block the loop if not threaded.
-            # For simplicity now, we just call it.
+        """
+        Switches the model. With a running event loop the new model loads in the background
+        while the current one keeps transcribing, and is swapped in once ready.
+        """
+        self.config.setdefault("stt", {})["model"] = model_name
+        if self.engine and hasattr(self.engine, 'reload_model_async') and self._has_running_loop():
+            asyncio.ensure_future(self._swap_model(model_name))
+        elif self._has_running_loop():
+            # No in-place reload (e.g. worker-process engine), or still loading at startup:
+            # build a new engine with the new model next to the current one
+            asyncio.ensure_future(self._swap_engine())
+        elif self.engine and hasattr(self.engine, 'reload_model'):
             self.engine.reload_model(model_name)
         else:
             self.logger.warning("Engine does not support model reloading")
@@ -61,21 +129,186 @@ class STTManager:
     def reload_engine(self):
         """Reloads the entire STT engine with current config."""
         self.logger.info("Reloading STT engine with updated configuration...")
-        self._setup_engine()
+        if self._has_running_loop():
+            asyncio.ensure_future(self._swap_engine())
+        else:
+            self._setup_engine()
+
+    async def load_engine(self) -> bool:
+        """
+        Builds the engine in the background, for managers created with load_engine=False.
+        Progress is reported via stt.model_loading / stt.model_ready / stt.model_failed.
+        """
+        await self._swap_engine()
+        return self.engine is not None
+
+    @staticmethod
+    def _has_running_loop():
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    async def _swap_model(self, model_name):
+        async with self._swap_lock:
+            info = {"model": model_name}
+            self.bus.emit("stt.model_loading", info)
+            started = time.perf_counter()
+            if await self.engine.reload_model_async(model_name):
+                await self.warm_up()
+                self.bus.emit("stt.model_ready", {
+                    **info,
+                    "load_ms": (time.perf_counter() - started) * 1000,
+                    "resident_models": model_registry.stats(), # Per-model memory, for sizing stt.model_cache_mb
+                })
+            else:
+                self.bus.emit("stt.model_failed", info)
+
+    async def _swap_engine(self):
+        """Builds a new engine in a worker thread and swaps it in; the old one serves meanwhile."""
+        async with self._swap_lock:
+            stt_config = self.config.get("stt", {})
+            info = {
+                "model": stt_config.get("model"),
+                "device": stt_config.get("device"),
+                "compute_type": stt_config.get("compute_type"),
+            }
+            self.bus.emit("stt.model_loading", info)
+            started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            try:
+                engine = await loop.run_in_executor(None, self._create_engine)
+            except Exception as e:
+                self.logger.error("Failed to create STT engine", exc=e)
+                engine = None
+
+            if engine is None or getattr(engine, 'model', True) is None:
+                self.logger.warning("Keeping the current STT engine")
+                if hasattr(engine, 'close'):
+                    await self._close_engine(engine)
+                self.bus.emit("stt.model_failed", info)
+                return
+
+            # Carry over runtime settings, then swap with a single assignment
+            self._apply_engine_settings(engine)
+            await self.warm_up(engine)
+            old_engine, self.engine = self.engine, engine
+            if hasattr(old_engine, 'close'):
+                # Engines holding a worker process release it once their in-flight decode is done
+                asyncio.ensure_future(self._close_engine(old_engine))
+            self.bus.emit("stt.model_ready", {
+                **info,
+                "load_ms": (time.perf_counter() - started) * 1000,
+                "resident_models": model_registry.stats(),
+            })
+
+    async def _close_engine(self, engine):
+        # close() may wait for a worker process to exit; keep that off the event loop
+        loop = asyncio.get_running_loop()
+        lock = getattr(engine, '_request_lock', None)
+        if lock:
+            async with lock:
+                await loop.run_in_executor(None, engine.close)
+        else:
+            await loop.run_in_executor(None, engine.close)
 
     def _setup_engine(self):
+        self.engine = self._create_engine()
+        self._apply_engine_settings(self.engine)
+
+    def _create_engine(self):
         stt_config = self.config.get("stt", {})
         if self.mode == "api":
             from .api_stt_engine import APISTTEngine
-            self.engine = APISTTEngine(stt_config.get("api", {}), self.logger)
+            return APISTTEngine(stt_config.get("api", {}), self.logger)
         elif self.mode == "local":
             from .local_stt_engine import LocalSTTEngine
+            model_registry.configure(budget_mb=stt_config.get("model_cache_mb", 4096), logger=self.logger)
             model = stt_config.get("model", "small.en")
             device = stt_config.get("device", "cuda")
             compute_type = stt_config.get("compute_type", "float16")
-            self.engine = LocalSTTEngine(model_name=model, device=device, compute_type=compute_type, logger=self.logger)
+            return LocalSTTEngine(model_name=model, device=device, compute_type=compute_type, logger=self.logger,
+                                  decode_profiles=stt_config.get("decode_profiles"),
+                                  **ThreadBudget.from_config(self.config).whisper_kwargs())
+        elif self.mode == "process":
+            # Same model settings as "local", hosted in a separate worker process
+            from .process_stt_engine import ProcessSTTEngine
+            process_config = stt_config.get("process", {})
+            budget = ThreadBudget.from_config(self.config)
+            return ProcessSTTEngine(model_name=stt_config.get("model", "small.en"),
+                                    device=stt_config.get("device", "cuda"),
+                                    compute_type=stt_config.get("compute_type", "float16"),
+                                    logger=self.logger,
+                                    decode_profiles=stt_config.get("decode_profiles"),
+                                    sample_rate=self.sample_rate,
+                                    max_audio_sec=process_config.get("max_audio_sec", 60.0),
+                                    request_timeout_sec=process_config.get("request_timeout_sec", 60.0),
+                                    start_timeout_sec=process_config.get("start_timeout_sec", 600.0),
+                                    max_restarts=process_config.get("max_restarts", 5),
+                                    cpu_affinity=budget.stt_cores if budget.pin else None,
+                                    **budget.whisper_kwargs())
+        elif self.mode == "batched":
+            # One model per process shared by every STTManager; their decodes run as batches
+            from .batched_stt_engine import open_shared_stream
+            batch_config = stt_config.get("batch", {})
+            model_registry.configure(budget_mb=stt_config.get("model_cache_mb", 4096), logger=self.logger)
+            return open_shared_stream(stt_config.get("model", "small.en"),
+                                      stt_config.get("device", "cuda"),
+                                      stt_config.get("compute_type", "float16"),
+                                      logger=self.logger,
+                                      decode_profiles=stt_config.get("decode_profiles"),
+                                      max_batch_size=batch_config.get("max_batch_size", 8),
+                                      max_wait_ms=batch_config.get("max_wait_ms", 50),
+                                      **ThreadBudget.from_config(self.config).whisper_kwargs())
         else:
             self.logger.error(f"Unknown STT mode: {self.mode}")
+            return None
+
+    def _apply_engine_settings(self, engine):
+        if engine and self.language is not None and hasattr(engine, 'set_language'):
+            engine.set_language(self.language)
+        # With the neural VAD gating the buffer, the decoder can skip its own VAD pass
+        if engine and hasattr(engine, 'vad_filter'):
+            engine.vad_filter = not self.vad.is_neural
+
+    async def warm_up(self, engine=None):
+        """
+        Runs the VAD and a throwaway decode per profile on synthetic audio before the stream
+        opens, so the first live utterance doesn't pay for model allocation and kernel selection.
+        Each engine/model is warmed once. Emits stt.warmup_finished with the timings.
+        """
+        engine = engine or self.engine
+        model = getattr(engine, 'model', None)
+        if engine is None or self._warmed == (id(engine), id(model)):
+            return
+
+        started = time.perf_counter()
+        vad_ms = None
+        if not self._vad_warm:
+            import numpy as np
+            # onnxruntime builds its execution plan on the first run
+            self.vad(np.zeros(self.sample_rate // 2, dtype=np.float32))
+            self.vad.reset()
+            self._vad_warm = True
+            vad_ms = (time.perf_counter() - started) * 1000
+
+        profiles = {}
+        if hasattr(engine, 'warm_up'): # API engines are skipped: a warm-up would be a billed request
+            try:
+                profiles = await engine.warm_up(streaming=self.streaming and hasattr(engine, 'transcribe_words'))
+            except Exception as e:
+                self.logger.warning(f"STT warm-up failed: {e}")
+
+        self._warmed = (id(engine), id(model))
+        total_ms = (time.perf_counter() - started) * 1000
+        self.logger.info(f"STT warm-up finished in {total_ms:.0f} ms")
+        self.bus.emit("stt.warmup_finished", {
+            "total_ms": total_ms,
+            "vad_ms": vad_ms,
+            "profiles_ms": profiles,
+            "model": getattr(engine, 'model_name', None),
+        })
 
     def start_processing(self):
         """Start the background task to process audio chunks from queue."""
@@ -86,19 +319,48 @@ class STTManager:
             # Ideally this is called inside an async context.
             return
         
+        self._loop = loop
+        self.vad.reset()
+        self._speaking = False
         self._processing_task = loop.create_task(self._process_queue())
+        self._decode_task = loop.create_task(self._decode_loop())
     
     def stop_processing(self):
-        """Stop the background processing task."""
+        """Stop the background processing tasks."""
+        self._loop = None
         if self._processing_task:
             self._processing_task.cancel()
+        if self._decode_task:
+            self._decode_task.cancel()
+        while self._final_jobs:
+            self._release(self._final_jobs.popleft()["lease"])
+        self._partial_requested = False
+        # Discard chunks that arrived after the last one was processed
+        while not self.audio_queue.empty():
+            self.audio_queue.get_nowait()
+            self.audio_queue.task_done()
+
+    async def drain(self, timeout: float = 30.0) -> bool:
+        """
+        Waits until queued chunks and final decodes are done, e.g. after a file source ended
+        and before shutting down. Returns False on timeout.
+        """
+        async def idle():
+            await asyncio.sleep(0) # Chunks handed over via call_soon_threadsafe are queued first
+            await self.audio_queue.join()
+            while self._final_jobs or self._decoding_final:
+                await asyncio.sleep(0.05)
+        try:
+            await asyncio.wait_for(idle(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     def handle_chunk(self, data):
         """
         Handles the 'audio.chunk_ready' event.
-        This might be called from the AudioCapture thread.
-        Instead of trying to schedule async task directly (which is tricky cross-thread),
-        we just put data into a thread-safe queue.
+        This might be called from the AudioCapture thread, so the chunk is handed
+        to the event loop with call_soon_threadsafe and queued there.
         """
         chunk = data.get("chunk")
         
@@ -108,34 +370,82 @@ class STTManager:
         if not isinstance(chunk, np.ndarray):
             return
         
-        # Put chunk in thread-safe queue (non-blocking)
+        loop = self._loop
+        if loop is None:
+            return # Not processing
+        
         try:
-            self.audio_queue.put_nowait(chunk)
-        except queue.Full:
-            self.logger.warning("Audio queue full, dropping chunk")
+            meta = {
+                "trace_id": data.get("trace_id"),
+                "sample_offset": data.get("sample_offset"),
+                "emitted_at": data.get("emitted_at"),
+            }
+            item = (chunk, data.get("chunk_id"), data.get("overlap_ms", 0.0), meta)
+            if data.get("blocking"):
+                self._put_blocking(loop, item)
+            else:
+                loop.call_soon_threadsafe(self._enqueue_chunk, item)
+        except RuntimeError:
+            pass # Loop already closed during shutdown
         except Exception as e:
             self.logger.error(f"Error putting chunk in queue: {e}")
+
+    def _put_blocking(self, loop, item):
+        """
+        Unpaced sources (file/synthetic replay at speed 0) mark their chunks "blocking":
+        their feed thread waits here until the queue has room, instead of the chunk being dropped.
+        """
+        import concurrent.futures
+        future = asyncio.run_coroutine_threadsafe(self.audio_queue.put(item), loop)
+        while True:
+            try:
+                future.result(timeout=0.5)
+                return
+            except concurrent.futures.TimeoutError:
+                if self._loop is not loop: # Processing stopped meanwhile
+                    future.cancel()
+                    return
+
+    async def put_chunk(self, data):
+        """
+        handle_chunk for callers already on the event loop that can wait for queue room
+        (the remote STT server with blocking chunks, which then stops reading its socket).
+        """
+        chunk = data.get("chunk")
+        meta = {key: data.get(key) for key in ("trace_id", "sample_offset", "emitted_at")}
+        item = (chunk, data.get("chunk_id"), data.get("overlap_ms", 0.0), meta)
+        while self._loop is not None:
+            try:
+                await asyncio.wait_for(self.audio_queue.put(item), 0.5)
+                return
+            except asyncio.TimeoutError:
+                pass # Re-check that processing is still running
+
+    def _enqueue_chunk(self, item):
+        """Runs on the event loop thread."""
+        try:
+            self.audio_queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped_chunks += 1
+            self.logger.warning(f"Audio queue full, dropping chunk (dropped so far: {self.dropped_chunks})")
     
     async def _process_queue(self):
-        """Background task that continuously processes chunks from queue."""
+        """Background task that processes chunks as soon as they are queued."""
         while True:
             try:
-                # Poll thread-safe queue (with small sleep to avoid busy-waiting)
-                # In a real app, we might use an asyncio.Queue and bridge it, 
-                # but queue.Queue + polling is safe and simple for now.
+                chunk, chunk_id, overlap_ms, meta = await self.audio_queue.get()
+                meta["dequeued_at"] = time.perf_counter()
                 try:
-                    chunk = self.audio_queue.get_nowait()
-                    await self._process_chunk(chunk)
-                except queue.Empty:
-                    # No chunk available, sleep briefly to yield control
-                    await asyncio.sleep(0.05)
+                    await self._process_chunk(chunk, chunk_id, overlap_ms, meta)
+                finally:
+                    self.audio_queue.task_done()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.logger.error(f"Error in queue processing: {e}")
                 await asyncio.sleep(0.1)
 
-    async def _process_chunk(self, chunk):
+    async def _process_chunk(self, chunk, chunk_id=None, overlap_ms=0.0, meta=None):
         if not self.engine:
             return
 
@@ -153,64 +463,269 @@ class STTManager:
             if chunk.dtype != np.float32:
                 chunk = chunk.astype(np.float32)
 
+            # --- Overlap Handling ---
+            # Consecutive chunks share `overlap_ms` of audio. Only the new samples are scored and
+            # buffered, so nothing is stored or decoded twice. A gap from a dropped chunk keeps the
+            # full chunk. Lead-in context for a fresh utterance comes from the VAD pre-roll.
+            overlap_samples = int(overlap_ms * self.sample_rate / 1000)
+            contiguous = chunk_id is not None and chunk_id == self._last_chunk_id + 1
+            self._last_chunk_id = chunk_id if chunk_id is not None else -1
+            # Stream offset of the first new sample (audio clock for tracing)
+            sample_offset = meta.get("sample_offset") if meta else None
+            if overlap_samples and contiguous:
+                chunk = chunk[overlap_samples:]
+                if sample_offset is not None:
+                    sample_offset += overlap_samples
+
             # --- VAD & Buffering Logic ---
             
-            # 1. Check Energy of NEW chunk
-            rms = np.sqrt(np.mean(chunk**2))
-            if rms < self.VAD_THRESHOLD:
-                self.silence_counter += 1
-            else:
+            # 1. Score the NEW samples (once, VAD state carries over between chunks)
+            prob = self.vad(chunk)
+            threshold = self.VAD_SILENCE_THRESHOLD if self._speaking else self.VAD_SPEECH_THRESHOLD
+            self._speaking = prob >= threshold
+            if self._speaking:
                 self.silence_counter = 0
+            else:
+                self.silence_counter += 1
                 
             # 2. Append to Buffer
-            self.audio_buffer = np.concatenate((self.audio_buffer, chunk))
+            # Non-speech only enters the buffer inside an utterance; before that it is kept as
+            # pre-roll so the onset of the first word is not cut off
+            utterance_open = len(self.audio_buffer) > 0 or self.buffer_offset_sec > 0
+            if not utterance_open and self._speaking:
+                for part in self._preroll:
+                    await self._append(part)
+                utterance_open = True
+                if meta and meta.get("trace_id"):
+                    # The utterance is traced under the ID of the chunk that opened it
+                    start = sample_offset - self._preroll_len if sample_offset is not None else None
+                    self._trace = tracing.start_trace(meta["trace_id"], start, self.sample_rate)
+            self._push_preroll(chunk)
+            if not utterance_open:
+                return
+            
+            await self._append(chunk)
+            if self._trace is not None and meta:
+                # Stage stamps follow the latest chunk: the last one is what the sentence waited on
+                if sample_offset is not None:
+                    self._trace["sample_end"] = sample_offset + len(chunk)
+                for stage, key in (("chunk_emitted", "emitted_at"), ("chunk_dequeued", "dequeued_at")):
+                    if meta.get(key) is not None: # A remote server has no emit time (not our clock)
+                        tracing.mark(self._trace, stage, meta[key])
+            self._chunk_sec = len(chunk) / self.sample_rate
             self.chunks_since_transcribe += 1
             
             # 3. Check buffer limits
-            buffer_duration_sec = len(self.audio_buffer) / 44100
+            # In streaming mode the committed audio is gone from the buffer but still part of the utterance
+            buffer_duration_sec = len(self.audio_buffer) / self.sample_rate + self.buffer_offset_sec
             
             should_finalize = False
             if self.silence_counter >= self.SILENCE_CHUNKS_THRESHOLD and buffer_duration_sec > 0.3:
                 should_finalize = True
-            elif buffer_duration_sec > self.MAX_BUFFER_DURATION: # Force finalize if too long
+            elif buffer_duration_sec > self.scheduler.max_buffer_sec: # Force finalize if too long (shrinks when decoding is slow)
                 should_finalize = True
                 
             # If buffer is very short and silent, skip processing to save GPU
             if buffer_duration_sec < 0.1:
                 return
 
-            # 4. Transcribe Accumulated Buffer
+            # 4. Request a decode of the accumulated buffer (runs in _decode_loop)
             # Optimize: Only transcribe if finalizing OR enough time passed (throttle)
-            # Dynamic throttle based on auto-detect mode
-            throttle_interval = self.TRANSCRIBE_INTERVAL
-            if hasattr(self.engine, 'is_auto_detect') and self.engine.is_auto_detect():
-                throttle_interval = self.TRANSCRIBE_INTERVAL + 1 # Slower updates for auto-detect
-                
-            if should_finalize or self.chunks_since_transcribe >= throttle_interval:
-                self.bus.emit("stt.decode_started", {})
-                text = await self.engine.transcribe(self.audio_buffer, 44100)
-                self.chunks_since_transcribe = 0 # Reset throttle counter
+            # Dynamic throttle based on measured decode speed and auto-detect mode
+            auto_detect = hasattr(self.engine, 'is_auto_detect') and self.engine.is_auto_detect()
+            throttle_interval = self.scheduler.throttle_chunks(self._chunk_sec, auto_detect)
                 
-                if text:
-                    if should_finalize:
-                        # Finalize
-                        self.bus.emit("stt.final_sentence", {"sentence": text})
-                        self.audio_buffer = np.array([], dtype=np.float32)
-                        self.silence_counter = 0
-                    else:
-                        # Partial
-                        self.bus.emit("stt.partial", {"text": text})
-                else:
-                    # No text found
-                    if should_finalize:
-                        # Just clear buffer if we thought we were finishing but got nothing (noise)
-                        self.audio_buffer = np.array([], dtype=np.float32)
-                        self.silence_counter = 0
-            else:
-                # Skip transcription for this chunk, just accumulate
-                pass
+            if should_finalize:
+                self._request_final()
+            elif self.chunks_since_transcribe >= throttle_interval:
+                self._request_partial()
                 
         except Exception as e:
             self.logger.error("STT processing failed", exc=e)
             # Reset buffer on error to avoid stuck state
-            self.audio_buffer = np.array([], dtype=np.float32)
+            self._reset_utterance()
+
+    async def _append(self, data):
+        """Appends to the utterance ring, first waiting for decodes whose audio it would overwrite."""
+        while (room := self.audio_buffer.writable()) is not None and len(data) > room:
+            self._buffer_released.clear()
+            await self._buffer_released.wait()
+        self.audio_buffer.append(data)
+
+    def _release(self, lease):
+        lease.release()
+        self._buffer_released.set()
+
+    def _push_preroll(self, chunk):
+        """Keeps the most recent `preroll_samples` of audio."""
+        self._preroll.append(chunk.copy())
+        self._preroll_len += len(chunk)
+        while self._preroll and self._preroll_len - len(self._preroll[0]) >= self.preroll_samples:
+            self._preroll_len -= len(self._preroll.popleft())
+        if self._preroll and self._preroll_len > self.preroll_samples:
+            # Trim the oldest part so exactly preroll_samples remain
+            excess = self._preroll_len - self.preroll_samples
+            self._preroll[0] = self._preroll[0][excess:]
+            self._preroll_len -= excess
+
+    def _request_partial(self):
+        """Asks the decode stage for a partial. Requests that pile up while it is busy are merged."""
+        self.chunks_since_transcribe = 0
+        if self._partial_requested:
+            self.coalesced_decodes += 1
+        else:
+            self._partial_requested_at = time.perf_counter()
+        self._partial_requested = True
+        self._decode_wakeup.set()
+
+    def _request_final(self):
+        """Hands the finished utterance to the decode stage and starts the next one right away."""
+        lease = self.audio_buffer.lease() # The next utterance reuses the ring; this keeps it from overwriting the audio
+        self._final_jobs.append({
+            "audio": lease.audio,
+            "lease": lease,
+            "agreement": self.agreement,
+            "offset": self.buffer_offset_sec,
+            "trace": tracing.mark(self._trace, "final_requested"),
+        })
+        self._partial_requested = False # The final decode supersedes any pending partial
+        self._reset_utterance()
+        self._decode_wakeup.set()
+
+    async def _decode_loop(self):
+        """
+        Decode stage, decoupled from ingestion.
+        Finals are decoded in order; then at most one partial runs on the latest buffer,
+        so a slow decode makes partials less frequent instead of blocking the audio queue.
+        """
+        while True:
+            try:
+                await self._decode_wakeup.wait()
+                self._decode_wakeup.clear()
+                while self._final_jobs:
+                    async with self._decode_slot():
+                        self._decoding_final = True
+                        job = self._final_jobs.popleft()
+                        try:
+                            await self._decode_final(job)
+                        finally:
+                            self._decoding_final = False
+                            self._release(job["lease"])
+                if self._partial_requested:
+                    async with self._decode_slot():
+                        if self._partial_requested: # A final may have superseded it while waiting
+                            self._partial_requested = False
+                            await self._decode_partial()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error("STT decode failed", exc=e)
+
+    def _decode_slot(self):
+        # The batched engine does its own cross-stream scheduling and process workers
+        # don't share a model, so the gate only applies to in-process engines
+        if self.decode_gate is None or self.mode in ("batched", "process"):
+            return contextlib.nullcontext()
+        return self.decode_gate.slot(self.name)
+
+    def _use_streaming(self):
+        return self.streaming and hasattr(self.engine, 'transcribe_words')
+
+    async def _decode_final(self, job):
+        if not self.engine:
+            return
+
+        self.bus.emit("stt.decode_started", {})
+        started = time.perf_counter()
+        trace = tracing.mark(job.get("trace"), "decode_started", started)
+        if self._use_streaming():
+            # The last decode is final: everything it heard is accepted as-is
+            agreement = job["agreement"]
+            prompt = agreement.committed_text()[-200:] or None
+            words = await self.engine.transcribe_words(job["audio"], self.sample_rate, initial_prompt=prompt, profile="final")
+            agreement.insert(words, job["offset"])
+            text = agreement.text()
+        else:
+            text = await self.engine.transcribe(job["audio"], self.sample_rate, profile="final")
+        tracing.mark(trace, "decode_finished")
+        self._record_decode("final", time.perf_counter() - started, len(job["audio"]))
+
+        # No text means the utterance was noise; it is dropped either way
+        if text:
+            self.bus.emit("stt.final_sentence", {"sentence": text, "trace": trace})
+
+    async def _decode_partial(self):
+        """
+        Decodes the current utterance buffer.
+        In streaming mode only the uncommitted tail is decoded; words that agree across two
+        consecutive decodes are committed and their audio is dropped from the buffer, so
+        partial decode cost stays flat for long sentences.
+        """
+        if not self.engine or len(self.audio_buffer) < 0.1 * self.sample_rate:
+            return
+
+        generation = self._utterance_generation
+        offset = self.buffer_offset_sec
+        # Leased: ingestion keeps appending while the decode awaits, but won't wrap over it
+        lease = self.audio_buffer.lease()
+        try:
+            await self._decode_partial_audio(lease.audio, generation, offset)
+        finally:
+            self._release(lease)
+
+    async def _decode_partial_audio(self, audio, generation, offset):
+        self.bus.emit("stt.decode_started", {})
+        started = time.perf_counter()
+        # Snapshot: the utterance's trace keeps moving while this decode runs
+        trace = tracing.fork(self._trace, "partial")
+        tracing.mark(trace, "partial_requested", self._partial_requested_at)
+        tracing.mark(trace, "decode_started", started)
+        if self._use_streaming():
+            prompt = self.agreement.committed_text()[-200:] or None
+            words = await self.engine.transcribe_words(audio, self.sample_rate, initial_prompt=prompt, profile="partial")
+            self._record_decode("partial", time.perf_counter() - started, len(audio))
+            if generation != self._utterance_generation:
+                return # Finalized meanwhile, the final decode covers this audio
+
+            if self.agreement.insert(words, offset):
+                # Drop committed audio, keeping the tail from the end of the last committed word
+                cut_index = self._utterance_start + int(self.agreement.last_committed_end * self.sample_rate)
+                self.audio_buffer.consume(cut_index - self.audio_buffer.head)
+            text = self.agreement.text()
+        else:
+            text = await self.engine.transcribe(audio, self.sample_rate, profile="partial")
+            self._record_decode("partial", time.perf_counter() - started, len(audio))
+            if generation != self._utterance_generation:
+                return
+
+        if text:
+            tracing.mark(trace, "decode_finished")
+            self.bus.emit("stt.partial", {"text": text, "trace": trace})
+
+    def _record_decode(self, kind, decode_sec, num_samples):
+        """Feeds the scheduler and reports the current throttle and real-time factor."""
+        audio_sec = num_samples / self.sample_rate
+        self.scheduler.record(decode_sec, audio_sec, profile=kind)
+        self.bus.emit("stt.metrics", {
+            "kind": kind,
+            "decode_ms": decode_sec * 1000,
+            "audio_ms": audio_sec * 1000,
+            "dropped_chunks": self.dropped_chunks,
+            "coalesced_decodes": self.coalesced_decodes,
+            "model": getattr(self.engine, 'model_name', None),
+            **self.scheduler.metrics()
+        })
+
+    @property
+    def buffer_offset_sec(self):
+        """Utterance time of the first buffered sample (audio already committed and dropped)."""
+        return (self.audio_buffer.head - self._utterance_start) / self.sample_rate
+
+    def _reset_utterance(self):
+        self.audio_buffer.clear()
+        self.silence_counter = 0
+        self.chunks_since_transcribe = 0
+        self.agreement = LocalAgreement()
+        self._utterance_start = self.audio_buffer.head
+        self._utterance_generation += 1
+        self._trace = None
@@ -0,0 +1,144 @@
+import logging
+import os
+import numpy as np
+
+
+class EnergyVAD:
+    """RMS threshold detector, used when the neural VAD is unavailable."""
+    is_neural = False
+
+    def __init__(self, threshold: float = 0.005):
+        self.threshold = threshold
+
+    def reset(self):
+        pass
+
+    def __call__(self, audio: np.ndarray) -> float:
+        if len(audio) == 0:
+            return 0.0
+        rms = np.sqrt(np.dot(audio, audio) / len(audio))
+        return 1.0 if rms >= self.threshold else 0.0
+
+
+class SileroVAD:
+    """
+    Incremental Silero VAD running on onnxruntime (CPU).
+
+    Audio is scored once, in fixed windows, as it arrives; the recurrent state
+    and any leftover samples carry over between calls, so each chunk costs the
+    same no matter how long the utterance is. The export is told apart by its
+    input names, which don't depend on how its shapes were exported:
+    - state + sr: upstream v5/v6, fed the last `context_size` samples before each window;
+    - h/c + sr: upstream v4, the window alone;
+    - h/c without sr: faster-whisper's bundled export (v6), 16 kHz only, with context.
+    """
+    is_neural = True
+
+    def __init__(self, model_path: str, sample_rate: int = 16000):
+        import onnxruntime
+
+        if sample_rate not in (8000, 16000):
+            raise ValueError("Silero VAD supports 8000 or 16000 Hz only")
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        inputs = {i.name: i for i in self.session.get_inputs()}
+
+        self.sample_rate = sample_rate
+        self.window = 512 if sample_rate == 16000 else 256
+        self.context_size = 64 if sample_rate == 16000 else 32
+
+        # Recurrent state tensors, in the order the model returns them after the probability
+        self.state_names = [name for name in ("state", "h", "c") if name in inputs]
+        self._state_shapes = {
+            name: [d if isinstance(d, int) else 1 for d in inputs[name].shape] for name in self.state_names
+        }
+        if "sr" not in inputs and sample_rate != 16000:
+            raise ValueError("This Silero export has no sample rate input and only runs at 16000 Hz")
+        self.use_context = "state" in inputs or "sr" not in inputs
+        input_width = inputs["input"].shape[-1] # A static width only double-checks the choice above
+        if isinstance(input_width, int) and input_width != self.window + (self.context_size if self.use_context else 0):
+            raise ValueError(f"Model expects {input_width} samples per window, not usable at {sample_rate} Hz")
+        self._sr = np.array(sample_rate, dtype=np.int64) if "sr" in inputs else None
+        self.reset()
+
+    def reset(self):
+        self._states = {name: np.zeros(shape, dtype=np.float32) for name, shape in self._state_shapes.items()}
+        self._context = np.zeros(self.context_size, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._last_prob = 0.0
+
+    def _score_window(self, window: np.ndarray) -> float:
+        x = np.concatenate((self._context, window)) if self.use_context else window
+        feed = {"input": x[np.newaxis, :], **self._states}
+        if self._sr is not None:
+            feed["sr"] = self._sr
+        out, *states = self.session.run(None, feed)
+        self._states = dict(zip(self.state_names, states))
+        self._context = window[-self.context_size:]
+        return float(np.asarray(out).reshape(-1)[0])
+
+    def __call__(self, audio: np.ndarray) -> float:
+        """Returns the highest speech probability among the windows completed by `audio`."""
+        buf = np.concatenate((self._pending, audio.astype(np.float32, copy=False)))
+        n_windows = len(buf) // self.window
+        if n_windows == 0:
+            self._pending = buf
+            return self._last_prob
+
+        prob = max(self._score_window(buf[i * self.window:(i + 1) * self.window]) for i in range(n_windows))
+        self._pending = buf[n_windows * self.window:]
+        self._last_prob = prob
+        return prob
+
+
+# Single-file Silero exports faster-whisper has bundled, newest first (1.2 ships v6). 1.1.x
+# ships the model split in two (silero_encoder_v5.onnx + silero_decoder_v5.onnx), which SileroVAD
+# can't run; set stt.vad.model_path to a single-file export (silero_vad.onnx from snakers4/silero-vad)
+SILERO_ASSET_NAMES = ("silero_vad_v6.onnx", "silero_vad_v5.onnx", "silero_vad.onnx", "silero_vad_v4.onnx")
+
+
+def _find_silero_model():
+    """Path of a single-file Silero ONNX model bundled with faster-whisper, or None."""
+    try:
+        from faster_whisper.utils import get_assets_path
+    except ImportError:
+        return None
+    for name in SILERO_ASSET_NAMES:
+        path = os.path.join(get_assets_path(), name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def create_vad(vad_config: dict, sample_rate: int, energy_threshold: float, logger=None):
+    """
+    Builds the Silero VAD if enabled and available, otherwise the energy VAD.
+    The model comes from vad_config["model_path"], else from faster-whisper's assets.
+    """
+    logger = logger or logging.getLogger("VAD")
+    if not vad_config.get("enabled", True):
+        return EnergyVAD(energy_threshold)
+
+    model_path = vad_config.get("model_path")
+    if model_path and not os.path.isfile(model_path):
+        logger.warning(f"Silero VAD model not found at stt.vad.model_path={model_path}, falling back to energy VAD")
+        return EnergyVAD(energy_threshold)
+    model_path = model_path or _find_silero_model()
+    if not model_path:
+        logger.warning("No single-file Silero VAD model in faster-whisper's assets (newer versions ship it split); "
+                       "set stt.vad.model_path to silero_vad.onnx. Falling back to energy VAD")
+        return EnergyVAD(energy_threshold)
+    if sample_rate not in (8000, 16000):
+        logger.warning(f"Silero VAD needs 8 or 16 kHz audio, the pipeline runs at {sample_rate} Hz; "
+                       "falling back to energy VAD")
+        return EnergyVAD(energy_threshold)
+    try:
+        vad = SileroVAD(model_path, sample_rate)
+        logger.info(f"Using Silero VAD: {model_path}")
+        return vad
+    except Exception as e:
+        logger.warning(f"Silero VAD unavailable ({e}), falling back to energy VAD")
+    return EnergyVAD(energy_threshold)
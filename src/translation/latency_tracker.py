@@ -1,26 +1,114 @@
+import threading
 import time
-from typing import Dict
+from typing import Dict, Any, Optional
+from src.utils.latency_histogram import LatencyHistogram
 
 class LatencyTracker:
     """
-    Tracks latency for translation tasks.
+    Latency metrics for the translation pipeline: fixed-memory histograms (see
+    LatencyHistogram) per stage and per (stage, model), with rolling-window p50/p95/p99.
+
+    Spans: start(id) ... stop(id) times one request (TranslationManager's per-sentence
+    translation, as before). A span that is never stopped (e.g. the translation failed)
+    is dropped after `span_ttl_sec` and counted in `expired_spans` instead of leaking.
+    Durations measured elsewhere (trace stages, decode times) go in with record().
+    Thread-safe.
     """
-    def __init__(self):
-        self.start_times: Dict[int, float] = {}
+    def __init__(self, window_sec: float = 60.0, slots: int = 6, span_ttl_sec: float = 120.0, clock=time.monotonic):
+        self.window_sec = window_sec
+        self.slots = slots
+        self.span_ttl_sec = span_ttl_sec
+        self.clock = clock
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.models: Dict[tuple, LatencyHistogram] = {} # (stage, model) -> histogram
+        self.expired_spans = 0
+        self._spans: Dict[Any, tuple] = {} # span id -> (start, stage, model)
+        self._lock = threading.Lock()
+
+    def start(self, span_id, stage: str = "translation", model: Optional[str] = None):
+        """
+        Starts tracking latency for a span (e.g. a sentence ID).
+        """
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            self._spans[span_id] = (now, stage, model)
+
+    def stop(self, span_id) -> float:
+        """
+        Stops tracking, records the span and returns its latency in milliseconds.
+        Returns 0.0 if the span is unknown (never started, expired or cancelled).
+        """
+        now = self.clock()
+        with self._lock:
+            span = self._spans.pop(span_id, None)
+            if span is None:
+                return 0.0
+            start, stage, model = span
+            latency = (now - start) * 1000.0
+            self._record(stage, latency, model)
+            return latency
+
+    def cancel(self, span_id):
+        """Forgets a span without recording it (the request failed)."""
+        with self._lock:
+            self._spans.pop(span_id, None)
+
+    def record(self, stage: str, latency_ms: float, model: Optional[str] = None):
+        with self._lock:
+            self._record(stage, latency_ms, model)
 
-    def start(self, sentence_id: int):
+    def record_stages(self, stages_ms: Dict[str, float], model: Optional[str] = None):
         """
-        Starts tracking latency for a sentence ID.
+        Records a trace breakdown (src/utils/trace.py: stage -> ms since the previous stage).
+        The first stage is the reference point (always 0 ms) and is skipped.
         """
-        self.start_times[sentence_id] = time.time()
+        with self._lock:
+            for stage, latency in list((stages_ms or {}).items())[1:]:
+                self._record(stage, latency, model)
+
+    def _record(self, stage, latency_ms, model):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = self._histogram()
+        histogram.record(latency_ms)
+        if model:
+            histogram = self.models.get((stage, model))
+            if histogram is None:
+                histogram = self.models[(stage, model)] = self._histogram()
+            histogram.record(latency_ms)
+
+    def _histogram(self):
+        return LatencyHistogram(self.window_sec, self.slots, clock=self.clock)
+
+    def _expire(self, now):
+        cutoff = now - self.span_ttl_sec
+        expired = [span_id for span_id, (start, _, _) in self._spans.items() if start < cutoff]
+        for span_id in expired:
+            del self._spans[span_id]
+        self.expired_spans += len(expired)
 
-    def stop(self, sentence_id: int) -> float:
+    def snapshot(self) -> Dict[str, Any]:
         """
-        Stops tracking and returns the latency in milliseconds.
-        Returns 0.0 if start time not found.
+        {"stages": {stage: {count, p50, p95, p99, total_*}}, "models": {model: {stage: {...}}},
+         "open_spans": n, "expired_spans": n}. Window figures cover the last `window_sec`.
         """
-        if sentence_id in self.start_times:
-            start_time = self.start_times.pop(sentence_id)
-            return (time.time() - start_time) * 1000.0
-        return 0.0
+        with self._lock:
+            self._expire(self.clock())
+            models = {}
+            for (stage, model), histogram in self.models.items():
+                models.setdefault(model, {})[stage] = histogram.snapshot()
+            return {
+                "window_sec": self.window_sec,
+                "stages": {stage: histogram.snapshot() for stage, histogram in self.stages.items()},
+                "models": models,
+                "open_spans": len(self._spans),
+                "expired_spans": self.expired_spans,
+            }
 
+    def reset(self):
+        """Clears all histograms and counters; spans in flight keep running."""
+        with self._lock:
+            self.stages.clear()
+            self.models.clear()
+            self.expired_spans = 0
@@ -1,13 +1,16 @@
 import logging
 from typing import Dict, Optional
-from openai import AsyncOpenAI, APIError
 from .prompt_builder import PromptBuilder
 
 class LLMClient:
     """
     Client for interacting with LLM APIs (OpenAI compatible).
     """
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, client=None, gate=None, gate_key=None):
+        """
+        client: an AsyncOpenAI instance to share (and its HTTP connection pool) between pipelines.
+        gate/gate_key: optional FairGate limiting concurrent requests across pipelines.
+        """
         self.config = config
         self.api_key = config.get("api_key")
         self.base_url = config.get("base_url")
@@ -16,11 +19,16 @@ class LLMClient:
         self.translation_model = config.get("llm_translation_model", config.get("llm_api", "gpt-4o-mini"))
         self.summary_model = config.get("llm_summary_model", config.get("llm_api", "gpt-4o-mini"))
         
-        # Initialize OpenAI client
-        self.client = AsyncOpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
+        # Initialize OpenAI client (imported here; the openai package is slow to import at startup)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url
+            )
+        self.client = client
+        self.gate = gate
+        self.gate_key = gate_key
         
         self.prompt_builder = PromptBuilder()
         self.logger = logging.getLogger("System")
@@ -31,6 +39,12 @@ class LLMClient:
     def set_target_language(self, lang: str):
         self.target_lang = lang
 
+    async def _create_completion(self, **kwargs):
+        if self.gate is None:
+            return await self.client.chat.completions.create(**kwargs)
+        async with self.gate.slot(self.gate_key):
+            return await self.client.chat.completions.create(**kwargs)
+
     async def translate(self, sentence: str, context: str) -> Dict:
         """
         Translates a sentence using the LLM.
@@ -41,7 +55,7 @@ class LLMClient:
         try:
             self.logger.info(f"LLMClient: Sending translation request for: {sentence[:20]}...")
             start_time = __import__('time').time()
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
                 model=self.translation_model,
                 messages=[
                     {"role": "system", "content": "You are a helpful translator."},
@@ -79,7 +93,7 @@ class LLMClient:
         
         try:
             self.logger.info(f"LLMClient: Sending context update request...")
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
                 model=self.summary_model,
                 messages=[
                     {"role": "system", "content": "You are a helpful summarizer."},
@@ -4,6 +4,7 @@ from typing import Dict
 
 from src.utils.event_bus import EventBus
 from src.utils.dialogue_logger import DialogueLogger
+from src.utils import trace as tracing
 from .llm_client import LLMClient
 from .context_manager import ContextManager
 from .latency_tracker import LatencyTracker
@@ -14,16 +15,21 @@ class TranslationManager:
     STT -> LLM1 (Translate) -> Overlay
            LLM1 -> LLM2 (Context) -> ContextManager
     """
-    def __init__(self, event_bus: EventBus, config: Dict):
+    def __init__(self, event_bus: EventBus, config: Dict, llm_client: LLMClient = None, dialogue_logger: DialogueLogger = None):
         self.bus = event_bus
         self.config = config
         self.logger = logging.getLogger("System")
         
-        # Initialize components
-        self.llm_client = LLMClient(config)
+        # Initialize components (a Pipeline passes in ones built on its shared resources)
+        self.llm_client = llm_client or LLMClient(config)
         self.context_manager = ContextManager(max_tokens=config.get("context_tokens", 500))
-        self.dialogue_logger = DialogueLogger(output_dir=config.get("log_dir", "logs/dialogue"))
-        self.latency_tracker = LatencyTracker()
+        self.dialogue_logger = dialogue_logger or DialogueLogger(output_dir=config.get("log_dir", "logs/dialogue"))
+        # Per-stage/per-model latency histograms (rolling p50/p95/p99), see latency_snapshot()
+        latency_config = config.get("latency", {})
+        self.latency_tracker = LatencyTracker(
+            window_sec=latency_config.get("window_sec", 60.0),
+            span_ttl_sec=latency_config.get("span_ttl_sec", 120.0)
+        )
         
         # Configuration for context update strategy
         # Default to False (use translated text) to maintain backward compatibility
@@ -35,9 +41,11 @@ class TranslationManager:
         
         # State
         self.sentence_counter = 0
+        self._tasks = set() # In-flight handle_final_sentence tasks, awaited by drain()
         
         # Subscribe to events
         self.bus.subscribe("stt.final_sentence", self._on_final_sentence_wrapper)
+        self.bus.subscribe("stt.metrics", self._on_stt_metrics)
         
     def set_target_language(self, lang: str):
         if self.llm_client:
@@ -50,11 +58,35 @@ class TranslationManager:
             self.bus.emit("llm2.context_update_finished", {"context": ""})
             self.logger.info("Translation Context Reset.")
         
+    def _on_stt_metrics(self, data: Dict):
+        # Decode times per STT model, next to the translation stages
+        if "decode_ms" in data:
+            self.latency_tracker.record(f"decode_{data.get('kind', 'final')}", data["decode_ms"], data.get("model"))
+
+    def latency_snapshot(self) -> Dict:
+        """Rolling-window latency percentiles per stage and per model (LatencyTracker.snapshot)."""
+        return self.latency_tracker.snapshot()
+
     def _on_final_sentence_wrapper(self, data: Dict):
         """
         Wrapper to schedule the async handler on the event loop.
         """
-        asyncio.create_task(self.handle_final_sentence(data))
+        task = asyncio.create_task(self.handle_final_sentence(data))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def drain(self, timeout: float = 30.0) -> bool:
+        """
+        Waits for the translations already started (e.g. before shutting down).
+        Returns False if some were still running after `timeout` seconds; those are cancelled.
+        """
+        if not self._tasks:
+            return True
+        self.logger.info(f"Waiting for {len(self._tasks)} pending translation(s)...")
+        done, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        return not pending
 
     async def handle_final_sentence(self, data: Dict):
         """
@@ -67,8 +99,10 @@ class TranslationManager:
 
         self.sentence_counter += 1
         current_id = self.sentence_counter
+        # Utterance trace from the STT stage (see src/utils/trace.py); None if it has none
+        trace = tracing.mark(data.get("trace"), "translation_started")
         
-        self.latency_tracker.start(current_id)
+        self.latency_tracker.start(current_id, "translation", getattr(self.llm_client, "translation_model", None))
         self.logger.info(f"Translation started for ID {current_id}: {sentence_text[:20]}...")
 
         # 1. Get Context
@@ -87,6 +121,7 @@ class TranslationManager:
         
         if not translated_text:
             self.logger.warning(f"Translation failed for ID {current_id}")
+            self.latency_tracker.cancel(current_id)
             return
 
         # Notify finish / Update Overlay
@@ -96,11 +131,17 @@ class TranslationManager:
         }) # Using a generic display event or the one in spec?
         # Spec says `overlay.translation_rendered` is triggered by Overlay, so we emit something Overlay listens to.
         # Spec Section 15: LLM -> on_translation_ready -> Overlay
+        tracing.mark(trace, "translation_ready")
         self.bus.emit("llm.translation_ready", {
             "id": current_id,
             "original": sentence_text,
-            "translation": translated_text
+            "translation": translated_text,
+            "trace": trace
         })
+        stages = tracing.breakdown(trace) # Before the context update; front ends add their own stages to forks
+        if stages:
+            self.latency_tracker.record_stages(stages["stages_ms"])
+            self.latency_tracker.record("end_to_end", stages["total_ms"])
 
         latency = self.latency_tracker.stop(current_id)
         
@@ -114,6 +155,8 @@ class TranslationManager:
         if len(self.pending_sentences_buffer) >= self.context_update_interval:
             # Time to update context
             self.bus.emit("llm2.context_update_started", {"id": current_id})
+            context_span = ("context", current_id)
+            self.latency_tracker.start(context_span, "context_update", getattr(self.llm_client, "summary_model", None))
             
             # Join buffered sentences
             combined_text = " ".join(self.pending_sentences_buffer)
@@ -124,6 +167,7 @@ class TranslationManager:
                 use_original=self.use_original_text_for_context
             )
             
+            self.latency_tracker.stop(context_span)
             self.context_manager.update_context(new_context)
             self.bus.emit("llm2.context_update_finished", {"context": new_context})
             
@@ -140,7 +184,10 @@ class TranslationManager:
             "scenario_context": new_context,
             "tokens_in": trans_result.get("tokens_in", 0),
             "tokens_out": trans_result.get("tokens_out", 0),
-            "latency_ms": latency
+            "latency_ms": latency,
+            "trace_id": stages.get("trace_id"),
+            "audio_start_sec": stages.get("audio_start_sec"),
+            "stages_ms": stages.get("stages_ms")
         })
         
         self.logger.info(f"Translation finished ID {current_id} in {latency:.2f}ms")
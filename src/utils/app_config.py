@@ -0,0 +1,119 @@
+import os
+from typing import Dict, Any
+
+# PIPELINE_<NAME>_<FIELD> keys: field -> (config path within the pipeline's overrides, parser).
+# Longest suffix first so TARGET_LANGUAGE is not read as LANGUAGE
+PIPELINE_FIELDS = {
+    "TARGET_LANGUAGE": (("target_translation_language",), str),
+    "DEVICE_INDEX": (("audio", "device_index"), int),
+    "LANGUAGE": (("stt", "language"), str),
+    "MODEL": (("stt", "model"), str),
+}
+
+
+def default_config() -> Dict[str, Any]:
+    """Pipeline configuration shared by the GUI and the headless runner."""
+    return {
+        "audio": {
+            "output_device": "default",
+            "use_loopback": True,
+            "sample_rate": 16000 # Pipeline rate after capture (Whisper native rate)
+        },
+        "chunk": {
+            "size_ms": 250,
+            "overlap_ms": 50
+        },
+        "stt": {
+            "mode": "local", # "process" hosts the local model in a separate worker process, "remote" uses an STT server (stt.remote.address)
+            "model": "deepdml/faster-whisper-large-v3-turbo-ct2",
+            "device": "cuda",
+            "compute_type": "float16",
+            "streaming": False, # Opt-in: decode only the uncommitted tail (LocalAgreement) instead of the whole utterance
+            "latency_target_ms": 1500, # Decode scheduling adapts to stay under this
+            "model_cache_mb": 4096, # Recently used models stay loaded up to this budget
+            "vad": {
+                "enabled": True, # Silero VAD; only runs at 8 or 16 kHz (audio.sample_rate), energy VAD otherwise
+                "model_path": None # Single-file Silero ONNX; None looks in faster-whisper's assets
+            }
+        },
+        "threads": {
+            "enabled": False, # Opt-in CPU budget (see ThreadBudget); off leaves thread counts to the libraries
+            # Cores for CTranslate2 default to all but one (kept for Qt/asyncio/capture)
+            "numeric_threads": 1, # NumPy BLAS / numba, only used for small pipeline math
+            "pin": False # Bind pipeline and decoder threads to separate cores (Linux)
+        }
+    }
+
+
+def load_user_config(config: Dict[str, Any], config_path: str, logger=None) -> Dict[str, Any]:
+    """Applies User_config.txt (KEY=VALUE lines) to `config`; every key is also exported as an env var."""
+    if not os.path.exists(config_path):
+        return config
+    if logger:
+        logger.info(f"Loading config from {config_path}")
+    with open(config_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                key = key.strip()
+                value = value.strip()
+                os.environ[key] = value # Set as env var for other components
+
+                # Update config dict if applicable
+                if key == "LLM_TRANSLATION_MODEL":
+                    # TranslationManager uses the config passed to it
+                    config["llm_translation_model"] = value
+                elif key == "LLM_SUMMARY_MODEL":
+                    config["llm_summary_model"] = value
+                elif key == "USE_ORIGINAL_TEXT_FOR_CONTEXT":
+                    config["use_original_text_for_context"] = (value.lower() == "true")
+                elif key == "TARGET_TRANSLATION_LANGUAGE":
+                    config["target_translation_language"] = value
+                elif key == "STT_STREAMING":
+                    config["stt"]["streaming"] = (value.lower() == "true")
+                elif key == "SILERO_VAD_MODEL_PATH":
+                    config["stt"]["vad"]["model_path"] = value or None
+                elif key == "CPU_THREAD_BUDGET":
+                    config["threads"]["enabled"] = (value.lower() == "true")
+                elif key == "STT_CPU_THREADS":
+                    # Setting the decoder's threads is an explicit opt-in to the budget
+                    config["threads"]["stt_threads"] = int(value)
+                    config["threads"]["enabled"] = True
+                elif key == "PIN_CPU_CORES":
+                    config["threads"]["pin"] = (value.lower() == "true")
+                    config["threads"]["enabled"] = config["threads"].get("enabled", False) or config["threads"]["pin"]
+                elif key.startswith("PIPELINE_"):
+                    _set_pipeline_field(config, key, value, logger)
+    return config
+
+
+def _set_pipeline_field(config: Dict[str, Any], key: str, value: str, logger=None):
+    """
+    PIPELINE_<NAME>_<FIELD>=VALUE adds (or extends) the extra pipeline <NAME> in config["pipelines"],
+    e.g. PIPELINE_ja_DEVICE_INDEX=5 and PIPELINE_ja_LANGUAGE=ja; fields not set come from the base config.
+    """
+    rest = key[len("PIPELINE_"):]
+    for field, (path, parse) in PIPELINE_FIELDS.items():
+        if rest.endswith("_" + field) and len(rest) > len(field) + 1:
+            name = rest[:-len(field) - 1]
+            break
+    else:
+        if logger:
+            logger.warning(f"Unknown pipeline key {key} (fields: {', '.join(PIPELINE_FIELDS)})")
+        return
+    try:
+        value = parse(value)
+    except ValueError:
+        if logger:
+            logger.warning(f"Ignoring {key}={value}: not a valid {field.lower()}")
+        return
+
+    pipelines = config.setdefault("pipelines", [])
+    entry = next((p for p in pipelines if p.get("name") == name), None)
+    if entry is None:
+        entry = {"name": name}
+        pipelines.append(entry)
+    for part in path[:-1]:
+        entry = entry.setdefault(part, {})
+    entry[path[-1]] = value
@@ -1,17 +1,67 @@
 import json
 import csv
+import queue
+import threading
 import time
 import os
 from datetime import datetime
 from typing import Dict, Literal
 
+class DialogueWriter:
+    """
+    Background thread doing the file writes for any number of DialogueLoggers,
+    so several pipelines share one writer and the event loop never waits on disk.
+    """
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, logger, record):
+        """Queues a record for `logger`; a None record closes the logger's file after earlier writes."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="DialogueWriter")
+                self._thread.start()
+        self._queue.put((logger, record))
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self):
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                logger, record = item
+                if record is None:
+                    logger._close_file()
+                else:
+                    logger._write(record)
+            except Exception as e:
+                import logging
+                logging.getLogger("System").error(f"Dialogue log write failed: {e}")
+            finally:
+                self._queue.task_done()
+
 class DialogueLogger:
     """
     Logs dialogue records (source, translation, context) to a file.
+    With a shared DialogueWriter, writes happen on the writer's thread.
     """
-    def __init__(self, output_dir: str = "logs/dialogue", format: Literal["jsonl", "csv"] = "jsonl"):
+    def __init__(self, output_dir: str = "logs/dialogue", format: Literal["jsonl", "csv"] = "jsonl",
+                 writer: DialogueWriter = None, name: str = None):
         self.output_dir = output_dir
         self.format = format
+        self.writer = writer
+        self.name = name # Pipeline name, part of the file name when several pipelines log
         self.current_file = None
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -21,7 +71,8 @@ class DialogueLogger:
         self._open_file()
 
     def _open_file(self):
-        filename = f"dialogue_{self.session_id}.{self.format}"
+        suffix = f"_{self.name}" if self.name else ""
+        filename = f"dialogue_{self.session_id}{suffix}.{self.format}"
         filepath = os.path.join(self.output_dir, filename)
         self.filepath = filepath
         # We open in append mode each time or keep open? 
@@ -42,6 +93,14 @@ class DialogueLogger:
         """
         Appends a record to the log.
         """
+        record["timestamp"] = datetime.now().isoformat()
+        record["session_id"] = self.session_id
+        if self.writer:
+            self.writer.submit(self, record)
+        else:
+            self._write(record)
+
+    def _write(self, record: Dict):
         # Check if file is closed (e.g. due to stop() being called while task was pending)
         was_closed = False
         if self.file_handle.closed:
@@ -49,9 +108,6 @@ class DialogueLogger:
             was_closed = True
 
         try:
-            record["timestamp"] = datetime.now().isoformat()
-            record["session_id"] = self.session_id
-            
             if self.format == "jsonl":
                 json.dump(record, self.file_handle, ensure_ascii=False)
                 self.file_handle.write("\n")
@@ -73,6 +129,12 @@ class DialogueLogger:
                 self.close()
 
     def close(self):
+        if self.writer:
+            self.writer.submit(self, None) # After the records already queued
+        else:
+            self._close_file()
+
+    def _close_file(self):
         if self.file_handle:
             self.file_handle.close()
 
@@ -0,0 +1,99 @@
+import time
+from typing import Dict, Optional
+import numpy as np
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory latency histogram with HDR-style log-linear buckets: values are counted
+    in microseconds, exact below 128 us and with 64 sub-buckets per power of two above,
+    so any recorded value is reported within ~1.6% up to `max_ms` (larger ones are clamped).
+
+    Counts live in `slots` rotating sub-histograms covering `window_sec` together, which
+    gives rolling-window percentiles without storing samples; a separate histogram keeps
+    everything since the last reset. Not thread-safe: the owner locks.
+    """
+    SUB_BITS = 7
+    SUB_COUNT = 1 << SUB_BITS # Exact buckets below this many us
+    HALF = SUB_COUNT >> 1     # Sub-buckets per power of two above it
+
+    def __init__(self, window_sec: float = 60.0, slots: int = 6, max_ms: float = 3600 * 1000.0, clock=time.monotonic):
+        self.max_us = int(max_ms * 1000)
+        self.buckets = self._index(self.max_us) + 1
+        self.slot_sec = window_sec / slots
+        self.clock = clock
+        self._slots = np.zeros((slots, self.buckets), dtype=np.int32) # ~7 KB per slot
+        self._slot_epochs = np.full(slots, -1, dtype=np.int64) # Which time slice each slot holds
+        self._total = np.zeros(self.buckets, dtype=np.int64)
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+        self._values_us = self._bucket_values()
+
+    def _index(self, us: int) -> int:
+        if us < self.SUB_COUNT:
+            return us
+        shift = us.bit_length() - self.SUB_BITS
+        return self.SUB_COUNT + (shift - 1) * self.HALF + ((us >> shift) - self.HALF)
+
+    def _bucket_values(self) -> np.ndarray:
+        """Midpoint of each bucket, in us."""
+        index = np.arange(self.buckets)
+        shift = np.maximum((index - self.SUB_COUNT) // self.HALF + 1, 0)
+        mantissa = np.where(index < self.SUB_COUNT, index, (index - self.SUB_COUNT) % self.HALF + self.HALF)
+        low = mantissa.astype(np.float64) * (2.0 ** shift)
+        return low + (2.0 ** shift - 1) / 2
+
+    def _current_slot(self) -> int:
+        epoch = int(self.clock() / self.slot_sec)
+        slot = epoch % len(self._slots)
+        if self._slot_epochs[slot] != epoch:
+            # The slot last held a slice that has left the window
+            self._slots[slot] = 0
+            self._slot_epochs[slot] = epoch
+        return slot
+
+    def record(self, ms: float):
+        ms = max(ms, 0.0) # Stamps from another host's clock may be slightly off
+        us = min(int(ms * 1000), self.max_us)
+        index = self._index(us)
+        self._slots[self._current_slot(), index] += 1
+        self._total[index] += 1
+        self._sum_ms += ms
+        self._max_ms = max(self._max_ms, ms)
+
+    def _window_counts(self) -> np.ndarray:
+        epoch = int(self.clock() / self.slot_sec)
+        live = self._slot_epochs > epoch - len(self._slots)
+        return self._slots[live].sum(axis=0)
+
+    def _percentiles(self, counts: np.ndarray, quantiles=(50, 95, 99)) -> Dict[str, float]:
+        total = int(counts.sum())
+        if not total:
+            return {f"p{q}": None for q in quantiles}
+        cumulative = np.cumsum(counts)
+        result = {}
+        for q in quantiles:
+            rank = max(int(np.ceil(q / 100 * total)), 1)
+            index = int(np.searchsorted(cumulative, rank))
+            result[f"p{q}"] = round(float(self._values_us[index]) / 1000, 3)
+        return result
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Rolling-window count and percentiles, plus count/mean/max since the last reset."""
+        window = self._window_counts()
+        total = int(self._total.sum())
+        return {
+            "count": int(window.sum()),
+            **self._percentiles(window),
+            "total_count": total,
+            "total_mean": round(self._sum_ms / total, 3) if total else None,
+            "total_max": round(self._max_ms, 3) if total else None,
+            "total_p99": self._percentiles(self._total, (99,))["p99"],
+        }
+
+    def reset(self):
+        self._slots[:] = 0
+        self._slot_epochs[:] = -1
+        self._total[:] = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
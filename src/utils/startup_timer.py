@@ -0,0 +1,50 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """
+    Records how long each startup phase takes, relative to when this module was first imported.
+    Phases may run on different threads (GUI vs. backend), so they can overlap.
+    """
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases = [] # (name, start_ms, duration_ms)
+        self._lock = threading.Lock()
+
+    def _now_ms(self):
+        return (time.perf_counter() - self.t0) * 1000
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self._now_ms()
+        try:
+            yield
+        finally:
+            self.record(name, start, self._now_ms() - start)
+
+    def record(self, name: str, start_ms: float, duration_ms: float):
+        with self._lock:
+            self.phases.append((name, start_ms, duration_ms))
+
+    def mark(self, name: str):
+        """Records a milestone (zero-length phase), e.g. "window_shown"."""
+        self.record(name, self._now_ms(), 0.0)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                name: {"start_ms": round(start, 1), "duration_ms": round(duration, 1)}
+                for name, start, duration in self.phases
+            }
+
+    def report(self, logger):
+        lines = [
+            f"  {name:<24} +{info['start_ms']:>8.0f} ms  {info['duration_ms']:>8.0f} ms"
+            for name, info in self.summary().items()
+        ]
+        logger.info("Startup phases (offset, duration):\n" + "\n".join(lines))
+
+# Global instance; import it first so t0 is close to process start
+startup_timer = StartupTimer()
@@ -0,0 +1,99 @@
+import os
+from typing import Dict, Any
+
+# Thread-count variables read by BLAS backends, OpenMP and numba when they are first imported
+NUMERIC_THREAD_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "NUMBA_NUM_THREADS",
+)
+
+
+def available_cores() -> list:
+    """Cores this process may run on (respects an existing affinity mask / container limit)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class ThreadBudget:
+    """
+    Splits the CPU cores between the pipeline threads (Qt, asyncio loop, capture), the
+    CTranslate2 decoder and the numeric libraries (NumPy BLAS, numba/librosa).
+
+    Config (all optional), e.g. for a 4-core box:
+        "threads": {"enabled": True, "total": 4, "pipeline_cores": 1, "stt_threads": 3, "num_workers": 1,
+                    "numeric_threads": 1, "pin": True}
+    Off unless "enabled": then nothing is capped or pinned and CTranslate2 picks its own
+    thread count, as before the budget existed. When enabled, one core is kept for the
+    pipeline and the rest goes to the decoder by default. With "pin", pipeline threads are
+    bound to the first cores and decoder threads to the rest (Linux only; elsewhere only
+    the thread counts apply).
+    """
+    def __init__(self, total: int = None, pipeline_cores: int = 1, stt_threads: int = None,
+                 num_workers: int = 1, numeric_threads: int = 1, pin: bool = False, enabled: bool = True):
+        cores = available_cores()
+        if total:
+            cores = cores[:total]
+        self.cores = cores
+        # On a single core there is nothing to split
+        self.pipeline_cores = cores[:pipeline_cores] if len(cores) > pipeline_cores else cores
+        self.stt_cores = cores[len(self.pipeline_cores):] or cores
+        self.stt_threads = stt_threads or len(self.stt_cores)
+        self.num_workers = num_workers
+        self.numeric_threads = numeric_threads
+        self.enabled = enabled
+        self.pin = enabled and pin and hasattr(os, "sched_setaffinity")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]):
+        threads = config.get("threads", {})
+        return cls(
+            total=threads.get("total"),
+            pipeline_cores=threads.get("pipeline_cores", 1),
+            stt_threads=threads.get("stt_threads"),
+            num_workers=threads.get("num_workers", 1),
+            numeric_threads=threads.get("numeric_threads", 1),
+            pin=threads.get("pin", False),
+            enabled=threads.get("enabled", False),
+        )
+
+    def apply_env(self):
+        """Caps numeric library threads. Must run before numpy/librosa are imported; explicit env vars win."""
+        if not self.enabled:
+            return
+        for var in NUMERIC_THREAD_VARS:
+            os.environ.setdefault(var, str(self.numeric_threads))
+
+    def pin_pipeline_thread(self):
+        """Binds the calling thread (and threads it starts later) to the pipeline cores."""
+        self._pin(self.pipeline_cores)
+
+    def pin_stt_thread(self):
+        """Binds the calling thread to the decoder cores; CTranslate2 threads it creates inherit this."""
+        self._pin(self.stt_cores)
+
+    def _pin(self, cores):
+        if self.pin:
+            # On Linux, pid 0 means the calling thread
+            os.sched_setaffinity(0, cores)
+
+    def whisper_kwargs(self) -> dict:
+        if not self.enabled:
+            return {} # Engine defaults: CTranslate2 decides
+        return {"cpu_threads": self.stt_threads, "num_workers": self.num_workers}
+
+    def describe(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "cores": self.cores,
+            "pipeline_cores": self.pipeline_cores,
+            "stt_cores": self.stt_cores,
+            "stt_threads": self.stt_threads,
+            "num_workers": self.num_workers,
+            "numeric_threads": self.numeric_threads,
+            "pinned": self.pin,
+        }
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, Any, Optional
+
+# Stage boundaries, in pipeline order. Each is a time.perf_counter() stamp in trace["stages"].
+STAGES = (
+    "chunk_emitted",       # ChunkProcessor emitted the last chunk of the utterance (capture thread)
+    "chunk_dequeued",      # STTManager took that chunk off its queue
+    "partial_requested",   # Partials: the throttle asked for a decode (first of any coalesced requests)
+    "final_requested",     # Finals: the VAD closed the utterance
+    "decode_started",      # Decode slot acquired, engine called
+    "decode_finished",
+    "translation_started", # TranslationManager picked up stt.final_sentence
+    "translation_ready",   # LLM answer in, llm.translation_ready emitted
+    "qt_queued",           # QtEventBridge emitted the Qt signal (bus thread)
+    "overlay_rendered",    # Overlay slot ran and set the text (GUI thread)
+    "output_written",      # Headless runner wrote the subtitle
+)
+
+
+def new_stream_id() -> str:
+    """Prefix for the trace IDs of one audio stream."""
+    return uuid.uuid4().hex[:8]
+
+
+def start_trace(trace_id: str, sample_start: Optional[int], sample_rate: int) -> Dict[str, Any]:
+    """
+    A trace is a plain dict so it can ride along in event payloads (and over the remote
+    STT socket as JSON). Sample offsets count from the start of the stream, so
+    sample_start/sample_end place the utterance on the audio clock.
+    """
+    return {
+        "id": trace_id,
+        "kind": "final",
+        "sample_start": sample_start,
+        "sample_end": sample_start,
+        "sample_rate": sample_rate,
+        "stages": {},
+    }
+
+
+def mark(trace: Optional[Dict[str, Any]], stage: str, t: Optional[float] = None):
+    """Stamps `stage` (now, or at `t`); a no-op without a trace. Returns the trace."""
+    if trace is not None and stage:
+        trace["stages"][stage] = time.perf_counter() if t is None else t
+    return trace
+
+
+def fork(trace: Optional[Dict[str, Any]], kind: Optional[str] = None):
+    """
+    Copy to hand to another consumer or thread, so later marks on either side don't
+    interfere (e.g. the Qt signal hop while the translation continues).
+    """
+    if trace is None:
+        return None
+    copy = dict(trace, stages=dict(trace["stages"]))
+    if kind:
+        copy["kind"] = kind
+    return copy
+
+
+def breakdown(trace: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Per-stage latency: ms from the previous recorded stage to each stage, plus the
+    total from the first to the last stage and the utterance's position on the audio clock.
+    """
+    if not trace:
+        return {}
+    stages = trace.get("stages", {})
+    ordered = [stage for stage in STAGES if stage in stages]
+    ordered += sorted((stage for stage in stages if stage not in STAGES), key=stages.get)
+    stages_ms = {}
+    previous = None
+    for stage in ordered:
+        stages_ms[stage] = round((stages[stage] - stages[previous]) * 1000, 2) if previous else 0.0
+        previous = stage
+    result = {
+        "trace_id": trace.get("id"),
+        "kind": trace.get("kind"),
+        "stages_ms": stages_ms,
+        "total_ms": round((stages[ordered[-1]] - stages[ordered[0]]) * 1000, 2) if ordered else 0.0,
+    }
+    rate = trace.get("sample_rate")
+    if trace.get("sample_start") is not None and rate:
+        result["audio_start_sec"] = round(trace["sample_start"] / rate, 3)
+        result["audio_end_sec"] = round(trace["sample_end"] / rate, 3)
+    return result
+
+
+class TraceLog:
+    """
+    Keeps the breakdowns of the most recently finished traces (debugging, benchmarks).
+    finish() may be called from any thread.
+    """
+    def __init__(self, maxlen: int = 256):
+        self.logger = logging.getLogger("System")
+        self._finished = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def finish(self, trace: Optional[Dict[str, Any]], stage: Optional[str] = None) -> Dict[str, Any]:
+        """Stamps the final `stage` (if given) and records the trace's breakdown."""
+        if trace is None:
+            return {}
+        mark(trace, stage)
+        result = breakdown(trace)
+        with self._lock:
+            self._finished.append(result)
+        self.logger.debug(f"Trace {result['trace_id']} ({result['kind']}): {result['total_ms']:.0f} ms {result['stages_ms']}")
+        return result
+
+    def recent(self, count: Optional[int] = None) -> list:
+        with self._lock:
+            items = list(self._finished)
+        return items[-count:] if count else items
+
+    def clear(self):
+        with self._lock:
+            self._finished.clear()
+
+# Global instance, shared by the GUI/headless front ends of all pipelines
+trace_log = TraceLog()
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import os
+import sys
+import pytest
+
+# The app runs from the repo root and imports `src...` absolutely
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.transcription.stt_manager import STTEngine, STTManager
+from src.utils.event_bus import EventBus
+
+
+class QuietLogger:
+    """SystemLogger's interface without colorama; keeps the messages for assertions."""
+    def __init__(self):
+        self.messages = []
+
+    def info(self, message, **kwargs):
+        self.messages.append(("info", message))
+
+    def warning(self, message, **kwargs):
+        self.messages.append(("warning", message))
+
+    def error(self, message, exc=None, **kwargs):
+        self.messages.append(("error", message))
+        logging.getLogger("test").error(message, exc_info=exc)
+
+
+class FakeEngine(STTEngine):
+    """
+    Returns `text` for every decode and records (profile, audio, copy of the audio at call time).
+    While `gate` is an unset asyncio.Event, decodes wait on it.
+    """
+    def __init__(self, text="hello"):
+        self.text = text
+        self.calls = []
+        self.gate = None
+
+    async def transcribe(self, audio_chunk, sample_rate, profile="final"):
+        self.calls.append((profile, audio_chunk, audio_chunk.copy()))
+        if self.gate is not None:
+            await self.gate.wait()
+        return self.text
+
+
+@pytest.fixture
+def make_manager():
+    """Builds an STTManager on the energy VAD with a FakeEngine; stt keys override the config."""
+    def make(bus=None, engine=None, sample_rate=16000, **stt):
+        config = {"audio": {"sample_rate": sample_rate}, "stt": {"vad": {"enabled": False}, **stt}}
+        manager = STTManager(bus or EventBus(), config, QuietLogger(), load_engine=False)
+        manager.engine = engine or FakeEngine()
+        return manager
+    return make
+
+
+async def settle(rounds=10):
+    """Lets tasks woken by the previous step run."""
+    for _ in range(rounds):
+        await asyncio.sleep(0)
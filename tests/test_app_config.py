@@ -0,0 +1,56 @@
+import os
+import pytest
+from src.utils.app_config import default_config, load_user_config
+from conftest import QuietLogger
+
+
+@pytest.fixture
+def load(tmp_path, monkeypatch):
+    def load(*lines):
+        path = tmp_path / "User_config.txt"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        for line in lines:
+            if "=" in line and not line.startswith("#"):
+                monkeypatch.delenv(line.split("=", 1)[0].strip(), raising=False) # Restored after the test
+        return load_user_config(default_config(), str(path), QuietLogger())
+    return load
+
+
+def test_missing_file_keeps_defaults(tmp_path):
+    assert load_user_config(default_config(), str(tmp_path / "none.txt")) == default_config()
+
+
+def test_keys_update_config_and_env(load):
+    config = load("# comment", "", "STT_STREAMING=True", "SILERO_VAD_MODEL_PATH= /models/vad.onnx ",
+                  "TARGET_TRANSLATION_LANGUAGE=English", "CUSTOM_KEY=a=b")
+    assert config["stt"]["streaming"] is True
+    assert config["stt"]["vad"]["model_path"] == "/models/vad.onnx"
+    assert config["target_translation_language"] == "English"
+    assert os.environ["CUSTOM_KEY"] == "a=b"
+
+
+def test_empty_vad_path_means_default_lookup(load):
+    assert load("SILERO_VAD_MODEL_PATH=")["stt"]["vad"]["model_path"] is None
+
+
+def test_thread_keys_opt_in_to_the_budget(load):
+    assert load("CPU_THREAD_BUDGET=false")["threads"]["enabled"] is False
+    threads = load("STT_CPU_THREADS=3")["threads"]
+    assert threads["stt_threads"] == 3 and threads["enabled"] is True
+    threads = load("PIN_CPU_CORES=True")["threads"]
+    assert threads["pin"] is True and threads["enabled"] is True
+
+
+def test_pipeline_keys_build_extra_pipelines(load):
+    config = load("PIPELINE_ja_DEVICE_INDEX=5", "PIPELINE_ja_LANGUAGE=ja", "PIPELINE_en_us_LANGUAGE=en",
+                  "PIPELINE_ja_TARGET_LANGUAGE=English", "PIPELINE_ja_MODEL=small")
+    assert config["pipelines"] == [
+        {"name": "ja", "audio": {"device_index": 5}, "stt": {"language": "ja", "model": "small"},
+         "target_translation_language": "English"},
+        {"name": "en_us", "stt": {"language": "en"}},
+    ]
+
+
+def test_invalid_pipeline_keys_are_ignored(load):
+    config = load("PIPELINE_ja_DEVICE_INDEX=five", "PIPELINE_ja_VOLUME=3", "PIPELINE_LANGUAGE=ja")
+    assert config.get("pipelines", []) == []
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import numpy as np
+import pytest
+from src.transcription import batched_stt_engine
+from src.transcription.batched_stt_engine import BatchedWhisperEngine, open_shared_stream
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Skips the model load; a batch "decodes" to each request's stream ID and batch size."""
+    batches = []
+    monkeypatch.setattr(BatchedWhisperEngine, "_load_model", lambda self, cpu_threads, num_workers: object())
+
+    def decode(self, batch):
+        batches.append(len(batch))
+        return [f"{request.stream_id}/{len(batch)}" for request in batch]
+    monkeypatch.setattr(BatchedWhisperEngine, "_decode_batch", decode)
+    monkeypatch.setattr(batched_stt_engine, "_shared_engines", {})
+    return batches
+
+
+def transcribe_all(streams):
+    async def run():
+        audio = np.zeros(1600, dtype=np.float32)
+        return await asyncio.wait_for(asyncio.gather(*(s.transcribe(audio, 16000) for s in streams)), 5)
+    return asyncio.run(run())
+
+
+def test_streams_are_decoded_together(fake_model):
+    engine = BatchedWhisperEngine(max_batch_size=4, max_wait_ms=1000)
+    streams = [engine.open_stream() for _ in range(3)]
+    assert transcribe_all(streams) == ["0/3", "1/3", "2/3"] # Full set of streams: no waiting for the deadline
+    for stream in streams:
+        stream.close()
+
+
+def test_reopening_after_the_last_stream_closed_restarts_the_batcher(fake_model):
+    engine = BatchedWhisperEngine(max_wait_ms=1)
+    stream = engine.open_stream()
+    thread = engine._thread
+    stream.close()
+    thread.join(2)
+    assert not thread.is_alive() and engine._closed
+
+    stream = engine.open_stream()
+    assert transcribe_all([stream]) == ["1/1"]
+    stream.close()
+
+
+def test_shared_streams_survive_concurrent_close_and_open(fake_model):
+    errors = []
+
+    def churn(n):
+        try:
+            for _ in range(n):
+                stream = open_shared_stream("small.en", "cpu", "int8", max_wait_ms=1)
+                transcribe_all([stream])
+                stream.close()
+        except Exception as e: # Includes the 5 s timeout of a request no batcher serves
+            errors.append(e)
+
+    threads = [threading.Thread(target=churn, args=(30,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+    assert errors == []
+    assert batched_stt_engine._shared_engines == {}
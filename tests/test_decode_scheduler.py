@@ -0,0 +1,51 @@
+import pytest
+from src.transcription.decode_scheduler import DecodeScheduler
+
+
+def test_defaults_before_any_decode():
+    scheduler = DecodeScheduler(base_interval_chunks=2, max_buffer_sec=10.0)
+    assert scheduler.throttle_chunks(0.25) == 2
+    assert scheduler.throttle_chunks(0.25, auto_detect=True) == 3
+    assert scheduler.max_buffer_sec == 10.0
+
+
+def test_partial_throttle_follows_partial_decode_time():
+    scheduler = DecodeScheduler(base_interval_chunks=2, latency_target_ms=1500, headroom=1.25)
+    scheduler.record(0.4, 2.0, profile="partial")
+    assert scheduler.throttle_chunks(0.25) == 2 # ceil(0.4 * 1.25 / 0.25) = 2
+
+    scheduler.record(4.0, 8.0, profile="final") # Slow beam finals don't space out partials
+    assert scheduler.throttle_chunks(0.25) == 2
+
+    for _ in range(20):
+        scheduler.record(1.0, 2.0, profile="partial")
+    assert scheduler.throttle_chunks(0.25) == 5
+    for _ in range(20):
+        scheduler.record(3.0, 2.0, profile="partial")
+    assert scheduler.throttle_chunks(0.25) == 6 # Capped at the latency target (1.5 s of chunks)
+
+
+def test_max_buffer_follows_final_rtf():
+    scheduler = DecodeScheduler(max_buffer_sec=10.0, latency_target_ms=1500, min_buffer_sec=3.0)
+    scheduler.record(1.0, 1.0, profile="partial") # Partials alone don't shorten utterances
+    assert scheduler.max_buffer_sec == 10.0
+
+    scheduler.record(0.3, 2.0, profile="final") # rtf 0.15 -> 10 s fits the target
+    assert scheduler.max_buffer_sec == 10.0
+    for _ in range(30):
+        scheduler.record(1.0, 4.0, profile="final")
+    assert scheduler.max_buffer_sec == pytest.approx(6.0, rel=0.01) # 1.5 s / rtf 0.25
+    for _ in range(30):
+        scheduler.record(4.0, 4.0, profile="final")
+    assert scheduler.max_buffer_sec == pytest.approx(3.0, rel=0.01) # Floored at min_buffer_sec
+
+
+def test_metrics_per_profile():
+    scheduler = DecodeScheduler()
+    scheduler.record(0.1, 1.0, profile="partial")
+    scheduler.record(0.0, 0.0, profile="final") # No audio: ignored
+    metrics = scheduler.metrics()
+    assert metrics["rtf_partial"] == pytest.approx(0.1)
+    assert metrics["decode_ms_partial"] == pytest.approx(100.0)
+    assert metrics["rtf_final"] is None and metrics["decode_ms_final"] is None
+    assert metrics["decodes"] == 1
@@ -0,0 +1,55 @@
+import asyncio
+from src.pipeline.fair_gate import FairGate
+
+
+def test_free_slots_go_round_robin():
+    async def scenario():
+        gate = FairGate(slots=1)
+        order = []
+        release = asyncio.Event()
+
+        async def job(key, n):
+            async with gate.slot(key):
+                order.append(f"{key}{n}")
+                await release.wait()
+
+        tasks = [asyncio.create_task(job("a", i)) for i in range(3)]
+        await asyncio.sleep(0) # a0 takes the only slot
+        tasks += [asyncio.create_task(job("b", i)) for i in range(2)]
+        await asyncio.sleep(0)
+        assert gate.waiting() == {"a": 2, "b": 2}
+
+        release.set()
+        await asyncio.gather(*tasks)
+        return gate, order
+
+    gate, order = asyncio.run(scenario())
+    assert order == ["a0", "a1", "b0", "a2", "b1"] # b isn't stuck behind all of a's queue
+    assert gate.granted == {"a": 3, "b": 2}
+    assert gate.active == 0
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    async def scenario():
+        gate = FairGate(slots=1)
+        release = asyncio.Event()
+
+        async def job(key):
+            async with gate.slot(key):
+                await release.wait()
+
+        first = asyncio.create_task(job("a"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(job("b"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert gate.waiting() == {}
+
+        release.set()
+        await first
+        async with gate.slot("c"): # The slot is free again
+            pass
+        return gate
+
+    assert asyncio.run(scenario()).active == 0
@@ -0,0 +1,51 @@
+from src.utils.latency_histogram import LatencyHistogram
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_percentiles_within_bucket_precision():
+    histogram = LatencyHistogram(clock=FakeClock())
+    for ms in range(1, 1001): # 1..1000 ms
+        histogram.record(float(ms))
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == snapshot["total_count"] == 1000
+    for name, expected in (("p50", 500), ("p95", 950), ("p99", 990)):
+        assert abs(snapshot[name] - expected) / expected < 0.016
+    assert snapshot["total_mean"] == 500.5
+    assert snapshot["total_max"] == 1000.0
+
+
+def test_small_values_are_exact_and_large_ones_clamped():
+    histogram = LatencyHistogram(max_ms=1000.0, clock=FakeClock())
+    histogram.record(0.05) # 50 us
+    assert histogram.snapshot()["p50"] == 0.05
+    histogram.reset()
+    histogram.record(5000.0)
+    assert abs(histogram.snapshot()["p99"] - 1000.0) / 1000.0 < 0.016
+
+
+def test_window_rolls_but_totals_remain():
+    clock = FakeClock()
+    histogram = LatencyHistogram(window_sec=60.0, slots=6, clock=clock)
+    histogram.record(100.0)
+    clock.now += 30
+    histogram.record(200.0)
+    assert histogram.snapshot()["count"] == 2
+
+    clock.now += 45 # The first slice has left the window
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 1
+    assert abs(snapshot["p50"] - 200.0) / 200.0 < 0.016
+    assert snapshot["total_count"] == 2
+
+    clock.now += 120
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 0 and snapshot["p50"] is None
+    assert snapshot["total_count"] == 2
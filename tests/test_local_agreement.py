@@ -0,0 +1,29 @@
+from src.transcription.local_agreement import LocalAgreement
+
+
+def test_commits_words_two_decodes_agree_on():
+    agreement = LocalAgreement()
+    assert agreement.insert([(0.0, 0.4, " Hello"), (0.4, 0.8, " world")], offset=0.0) == []
+    assert agreement.hypothesis_text() == "Hello world"
+
+    committed = agreement.insert([(0.0, 0.4, " hello,"), (0.4, 0.8, " word"), (0.8, 1.2, " again")], offset=0.0)
+    assert committed == [(0.0, 0.4, " hello,")] # Agreement ignores case and punctuation
+    assert agreement.committed_text() == "hello,"
+    assert agreement.hypothesis_text() == "word again"
+    assert agreement.last_committed_end == 0.4
+
+
+def test_offset_and_repeated_prefix():
+    agreement = LocalAgreement()
+    agreement.insert([(0.0, 0.5, " one"), (0.5, 1.0, " two")], offset=0.0)
+    agreement.insert([(0.0, 0.5, " one"), (0.5, 1.0, " two")], offset=0.0)
+    assert agreement.committed_text() == "one two"
+
+    # The next tail starts at 1.0 s and Whisper repeats the last committed word
+    agreement.insert([(0.0, 0.3, " two"), (0.3, 0.8, " three")], offset=1.0)
+    assert agreement.hypothesis == [(1.3, 1.8, " three")]
+    assert agreement.insert([(0.3, 0.8, " three")], offset=1.0) == [(1.3, 1.8, " three")]
+    assert agreement.text() == "one two three"
+
+    agreement.reset()
+    assert agreement.text() == "" and agreement.last_committed_end == 0.0
@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.transcription.model_registry import ModelRegistry, estimate_model_mb
+
+
+def loader_for(name):
+    return lambda: object()
+
+
+def test_lru_eviction_keeps_recently_used_models():
+    # GPU sizes are estimated: small ~537 MB, base ~163 MB, tiny ~86 MB at float16
+    registry = ModelRegistry(budget_mb=700)
+    small = registry.get("small", "cuda", "float16", loader_for("small"))
+    registry.get("base", "cuda", "float16", loader_for("base"))
+    assert registry.get("small", "cuda", "float16", loader_for("small")) is small # Hit, now most recent
+
+    registry.get("tiny", "cuda", "float16", loader_for("tiny")) # Over budget: base is the LRU
+    assert [entry["model"] for entry in registry.stats()] == ["tiny", "small"]
+    assert registry.stats()[1]["hits"] == 1
+    assert registry.total_mb() == pytest.approx(estimate_model_mb("small", "float16") + estimate_model_mb("tiny", "float16"))
+
+
+def test_requested_model_is_never_evicted():
+    registry = ModelRegistry(budget_mb=100)
+    registry.get("small", "cuda", "float16", loader_for("small"))
+    assert [entry["model"] for entry in registry.stats()] == ["small"]
+    registry.configure(budget_mb=50)
+    assert len(registry.stats()) == 1
+
+
+def test_thread_settings_are_part_of_the_key():
+    registry = ModelRegistry()
+    a = registry.get("tiny", "cpu", "int8", loader_for("tiny"), cpu_threads=2)
+    b = registry.get("tiny", "cpu", "int8", loader_for("tiny"), cpu_threads=4)
+    assert a is not b
+    registry.discard("tiny", "cpu", "int8")
+    assert registry.stats() == []
+
+
+def test_concurrent_gets_share_one_load_without_blocking_other_keys():
+    registry = ModelRegistry()
+    release = threading.Event()
+    started = threading.Event()
+    loads = []
+
+    def slow_loader():
+        loads.append("small")
+        started.set()
+        assert release.wait(5)
+        return object()
+
+    with ThreadPoolExecutor(4) as pool:
+        waiting = [pool.submit(registry.get, "small", "cuda", "float16", slow_loader) for _ in range(3)]
+        assert started.wait(5)
+        # Another key loads and hits go through while "small" is still loading
+        tiny = pool.submit(registry.get, "tiny", "cuda", "float16", loader_for("tiny")).result(timeout=5)
+        assert registry.get("tiny", "cuda", "float16", loader_for("tiny")) is tiny
+        assert [entry["model"] for entry in registry.stats()] == ["tiny"]
+        release.set()
+        models = [future.result(timeout=5) for future in waiting]
+
+    assert loads == ["small"]
+    assert models[0] is models[1] is models[2]
+
+
+def test_failed_load_reaches_waiters_and_is_retried():
+    registry = ModelRegistry()
+    release = threading.Event()
+
+    def failing_loader():
+        assert release.wait(5)
+        raise RuntimeError("download failed")
+
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(registry.get, "small", "cuda", "float16", failing_loader)
+        while not registry._loading:
+            pass
+        second = pool.submit(registry.get, "small", "cuda", "float16", failing_loader)
+        release.set()
+        for future in (first, second):
+            with pytest.raises(RuntimeError):
+                future.result(timeout=5)
+
+    assert registry.get("small", "cuda", "float16", loader_for("small")) is not None
@@ -0,0 +1,22 @@
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from src.transcription import process_stt_engine
+
+
+def test_worker_attach_does_not_register_the_block(monkeypatch):
+    block = shared_memory.SharedMemory(create=True, size=4096)
+    try:
+        registered = []
+        monkeypatch.setattr(resource_tracker, "register", lambda name, rtype: registered.append((name, rtype)))
+        attached = process_stt_engine._attach_shm(block.name)
+        try:
+            np.ndarray((4,), dtype=np.float32, buffer=attached.buf)[:] = 1.0
+            assert np.ndarray((4,), dtype=np.float32, buffer=block.buf).tolist() == [1.0] * 4
+        finally:
+            attached.close()
+        assert registered == []
+        resource_tracker.register("x", "semaphore") # Registration is only skipped while attaching
+        assert registered == [("x", "semaphore")]
+    finally:
+        block.close()
+        block.unlink()
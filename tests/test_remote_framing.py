@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import numpy as np
+import pytest
+from src.transcription.remote_stt import (
+    FRAME_HEADER, KIND_AUDIO, KIND_JSON, MAX_FRAME_BYTES, RemoteSTTClient, STTServer,
+    decode_audio, encode_audio, encode_message, parse_address, read_frame,
+)
+from src.utils.event_bus import EventBus
+from conftest import QuietLogger
+
+
+def _read_all(data: bytes):
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        frames = []
+        while True:
+            kind, payload = await read_frame(reader)
+            if kind is None:
+                return frames
+            frames.append((kind, payload))
+    return asyncio.run(scenario())
+
+
+def test_frames_round_trip():
+    audio = np.linspace(-1.0, 1.0, 1600, dtype=np.float32)
+    data = (encode_message({"type": "hello", "language": "en"})
+            + encode_audio(audio, chunk_id=7, overlap_ms=160.0, sample_offset=48000, trace_id="s1-7", blocking=True)
+            + encode_audio(audio[:10]))
+    (kind1, message), (kind2, payload), (kind3, plain) = _read_all(data)
+
+    assert kind1 == KIND_JSON and message == {"type": "hello", "language": "en"}
+    assert kind2 == KIND_AUDIO == kind3
+    chunk = decode_audio(payload)
+    assert (chunk["chunk_id"], chunk["overlap_ms"], chunk["sample_offset"]) == (7, 160.0, 48000)
+    assert chunk["trace_id"] == "s1-7" and chunk["blocking"] is True
+    np.testing.assert_allclose(chunk["chunk"], audio, atol=1 / 16384) # int16 on the wire
+
+    chunk = decode_audio(plain)
+    assert chunk["chunk_id"] == -1 and chunk["sample_offset"] is None
+    assert chunk["trace_id"] is None and chunk["blocking"] is False
+
+
+def test_truncated_frame_reads_as_closed():
+    frame = encode_message({"type": "ping", "t": 1.0})
+    assert _read_all(frame[:-3]) == []
+
+
+def test_oversized_frame_is_rejected():
+    with pytest.raises(ValueError):
+        _read_all(FRAME_HEADER.pack(MAX_FRAME_BYTES + 1, KIND_AUDIO))
+
+
+def test_parse_address():
+    assert parse_address("tcp://10.0.0.2:9000") == ("tcp", ("10.0.0.2", 9000))
+    assert parse_address(":8765") == ("tcp", ("127.0.0.1", 8765))
+    assert parse_address("unix:///tmp/stt.sock") == ("unix", "/tmp/stt.sock")
+
+
+def test_hello_validation():
+    server = STTServer({"stt": {"model": "small.en"}}, logging.getLogger("test"), allowed_models=["tiny.en"])
+    assert server._validate_hello({"type": "hello", "language": "en", "model": "tiny.en", "sample_rate": 48000}) is None
+    assert server._validate_hello({"type": "hello", "model": "small.en"}) is None
+    assert "not allowed" in server._validate_hello({"type": "hello", "model": "large-v3"})
+    assert "Unsupported hello keys" in server._validate_hello({"type": "hello", "device": "cuda"})
+    assert "sample rate" in server._validate_hello({"type": "hello", "sample_rate": 12345})
+    assert "Invalid language" in server._validate_hello({"type": "hello", "language": "en; rm -rf /"})
+
+
+class FakeServer:
+    """Answers hello with `reply` and records the client's messages."""
+    def __init__(self, reply):
+        self.reply = reply
+        self.messages = []
+        self.hellos = 0
+
+    async def handle(self, reader, writer):
+        while True:
+            kind, message = await read_frame(reader)
+            if kind is None:
+                break
+            self.messages.append(message)
+            if message.get("type") == "hello":
+                self.hellos += 1
+                writer.write(encode_message(self.reply))
+        writer.close()
+
+
+def _connect_client(reply, **remote):
+    async def scenario():
+        server = FakeServer(reply)
+        tcp = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        bus = EventBus()
+        failed = []
+        bus.subscribe("stt.model_failed", failed.append)
+        config = {"stt": {"model": "deepdml/faster-whisper-large-v3-turbo-ct2",
+                          "remote": {"address": f"tcp://127.0.0.1:{port}", **remote}}}
+        client = RemoteSTTClient(bus, config, QuietLogger())
+        ok = await client.load_engine()
+        await asyncio.sleep(0.05)
+        await client.aclose()
+        tcp.close()
+        return server, client, ok, failed
+    return asyncio.run(scenario())
+
+
+def test_hello_leaves_the_model_to_the_server_unless_requested():
+    server, client, ok, failed = _connect_client({"type": "ready", "model": "small.en"})
+    assert ok and failed == []
+    assert "model" not in server.messages[0] # stt.model is the local default, not a request
+
+    server, *_ = _connect_client({"type": "ready", "model": "tiny.en"}, model="tiny.en")
+    assert server.messages[0]["model"] == "tiny.en"
+
+
+def test_refused_hello_is_reported_and_not_retried():
+    server, client, ok, failed = _connect_client({"type": "error", "message": "Model not allowed on this server: x"},
+                                                 model="x")
+    assert ok is False and server.hellos == 1
+    assert failed == [{"model": "x", "error": "STT server refused the connection: Model not allowed on this server: x"}]
+    assert client._reader_task is None # No reconnect loop
+
+
+def test_refused_model_switch_is_reported():
+    bus = EventBus()
+    failed = []
+    bus.subscribe("stt.model_failed", failed.append)
+    client = RemoteSTTClient(bus, {"stt": {}}, QuietLogger())
+    client._dispatch({"type": "error", "message": "Model not allowed on this server: x", "model": "x"})
+    client._dispatch({"type": "error", "message": "Invalid language: '?'"})
+    assert failed == [{"model": "x", "error": "Model not allowed on this server: x"}]
@@ -0,0 +1,68 @@
+import numpy as np
+from src.audio.ring_buffer import AudioRingBuffer
+from src.audio.chunk_processor import ChunkProcessor
+from src.utils.event_bus import EventBus
+
+
+def test_view_is_contiguous_across_wrap():
+    ring = AudioRingBuffer(8)
+    ring.append(np.arange(6, dtype=np.float32))
+    ring.consume(4)
+    ring.append(np.arange(6, 12, dtype=np.float32)) # Wraps around the end of the storage
+    np.testing.assert_array_equal(ring.view(), np.arange(4, 12, dtype=np.float32))
+
+
+def test_overflow_drops_oldest():
+    ring = AudioRingBuffer(4)
+    ring.append(np.arange(3, dtype=np.float32))
+    ring.append(np.arange(3, 6, dtype=np.float32))
+    assert len(ring) == 4
+    assert ring.dropped == 2
+    np.testing.assert_array_equal(ring.view(), np.arange(2, 6, dtype=np.float32))
+
+    ring.append(np.arange(6, 16, dtype=np.float32)) # Larger than the whole buffer
+    np.testing.assert_array_equal(ring.view(), np.arange(12, 16, dtype=np.float32))
+
+
+def test_emitted_chunks_are_not_overwritten_by_later_pushes():
+    # Regression: chunks used to be views into the ring, so audio pushed after the
+    # event (while a subscriber on another thread still held the chunk) changed it
+    bus = EventBus()
+    chunks = []
+    bus.subscribe("audio.chunk_ready", lambda data: chunks.append(data["chunk"]))
+    processor = ChunkProcessor(bus, sample_rate=1000, chunk_ms=100, overlap_ms=20, buffer_seconds=0.05)
+
+    signal = np.arange(5000, dtype=np.float32)
+    for start in range(0, len(signal), 37):
+        processor.push(signal[start:start + 37])
+
+    step = processor.chunk_samples - processor.overlap_samples
+    assert len(chunks) > processor.buffer.capacity // step # Enough to wrap the ring several times
+    for i, chunk in enumerate(chunks):
+        np.testing.assert_array_equal(chunk, signal[i * step:i * step + processor.chunk_samples])
+
+
+def test_large_blocks_are_taken_in_pieces():
+    bus = EventBus()
+    chunks = []
+    bus.subscribe("audio.chunk_ready", lambda data: chunks.append(data["chunk"]))
+    processor = ChunkProcessor(bus, sample_rate=1000, chunk_ms=100, overlap_ms=20, buffer_seconds=0.05)
+
+    signal = np.arange(3000, dtype=np.float32)
+    processor.push(signal) # Far larger than the ring
+    assert processor.buffer.dropped == 0
+    assert len(chunks) == (3000 - 20) // 80
+    np.testing.assert_array_equal(chunks[-1], signal[(len(chunks) - 1) * 80:(len(chunks) - 1) * 80 + 100])
+
+
+def test_lease_limits_writable():
+    ring = AudioRingBuffer(8)
+    assert ring.writable() is None
+    ring.append(np.arange(6, dtype=np.float32))
+    ring.consume(2)
+    with ring.lease(1, 3) as audio: # Absolute samples 3..5
+        np.testing.assert_array_equal(audio, [3, 4, 5])
+        assert ring.writable() == 3 + 8 - 6 # Until sample 3 would be overwritten
+        ring.append(np.arange(6, 11, dtype=np.float32))
+        np.testing.assert_array_equal(audio, [3, 4, 5])
+    assert ring.writable() is None
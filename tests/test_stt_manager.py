@@ -0,0 +1,191 @@
+import asyncio
+import numpy as np
+from conftest import FakeEngine, settle
+from src.audio.ring_buffer import AudioRingBuffer
+
+RATE = 16000
+
+
+def speech(seconds, value=0.1):
+    return np.full(int(RATE * seconds), value, dtype=np.float32)
+
+
+def test_ingestion_waits_for_a_decode_leasing_its_audio(make_manager):
+    async def scenario():
+        engine = FakeEngine()
+        engine.gate = asyncio.Event()
+        manager = make_manager(engine=engine)
+        manager.audio_buffer = AudioRingBuffer(RATE) # 1 s, so the test can wrap it
+        manager.start_processing()
+
+        for i in range(2): # The second chunk requests a partial, which then holds the decode
+            await manager._process_chunk(speech(0.25, 0.1 + i), i)
+        await settle()
+        assert len(engine.calls) == 1
+        _, held, snapshot = engine.calls[0]
+        assert np.shares_memory(held, manager.audio_buffer._storage) # Zero-copy
+
+        for i in range(2, 4): # Fills the ring up to the leased audio
+            await manager._process_chunk(speech(0.25, 0.1 + i), i)
+        blocked = asyncio.ensure_future(manager._process_chunk(speech(0.25, 0.5), 4))
+        await settle()
+        assert not blocked.done() # Appending would overwrite the audio being decoded
+        np.testing.assert_array_equal(held, snapshot)
+
+        engine.gate.set()
+        await asyncio.wait_for(blocked, 1)
+        manager.stop_processing()
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert manager.audio_buffer.writable() is None
+    assert len(manager.audio_buffer) == RATE
+
+
+def test_overlapping_chunks_are_buffered_once(make_manager):
+    from src.audio.chunk_processor import ChunkProcessor
+    from src.utils.event_bus import EventBus
+
+    bus = EventBus()
+    events = []
+    bus.subscribe("audio.chunk_ready", events.append)
+    processor = ChunkProcessor(bus, RATE, chunk_ms=250, overlap_ms=50)
+    signal = 0.1 + np.arange(RATE, dtype=np.float32) / RATE # Loud enough to stay speech throughout
+    processor.push(signal)
+
+    manager = make_manager()
+    manager.SILENCE_CHUNKS_THRESHOLD = 10 ** 6 # Keep one utterance
+    async def scenario():
+        for event in events:
+            await manager._process_chunk(event["chunk"], event["chunk_id"], event["overlap_ms"], dict(event))
+    asyncio.run(scenario())
+
+    step = processor.chunk_samples - processor.overlap_samples
+    expected = signal[:processor.chunk_samples + (len(events) - 1) * step]
+    np.testing.assert_array_equal(manager.audio_buffer.view(), expected)
+
+
+def test_a_gap_keeps_the_whole_chunk(make_manager):
+    manager = make_manager()
+    manager.SILENCE_CHUNKS_THRESHOLD = 10 ** 6
+    async def scenario():
+        await manager._process_chunk(speech(0.25), 1, 50.0)
+        await manager._process_chunk(speech(0.25), 2, 50.0) # Contiguous: overlap dropped
+        await manager._process_chunk(speech(0.25), 4, 50.0) # Chunk 3 was dropped upstream
+    asyncio.run(scenario())
+    assert len(manager.audio_buffer) == int(RATE * (0.25 + 0.2 + 0.25))
+
+
+def chunk_event(chunk_id, seconds=0.25, **extra):
+    return {"chunk": speech(seconds), "chunk_id": chunk_id, "overlap_ms": 0.0, **extra}
+
+
+def test_full_queue_drops_and_counts(make_manager):
+    import threading
+
+    async def scenario():
+        manager = make_manager()
+        manager._loop = asyncio.get_running_loop() # Accepting chunks, but nothing consumes them
+        thread = threading.Thread(target=lambda: [manager.handle_chunk(chunk_event(i)) for i in range(25)])
+        thread.start()
+        await asyncio.get_running_loop().run_in_executor(None, thread.join)
+        await settle()
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert manager.audio_queue.qsize() == manager.audio_queue.maxsize == 20
+    assert manager.dropped_chunks == 5
+
+
+def test_chunks_are_processed_without_polling(make_manager):
+    async def scenario():
+        manager = make_manager()
+        manager.start_processing()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, manager.handle_chunk, chunk_event(1))
+        assert await manager.drain(timeout=0.05) # Well under the old 50 ms poll interval
+        manager.stop_processing()
+        return manager
+
+    assert len(asyncio.run(scenario()).audio_buffer) == RATE // 4
+
+
+def test_blocking_chunks_wait_for_room(make_manager):
+    import threading
+
+    async def scenario():
+        manager = make_manager()
+        loop = asyncio.get_running_loop()
+        manager._loop = loop
+        for i in range(20):
+            manager.audio_queue.put_nowait(i)
+        thread = threading.Thread(target=manager.handle_chunk, args=(chunk_event(21, blocking=True),))
+        thread.start()
+        await asyncio.sleep(0.1)
+        assert thread.is_alive() # The feed thread waits instead of dropping
+
+        manager.audio_queue.get_nowait()
+        await loop.run_in_executor(None, thread.join, 2)
+        assert not thread.is_alive()
+        assert manager.audio_queue.qsize() == 20 and manager.dropped_chunks == 0
+
+        # put_chunk is the same for callers on the loop, and gives up once processing stops
+        waiter = asyncio.ensure_future(manager.put_chunk(chunk_event(22)))
+        await asyncio.sleep(0.1)
+        assert not waiter.done()
+        manager._loop = None
+        await asyncio.wait_for(waiter, 2)
+        return manager
+
+    asyncio.run(scenario())
+
+
+def silence(seconds):
+    return np.zeros(int(RATE * seconds), dtype=np.float32)
+
+
+def test_decode_loop_runs_finals_first_and_coalesces_partials(make_manager):
+    async def scenario():
+        engine = FakeEngine()
+        engine.gate = asyncio.Event()
+        bus_events = []
+        manager = make_manager(engine=engine)
+        manager.bus.subscribe("stt.final_sentence", bus_events.append)
+        manager.start_processing()
+
+        chunks = [speech(0.25), speech(0.25)] # Second chunk requests a partial, which blocks the decoder
+        chunks += [silence(0.25)] # Finalizes the first utterance while that partial still runs
+        chunks += [speech(0.25) for _ in range(4)] # Two more partial requests, merged into one
+        for i, chunk in enumerate(chunks, 1):
+            await manager._process_chunk(chunk, i)
+            await settle()
+        assert [profile for profile, _, _ in engine.calls] == ["partial"] # Ingestion kept going
+        assert manager.coalesced_decodes == 1
+
+        engine.gate.set()
+        await settle(50)
+        manager.stop_processing()
+        return manager, engine, bus_events
+
+    manager, engine, finals = asyncio.run(scenario())
+    assert [profile for profile, _, _ in engine.calls] == ["partial", "final", "partial"]
+    _, final_audio, _ = engine.calls[1]
+    assert len(final_audio) == int(RATE * 0.75) # Both speech chunks and the silence that ended them
+    assert len(finals) == 1 and manager.dropped_chunks == 0
+
+
+def test_vad_gates_the_buffer_and_keeps_preroll(make_manager):
+    manager = make_manager(vad={"enabled": False, "preroll_ms": 200})
+    quiet = [np.full(RATE // 4, 0.001 * (i + 1), dtype=np.float32) for i in range(3)] # Below the energy threshold
+    async def scenario():
+        for i, chunk in enumerate(quiet, 1):
+            await manager._process_chunk(chunk, i)
+        assert len(manager.audio_buffer) == 0 # Non-speech alone never opens an utterance
+        await manager._process_chunk(speech(0.25), 4)
+    asyncio.run(scenario())
+
+    buffered = manager.audio_buffer.view()
+    preroll = manager.preroll_samples
+    assert len(buffered) == preroll + RATE // 4
+    np.testing.assert_array_equal(buffered[:preroll], quiet[-1][-preroll:]) # The 200 ms before the onset
+    assert manager.engine.calls == []
@@ -0,0 +1,57 @@
+import asyncio
+import numpy as np
+from src.audio.chunk_processor import ChunkProcessor
+from src.utils import trace as tracing
+from conftest import settle
+
+RATE = 16000
+
+
+def test_fork_keeps_later_marks_apart():
+    trace = tracing.mark(tracing.start_trace("s-1", 0, RATE), "chunk_emitted", 1.0)
+    copy = tracing.fork(trace, "partial")
+    tracing.mark(copy, "decode_started", 2.0)
+    tracing.mark(trace, "final_requested", 3.0)
+    assert copy["kind"] == "partial" and trace["kind"] == "final"
+    assert set(copy["stages"]) == {"chunk_emitted", "decode_started"}
+    assert set(trace["stages"]) == {"chunk_emitted", "final_requested"}
+    assert tracing.fork(None) is None and tracing.mark(None, "decode_started") is None
+
+
+def test_breakdown_orders_stages_by_pipeline_order():
+    trace = tracing.start_trace("s-1", RATE, RATE)
+    trace["sample_end"] = 3 * RATE
+    for stage, t in (("decode_finished", 1.5), ("chunk_emitted", 1.0), ("custom", 1.6), ("decode_started", 1.2)):
+        tracing.mark(trace, stage, t)
+    result = tracing.TraceLog().finish(trace)
+    assert list(result["stages_ms"]) == ["chunk_emitted", "decode_started", "decode_finished", "custom"]
+    assert result["stages_ms"]["decode_finished"] == 300.0
+    assert result["total_ms"] == 600.0
+    assert (result["audio_start_sec"], result["audio_end_sec"]) == (1.0, 3.0)
+
+
+def test_final_sentence_carries_the_trace_of_its_chunks(make_manager):
+    manager = make_manager()
+    processor = ChunkProcessor(manager.bus, RATE, chunk_ms=250, overlap_ms=0)
+    finals = []
+    manager.bus.subscribe("stt.final_sentence", finals.append)
+    audio = np.concatenate([np.zeros(RATE // 2), np.full(RATE * 3 // 4, 0.1), np.zeros(RATE // 2)]).astype(np.float32)
+
+    async def scenario():
+        manager.start_processing()
+        processor.push(audio) # Chunks 1-2 silence, 3-5 speech, 6-7 silence
+        await manager.drain(timeout=1)
+        await settle(50)
+        manager.stop_processing()
+    asyncio.run(scenario())
+
+    assert len(finals) == 1
+    trace = finals[0]["trace"]
+    assert trace["id"] == f"{processor.stream_id}-3" # The chunk that opened the utterance
+    assert trace["kind"] == "final"
+    assert trace["sample_start"] == RATE // 2 - manager.preroll_samples
+    assert trace["sample_end"] == RATE * 3 // 2 # End of the silence chunk that finalized it
+    stages = trace["stages"]
+    order = ["chunk_emitted", "chunk_dequeued", "final_requested", "decode_started", "decode_finished"]
+    assert [stage for stage in tracing.STAGES if stage in stages] == order
+    assert all(stages[a] <= stages[b] for a, b in zip(order, order[1:]))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from src.transcription.vad import EnergyVAD, SileroVAD, create_vad
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+from onnx import TensorProto, helper
+
+
+def width_model(path, states, sample_rate_input):
+    """
+    A Silero-shaped ONNX model with a dynamic input width whose "speech probability" is the
+    width it was fed, so tests can see whether SileroVAD prepended context.
+    """
+    state_shape = [2, 1, 128] if states == ("state",) else [1, 1, 128]
+    inputs = [helper.make_tensor_value_info("input", TensorProto.FLOAT, ["batch", "width"])]
+    inputs += [helper.make_tensor_value_info(name, TensorProto.FLOAT, state_shape) for name in states]
+    if sample_rate_input:
+        inputs.append(helper.make_tensor_value_info("sr", TensorProto.INT64, []))
+    outputs = [helper.make_tensor_value_info("output", TensorProto.FLOAT, [1, 1])]
+    outputs += [helper.make_tensor_value_info(f"{name}_out", TensorProto.FLOAT, state_shape) for name in states]
+    nodes = [
+        helper.make_node("Shape", ["input"], ["shape"]),
+        helper.make_node("Gather", ["shape", "last"], ["width"], axis=0),
+        helper.make_node("Cast", ["width"], ["width_f"], to=TensorProto.FLOAT),
+        helper.make_node("Reshape", ["width_f", "out_shape"], ["output"]),
+    ] + [helper.make_node("Identity", [name], [f"{name}_out"]) for name in states]
+    initializers = [
+        helper.make_tensor("last", TensorProto.INT64, [], [1]),
+        helper.make_tensor("out_shape", TensorProto.INT64, [2], [1, 1]),
+    ]
+    graph = helper.make_graph(nodes, "silero_like", inputs, outputs, initializers)
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    return str(path)
+
+
+@pytest.mark.parametrize("states,sample_rate_input,expected_width", [
+    (("h", "c"), False, 576), # faster-whisper's bundled v6: context, though the width is dynamic
+    (("state",), True, 576),  # Upstream v5/v6
+    (("h", "c"), True, 512),  # Upstream v4: the window alone
+])
+def test_context_follows_the_input_names(tmp_path, states, sample_rate_input, expected_width):
+    vad = SileroVAD(width_model(tmp_path / "vad.onnx", states, sample_rate_input), 16000)
+    assert vad(np.zeros(512, dtype=np.float32)) == expected_width
+
+
+def test_exports_without_sample_rate_input_are_16k_only(tmp_path):
+    with pytest.raises(ValueError):
+        SileroVAD(width_model(tmp_path / "vad.onnx", ("h", "c"), False), 8000)
+    vad = SileroVAD(width_model(tmp_path / "vad8k.onnx", ("state",), True), 8000)
+    assert vad(np.zeros(256, dtype=np.float32)) == 256 + 32
+
+
+def test_windows_carry_over_between_calls(tmp_path):
+    vad = SileroVAD(width_model(tmp_path / "vad.onnx", ("state",), True), 16000)
+    assert vad(np.zeros(300, dtype=np.float32)) == 0.0 # No full window yet
+    assert vad(np.zeros(300, dtype=np.float32)) == 576
+
+
+def test_create_vad_falls_back_to_energy(tmp_path):
+    assert isinstance(create_vad({"enabled": False}, 16000, 0.005), EnergyVAD)
+    assert isinstance(create_vad({"model_path": str(tmp_path / "missing.onnx")}, 16000, 0.005), EnergyVAD)
+    model = width_model(tmp_path / "vad.onnx", ("state",), True)
+    assert isinstance(create_vad({"model_path": model}, 16000, 0.005), SileroVAD)
+    assert isinstance(create_vad({"model_path": model}, 48000, 0.005), EnergyVAD)